@@ -1,23 +1,27 @@
 import os
+import hashlib
 from dotenv import load_dotenv
 
 # .env 파일 로드
 load_dotenv()
 
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session
-from datetime import datetime, timedelta, timezone
-from models import get_db, init_db, seed_initial_data, generate_schedule_id, User
+import click
+from flask import (Flask, render_template, request, redirect, url_for, flash, jsonify, session, make_response,
+                   Response)
+from datetime import datetime, timedelta
+from models import (get_db, release_db, query_count, pool, read_pool, init_db, check_counters, seed_initial_data,
+                    generate_schedule_id, get_activists, get_cache_versions, User, ADVANCE_PREP_DAYS)
+from fragment_cache import FragmentCacheExtension, fragment_cache
+from search import search as search_rows, KIND_SCHEDULE, KIND_TASK, KIND_IDEA
+from pagination import Segment, fetch_page
+import live
+from writes import begin_immediate, run_write, lock_wait_ms, write_stats, WriteBusy
+from dates import (get_kst_now, calc_dday, format_date_kr, format_weekday_kr,
+                   sort_fields, month_range, validate_date_format)
 from authlib.integrations.flask_client import OAuth
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
 from functools import wraps
 
-# 한국 시간대 (KST = UTC+9)
-KST = timezone(timedelta(hours=9))
-
-def get_kst_now():
-    """현재 한국 시간을 반환합니다."""
-    return datetime.now(KST)
-
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'busan-queer-action-2026-dev')
 
@@ -68,157 +72,206 @@ def superadmin_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
-# 앱 시작 시 DB 초기화
-with app.app_context():
-    init_db()
-    seed_initial_data()
+def source_hash():
+    """템플릿과 파이썬 모듈 내용의 해시 (배포마다 달라지는 빌드 식별자)"""
+    root = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha1()
+    paths = [os.path.join(root, name) for name in os.listdir(root) if name.endswith('.py')]
+    template_dir = os.path.join(root, app.template_folder)
+    paths += [os.path.join(template_dir, name) for name in os.listdir(template_dir)]
+    for path in sorted(paths):
+        digest.update(os.path.relpath(path, root).encode())
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
 
 
-def parse_date(date_str):
-    """날짜 문자열을 파싱합니다. 대략적 시기도 정렬용으로 변환합니다."""
-    import re
-    if not date_str:
-        return None
+# ETag에 섞는 빌드 식별자: 템플릿이나 화면 코드가 바뀐 배포 뒤에는 예전 화면에 304를 주지 않음
+# (BUILD_ID 환경 변수가 있으면 그 값, 없으면 워커 시작 시 소스 해시)
+BUILD_ID = os.environ.get('BUILD_ID') or source_hash()
+
+
+def conditional_get(f):
+    """데이터가 바뀌지 않았으면 304로 응답하는 데코레이터 (조회 화면용)
+
+    ETag는 빌드 식별자, 변경 버전, 사용자, 요청 경로(필터), KST 날짜로 만들어서
+    If-None-Match가 일치하면 쿼리와 템플릿 렌더링을 모두 건너뜁니다.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        # 표시할 플래시 메시지가 남아 있으면 캐시된 화면을 쓰면 안 됨
+        if session.get('_flashes'):
+            return f(*args, **kwargs)
+
+        versions = sorted(get_cache_versions().items())
+        key = repr((BUILD_ID, versions, current_user.id, current_user.activist_id,
+                    request.full_path, get_kst_now().strftime('%Y-%m-%d')))
+        etag = hashlib.sha1(key.encode()).hexdigest()
+
+        if request.if_none_match.contains(etag):
+            response = make_response('', 304)
+        else:
+            response = make_response(f(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+    return decorated_function
+
+def write_transaction(f):
+    """쓰기 라우트: POST면 요청 연결에서 BEGIN IMMEDIATE로 쓰기 잠금부터 잡고 실행
+
+    뷰 안의 쓰기는 이 트랜잭션에 들어가고 뷰의 commit()으로 끝납니다. (커밋하지 않고 끝나면 반납 때 롤백)
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if request.method == 'POST':
+            begin_immediate(get_db())
+        return f(*args, **kwargs)
+    return decorated_function
+
+BUSY_MESSAGE = '저장 요청이 몰려 처리하지 못했습니다. 잠시 후 다시 시도해주세요.'
+
+
+@app.errorhandler(WriteBusy)
+def write_busy(error):
+    """다시 시도해도 쓰기 잠금을 얻지 못한 요청"""
+    if is_ajax():
+        return jsonify({'success': False, 'error': BUSY_MESSAGE}), 503
+    flash(BUSY_MESSAGE)
+    return redirect(request.referrer or url_for('index'))
+
+# 낙관적 버전 검사 (schedules/tasks/ideas.version)
+CONFLICT_MESSAGE = '다른 사람이 먼저 수정해서 저장에 실패했습니다. 최신 내용을 확인해주세요.'
 
-    # YYYY-MM-DD (정확한 날짜)
-    try:
-        return datetime.strptime(date_str, '%Y-%m-%d')
-    except ValueError:
-        pass
 
-    # YYYY-MM (월만) -> 15일로 설정
+def request_version():
+    """폼으로 받은 행 버전. 없으면 None (버전 검사 없이 적용)"""
     try:
-        return datetime.strptime(date_str + '-15', '%Y-%m-%d')
+        return int(request.form.get('version', ''))
     except ValueError:
-        pass
-
-    # YYYY-MM-초/중순/말/미정 (대략적 시기)
-    match = re.match(r'^(\d{4})-(\d{2})-(초|중순|말|미정)$', date_str)
-    if match:
-        year = int(match.group(1))
-        month = int(match.group(2))
-        timing = match.group(3)
-        if timing == '초':
-            day = 1
-        elif timing == '중순':
-            day = 15
-        elif timing == '말':
-            # 해당 월의 마지막 날 계산
-            import calendar
-            day = calendar.monthrange(year, month)[1]
-        else:  # 미정
-            day = 15
-        return datetime(year, month, day)
-
-    # YYYY-MM-시기~MM-시기 (범위) -> 첫 번째 월 기준
-    match = re.match(r'^(\d{4})-(\d{2})-(초|중순|말)?~', date_str)
-    if match:
-        year = int(match.group(1))
-        month = int(match.group(2))
-        timing = match.group(3) or '중순'
-        if timing == '초':
-            day = 1
-        elif timing == '중순':
-            day = 15
-        elif timing == '말':
-            import calendar
-            day = calendar.monthrange(year, month)[1]
-        else:
-            day = 15
-        return datetime(year, month, day)
-
-    # "연중" -> 연말(12월)로 정렬
-    if date_str == '연중':
-        return datetime(2026, 12, 31)
-
-    return None
-
-
-def calc_dday(deadline_str):
-    """D-day를 계산합니다. 반환: (일수, CSS클래스)"""
-    if not deadline_str:
-        return None, 'safe'
-
-    deadline = parse_date(deadline_str)
-    if not deadline:
-        return None, 'safe'
-
-    # 타임존 없는 날짜로 비교 (날짜만 비교하면 되므로)
-    today = get_kst_now().replace(tzinfo=None)
-    today = today.replace(hour=0, minute=0, second=0, microsecond=0)
-    diff = (deadline - today).days
-
-    if diff < 0:
-        return f'D+{abs(diff)}', 'overdue'
-    elif diff == 0:
-        return 'D-Day', 'd1'
-    elif diff == 1:
-        return 'D-1', 'd1'
-    elif diff == 2:
-        return 'D-2', 'd2'
-    elif diff == 3:
-        return 'D-3', 'd3'
-    else:
-        return f'D-{diff}', 'safe'
+        return None
 
 
-def format_date_kr(date_str):
-    """날짜를 한국어 형식으로 변환합니다."""
-    import re
-    if not date_str:
-        return '미정'
-
-    # "연중"
-    if date_str == '연중':
-        return '연중 1회'
-
-    # YYYY-MM-DD (정확한 날짜)
-    if re.match(r'^\d{4}-\d{2}-\d{2}$', date_str):
-        dt = parse_date(date_str)
-        if dt:
-            return dt.strftime('%m월 %d일')
-
-    # YYYY-MM (월만)
-    if re.match(r'^\d{4}-\d{2}$', date_str):
-        try:
-            month = int(date_str[5:7])
-            return f'{month}월'
-        except ValueError:
-            pass
-
-    # YYYY-MM-초/중순/말/미정 (대략적 시기)
-    match = re.match(r'^(\d{4})-(\d{2})-(초|중순|말|미정)$', date_str)
-    if match:
-        month = int(match.group(2))
-        timing = match.group(3)
-        return f'{month}월 {timing}'
-
-    # YYYY-MM-시기~MM-시기 (범위)
-    match = re.match(r'^(\d{4})-(\d{2})-(초|중순|말)?~(\d{2})-(초|중순|말)?$', date_str)
-    if match:
-        month1 = int(match.group(2))
-        timing1 = match.group(3) or ''
-        month2 = int(match.group(4))
-        timing2 = match.group(5) or ''
-        return f'{month1}월 {timing1}~{month2}월 {timing2}'.strip()
-
-    # 그 외
-    dt = parse_date(date_str)
-    if dt:
-        return dt.strftime('%m월 %d일')
-    return date_str
-
-
-# 요일을 한글로 변환
-def format_weekday_kr(date_str):
-    """날짜 문자열에서 요일을 한글로 반환합니다."""
-    weekdays = ['월', '화', '수', '목', '금', '토', '일']
-    if not date_str:
-        return ''
-    dt = parse_date(date_str)
-    if dt:
-        return weekdays[dt.weekday()]
-    return ''
+def is_ajax():
+    return request.headers.get('X-Requested-With') == 'XMLHttpRequest'
+
+
+def conflict_response(current, fallback_url):
+    """화면의 버전이 오래되어 거부한 쓰기에 대한 응답 (AJAX는 409와 현재 값)"""
+    if is_ajax():
+        return jsonify({'success': False, 'conflict': True, 'error': CONFLICT_MESSAGE, **current}), 409
+    flash(CONFLICT_MESSAGE)
+    return redirect(request.referrer or fallback_url)
+
+# 행 조각: 쓰기 뒤 화면 전체 대신 바뀐 행 하나만 다시 그려서 보냄
+# 화면(view) 이름 -> 그 화면의 행 템플릿 (목록 요소의 data-row-view)
+TASK_ROW_TEMPLATES = {
+    'index': '_task_row.html',
+    'tasks': '_task_item.html',
+    'meeting': '_meeting_task.html',
+    'detail': '_detail_task.html',
+    'detail_idea': '_detail_idea.html',
+}
+
+IDEA_TEMPLATES = {'ideas': '_idea_item.html'}
+SCHEDULE_TEMPLATES = {'detail': '_schedule_header.html'}
+
+# 일정별 실무/완료/아이디어 수 (schedule_counts는 tasks 트리거로 유지, 일정마다 키 조회 한 번)
+SCHEDULE_COUNTS = '''
+    COALESCE(c.task_count, 0) as task_count,
+    COALESCE(c.completed_count, 0) as completed_count,
+    COALESCE(c.idea_count, 0) as idea_count
+'''
+
+TASK_ROW_QUERY = '''
+    SELECT t.*, s.title as schedule_title, s.date as schedule_date, a.name as activist_name
+    FROM tasks t
+    LEFT JOIN schedules s ON t.schedule_id = s.id
+    LEFT JOIN activists a ON t.activist_id = a.id
+    WHERE t.id IN ({})
+'''
+
+
+def row_view(templates):
+    """AJAX 요청의 ?view= 가 templates에 있으면 그 이름, 아니면 None (조각 대신 원래 응답)"""
+    view = request.args.get('view', '')
+    return view if is_ajax() and view in templates else None
+
+
+def task_view(task, linked_activist_id=None, urgent_until=None):
+    """화면에 그릴 실무 dict (D-day, 내 TODO, 급함 표시)"""
+    task_dict = dict(task)
+    task_dict['dday_text'], task_dict['dday_class'] = calc_dday(task['deadline'])
+    task_dict['is_mine'] = (task['activist_id'] == linked_activist_id) if linked_activist_id else False
+    task_dict['is_urgent'] = bool(urgent_until and not task['is_completed'] and task['sort_date']
+                                  and task['sort_date'] <= urgent_until)
+    return task_dict
+
+
+def schedule_card_response(conn, schedule_id):
+    """일정 상세 헤더 조각으로 응답 (지워졌으면 204)"""
+    schedule = conn.execute('SELECT * FROM schedules WHERE id = ?', (schedule_id,)).fetchone()
+    conn.close()
+    if not schedule:
+        return '', 204
+    return render_template(SCHEDULE_TEMPLATES['detail'], schedule=schedule)
+
+
+def render_task_rows(conn, task_ids, view):
+    """실무 id 목록 -> {id: view 화면의 행 조각 HTML} (쿼리 1번, 지워진 실무는 빠짐)"""
+    linked_activist_id = getattr(current_user, 'activist_id', None)
+    urgent_until = (get_kst_now().date() + timedelta(days=3)).strftime('%Y-%m-%d')
+    filter_activist = request.args.get('activist', '')
+    rows = {}
+    for task in conn.execute(TASK_ROW_QUERY.format(','.join('?' * len(task_ids))), task_ids):
+        rows[task['id']] = render_template(TASK_ROW_TEMPLATES[view],
+                                           task=task_view(task, linked_activist_id, urgent_until),
+                                           filter_activist=filter_activist)
+    return rows
+
+
+def task_row_response(conn, task_id, view):
+    """실무 한 행을 view 화면의 행 조각으로 응답 (지워진 행이면 204: 화면에서 빼면 됨)"""
+    rows = render_task_rows(conn, [task_id], view)
+    conn.close()
+    if task_id not in rows:
+        return '', 204
+    return rows[task_id]
+
+# 요청이 끝나면 DB 연결을 풀로 반납
+app.teardown_appcontext(release_db)
+
+
+@app.after_request
+def add_query_count_header(response):
+    """개발/테스트 환경에서 요청당 SQL 문 수와 쓰기 잠금 대기 시간을 응답 헤더로 알려줍니다."""
+    if app.debug or app.testing:
+        response.headers['X-Query-Count'] = str(query_count())
+        response.headers['X-Lock-Wait-Ms'] = f'{lock_wait_ms():.1f}'
+    return response
+
+# 앱 시작 시 DB 초기화 (스키마가 최신이면 버전만 확인, 초기 데이터는 마이그레이션한 워커만)
+with app.app_context():
+    if init_db():
+        seed_initial_data()
+
+
+@app.cli.command('check-counters')
+@click.option('--repair', is_flag=True, help='어긋난 카운터 테이블을 원본 기준으로 다시 채움')
+def check_counters_command(repair):
+    """트리거로 유지하는 카운터(일정별 실무 수, 월별 실무 수) 점검: flask check-counters [--repair]"""
+    conn = get_db()
+    mismatches = check_counters(conn, repair=repair)
+    conn.close()
+    for table, keys in mismatches.items():
+        click.echo(f'{table}: {len(keys)}개 어긋남 ({", ".join(map(str, keys[:10]))}{" ..." if len(keys) > 10 else ""})'
+                   + (' -> 다시 채움' if repair else ''))
+    if not mismatches:
+        click.echo('카운터가 모두 맞습니다.')
+    elif not repair:
+        raise SystemExit(1)
 
 
 # HTML 태그 제거 및 텍스트 자르기
@@ -241,23 +294,22 @@ def strip_html_truncate(html_str, max_length=100):
 
 
 # Jinja2 필터 등록
-app.jinja_env.filters['dday'] = lambda d: calc_dday(d)[0]
-app.jinja_env.filters['dday_class'] = lambda d: calc_dday(d)[1]
+app.jinja_env.filters['dday'] = lambda d: calc_dday(d).text
+app.jinja_env.filters['dday_class'] = lambda d: calc_dday(d).css_class
+app.jinja_env.filters['dday_info'] = calc_dday  # 텍스트와 CSS 클래스를 한 번에 (.text, .css_class)
 app.jinja_env.filters['date_kr'] = format_date_kr
 app.jinja_env.filters['weekday_kr'] = format_weekday_kr
 app.jinja_env.filters['strip_html'] = strip_html_truncate
 
+# 템플릿 조각 캐시 ({% cache %} 태그)
+app.jinja_env.add_extension(FragmentCacheExtension)
+
 
 # 모든 템플릿에 활동가 목록 제공 (사용자 활동가 연결 기능용)
 @app.context_processor
 def inject_all_activists():
     """모든 템플릿에서 all_activists 사용 가능"""
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute('SELECT * FROM activists ORDER BY name')
-    activists = cursor.fetchall()
-    conn.close()
-    return dict(all_activists=activists)
+    return dict(all_activists=get_activists())
 
 
 # ========== 인증 ==========
@@ -299,8 +351,8 @@ def auth_callback():
         user = User.get_by_google_id(google_id)
 
         if not user:
-            # 새 사용자 생성
-            conn = get_db()
+            # 새 사용자 생성 (GET이지만 쓰므로 쓰기 연결)
+            conn = get_db(write=True)
             cursor = conn.cursor()
 
             # 첫 번째 사용자인지 확인 (자동 승인)
@@ -352,20 +404,34 @@ def pending_approval():
     return render_template('pending.html')
 
 
+# ideas()/admin_users(): ORDER BY created_at DESC NULLS LAST, id DESC
+def _created_segments(alias):
+    return (
+        Segment(f'{alias}.created_at IS NOT NULL', f'({alias}.created_at, {alias}.id) < (?, ?)',
+                f'{alias}.created_at DESC, {alias}.id DESC', ('created_at', 'id')),
+        Segment(f'{alias}.created_at IS NULL', f'{alias}.id < ?', f'{alias}.id DESC', ('id',)),
+    )
+
+IDEA_SEGMENTS = _created_segments('i')
+USER_SEGMENTS = _created_segments('u')
+
+
 @app.route('/admin/users')
 @approval_required
 def admin_users():
-    """사용자 관리 (관리자용)"""
+    """사용자 관리 (관리자용, after 커서로 다음 페이지, partial=1이면 목록 조각만)"""
     conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute('SELECT * FROM users ORDER BY created_at DESC')
-    users = cursor.fetchall()
+    users, next_cursor = fetch_page(conn, 'SELECT * FROM users u WHERE 1=1', [], USER_SEGMENTS,
+                                    request.args.get('after', ''))
     conn.close()
-    return render_template('admin_users.html', users=users)
+    template = '_page.html' if request.args.get('partial') == '1' else 'admin_users.html'
+    return render_template(template, items_template='_user_cards.html', list_id='user-list',
+                           users=users, next_cursor=next_cursor, page_args={})
 
 
 @app.route('/admin/user/<int:user_id>/approve', methods=['POST'])
 @approval_required
+@write_transaction
 def admin_approve_user(user_id):
     """사용자 승인"""
     conn = get_db()
@@ -379,6 +445,7 @@ def admin_approve_user(user_id):
 
 @app.route('/admin/user/<int:user_id>/revoke', methods=['POST'])
 @approval_required
+@write_transaction
 def admin_revoke_user(user_id):
     """사용자 승인 취소"""
     conn = get_db()
@@ -390,8 +457,17 @@ def admin_revoke_user(user_id):
     return redirect(url_for('admin_users'))
 
 
+@app.route('/admin/db-stats')
+@superadmin_required
+def admin_db_stats():
+    """DB 연결 풀/조각 캐시/쓰기 잠금 통계 (최고 관리자용)"""
+    return jsonify({'pool': pool.stats(), 'read_pool': read_pool.stats(), 'fragments': fragment_cache.stats(),
+                    'writes': write_stats.stats()})
+
+
 @app.route('/user/link-activist', methods=['POST'])
 @approval_required
+@write_transaction
 def link_activist():
     """사용자 계정에 활동가 연결"""
     activist_id = request.form.get('activist_id', '') or None
@@ -415,11 +491,12 @@ def link_activist():
 
 @app.route('/')
 @approval_required
+@conditional_get
 def index():
     """TODO 메인 뷰"""
     conn = get_db()
     cursor = conn.cursor()
-    today = get_kst_now().replace(tzinfo=None)
+    today = get_kst_now().date()
 
     show_completed = request.args.get('show_completed', '0') == '1'
 
@@ -447,7 +524,15 @@ def index():
         query += ' AND t.activist_id = ?'
         params.append(filter_activist)
 
-    query += ' ORDER BY t.is_completed ASC, t.deadline ASC NULLS LAST'
+    # 현재 사용자의 연결된 활동가 ID
+    linked_activist_id = current_user.activist_id if hasattr(current_user, 'activist_id') else None
+
+    # 내 TODO가 먼저 나오도록 정렬 (is_mine 우선, 그 다음 마감일순)
+    if linked_activist_id:
+        query += ' ORDER BY t.is_completed ASC, t.activist_id IS ? DESC, t.sort_date ASC NULLS LAST, t.id ASC'
+        params.append(linked_activist_id)
+    else:
+        query += ' ORDER BY t.is_completed ASC, t.sort_date ASC NULLS LAST, t.id ASC'
 
     cursor.execute(query, params)
     all_tasks_raw = cursor.fetchall()
@@ -455,59 +540,42 @@ def index():
     # D-day 계산 및 분류
     all_tasks = []
     urgent_tasks = []  # D-3 이내
-
-    # 현재 사용자의 연결된 활동가 ID
-    linked_activist_id = current_user.activist_id if hasattr(current_user, 'activist_id') else None
+    urgent_until = (today + timedelta(days=3)).strftime('%Y-%m-%d')
 
     for task in all_tasks_raw:
-        dday_text, dday_class = calc_dday(task['deadline'])
-        task_dict = dict(task)
-        task_dict['dday_text'] = dday_text
-        task_dict['dday_class'] = dday_class
-        # 내 TODO인지 표시
-        task_dict['is_mine'] = (task['activist_id'] == linked_activist_id) if linked_activist_id else False
+        task_dict = task_view(task, linked_activist_id, urgent_until)
         all_tasks.append(task_dict)
 
-        if not task['is_completed']:
-            deadline = parse_date(task['deadline'])
-            if deadline:
-                diff = (deadline - today).days
-                if diff <= 3:
-                    urgent_tasks.append(task_dict)
-
-    # 내 TODO가 먼저 나오도록 정렬 (is_mine 우선, 그 다음 마감일순)
-    if linked_activist_id:
-        all_tasks.sort(key=lambda x: (x['is_completed'], not x['is_mine'], x['deadline'] or '9999-99-99'))
+        if task_dict['is_urgent']:
+            urgent_tasks.append(task_dict)
 
     # 사전준비 알림 - 일정 날짜 기준으로 (미확정 일정만)
-    # needs_advance_prep=1: 70일 전부터, needs_advance_prep=0: 35일 전부터
+    # 알림 시작일(remind_from: 70일 또는 35일 전)이 지났고 일정 날짜는 아직인 것
+    # 시작일은 일정 날짜보다 최대 ADVANCE_PREP_DAYS 앞이므로 인덱스 범위를 그만큼으로 제한
     prep_reminders = []
+    today_str = today.strftime('%Y-%m-%d')
     cursor.execute('''
-        SELECT s.*, COUNT(CASE WHEN t.is_idea = 1 THEN t.id END) as idea_count
+        SELECT s.*, COALESCE(c.idea_count, 0) as idea_count
         FROM schedules s
-        LEFT JOIN tasks t ON s.id = t.schedule_id
-        WHERE s.is_completed = 0 AND s.is_confirmed = 0 AND s.date IS NOT NULL AND s.date != '' AND s.date != '연중'
-        GROUP BY s.id
-    ''')
+        LEFT JOIN schedule_counts c ON c.schedule_id = s.id
+        WHERE s.remind_from > ? AND s.remind_from <= ? AND s.sort_date > ?
+        ORDER BY s.sort_date ASC
+    ''', ((today - timedelta(days=ADVANCE_PREP_DAYS)).strftime('%Y-%m-%d'), today_str, today_str))
     for schedule in cursor.fetchall():
-        schedule_date = parse_date(schedule['date'])
-        if schedule_date:
-            needs_advance = schedule['needs_advance_prep'] if 'needs_advance_prep' in schedule.keys() else 0
-            prep_days = 70 if needs_advance else 35
-            diff = (schedule_date - today).days
-            if 0 < diff <= prep_days:
-                reminder = dict(schedule)
-                reminder['is_advance_prep'] = bool(needs_advance)
-                prep_reminders.append(reminder)
+        reminder = dict(schedule)
+        reminder['is_advance_prep'] = bool(schedule['needs_advance_prep'])
+        prep_reminders.append(reminder)
 
     # 활동가 목록
-    cursor.execute('SELECT * FROM activists ORDER BY name')
-    activists = cursor.fetchall()
+    activists = get_activists()
 
     # 일정 목록 (참조용) - 날짜, 카테고리 포함
-    cursor.execute('SELECT id, title, date, category, is_confirmed FROM schedules WHERE is_completed = 0 ORDER BY date ASC')
+    cursor.execute('SELECT id, title, date, category, is_confirmed FROM schedules WHERE is_completed = 0 ORDER BY sort_date ASC')
     schedules = cursor.fetchall()
 
+    # 실시간 반영: 이 화면 이후의 변경을 /events에서 이어 받음
+    change_id = live.latest_change_id(conn)
+
     conn.close()
 
     return render_template('index.html',
@@ -517,13 +585,15 @@ def index():
                            activists=activists,
                            schedules=schedules,
                            show_completed=show_completed,
-                           filter_activist=filter_activist)
+                           filter_activist=filter_activist,
+                           change_id=change_id)
 
 
 # ========== 일정 관리 ==========
 
 @app.route('/meeting')
 @approval_required
+@conditional_get
 def meeting():
     """회의용 뷰 - 30일 기준으로 일정과 실무 정리"""
     conn = get_db()
@@ -533,105 +603,95 @@ def meeting():
     thirty_days_later = (today + timedelta(days=30)).strftime('%Y-%m-%d')
 
     # 1. 30일 이내 일정 (미완료)
-    cursor.execute('''
-        SELECT s.*,
-               COUNT(t.id) as task_count,
-               SUM(CASE WHEN t.is_completed = 1 THEN 1 ELSE 0 END) as completed_count
+    cursor.execute(f'''
+        SELECT s.*, {SCHEDULE_COUNTS}
         FROM schedules s
-        LEFT JOIN tasks t ON s.id = t.schedule_id AND t.is_idea = 0
-        WHERE s.is_completed = 0 AND s.date <= ? AND s.date >= ?
-        GROUP BY s.id
-        ORDER BY s.date ASC
+        LEFT JOIN schedule_counts c ON c.schedule_id = s.id
+        WHERE s.is_completed = 0 AND s.sort_date <= ? AND s.sort_date >= ? AND s.date_precision != 'year'
+        ORDER BY s.sort_date ASC
     ''', (thirty_days_later, today_str))
     upcoming_schedules = cursor.fetchall()
 
-    # 각 일정의 실무 목록 가져오기
-    upcoming_with_tasks = []
-    for schedule in upcoming_schedules:
-        cursor.execute('''
+    # 위 일정들의 실무를 한 번에 가져와 일정별로 나눔
+    tasks_by_schedule = {schedule['id']: [] for schedule in upcoming_schedules}
+    if tasks_by_schedule:
+        placeholders = ', '.join('?' * len(tasks_by_schedule))
+        cursor.execute(f'''
             SELECT t.*, a.name as activist_name
             FROM tasks t
             LEFT JOIN activists a ON t.activist_id = a.id
-            WHERE t.schedule_id = ? AND t.is_idea = 0
-            ORDER BY t.is_completed ASC, t.deadline ASC
-        ''', (schedule['id'],))
-        tasks = cursor.fetchall()
-
-        tasks_with_dday = []
-        for task in tasks:
+            WHERE t.schedule_id IN ({placeholders}) AND t.is_idea = 0
+            ORDER BY t.is_completed ASC, t.sort_date ASC
+        ''', list(tasks_by_schedule))
+        for task in cursor.fetchall():
             task_dict = dict(task)
             dday_text, dday_class = calc_dday(task['deadline'])
             task_dict['dday_text'] = dday_text
             task_dict['dday_class'] = dday_class
-            tasks_with_dday.append(task_dict)
+            tasks_by_schedule[task['schedule_id']].append(task_dict)
 
+    upcoming_with_tasks = []
+    for schedule in upcoming_schedules:
         upcoming_with_tasks.append({
             'schedule': dict(schedule),
-            'tasks': tasks_with_dday
+            'tasks': tasks_by_schedule[schedule['id']]
         })
 
     # 2. 30일 이후 일정 중 마감일이 30일 이내인 실무 (일정별로 그룹화)
-    # 먼저 해당 조건에 맞는 일정 목록 조회
+    # 일정 순서대로 정렬된 실무를 한 번에 조회한 뒤 일정이 바뀔 때마다 묶음을 시작
     cursor.execute('''
-        SELECT DISTINCT s.id, s.title, s.date, s.category, s.is_confirmed
-        FROM schedules s
-        JOIN tasks t ON s.id = t.schedule_id
-        WHERE s.is_completed = 0 AND s.date > ? AND t.is_idea = 0 AND t.is_completed = 0
-              AND t.deadline <= ? AND t.deadline >= ?
-        ORDER BY s.date ASC
+        SELECT t.*, a.name as activist_name,
+               s.title as schedule_title, s.date as schedule_date,
+               s.category as schedule_category, s.is_confirmed as schedule_is_confirmed
+        FROM tasks t
+        JOIN schedules s ON s.id = t.schedule_id
+        LEFT JOIN activists a ON t.activist_id = a.id
+        WHERE s.is_completed = 0 AND s.sort_date > ? AND s.date_precision != 'year'
+              AND t.is_idea = 0 AND t.is_completed = 0
+              AND t.sort_date <= ? AND t.sort_date >= ?
+        ORDER BY s.sort_date ASC, s.id ASC, t.sort_date ASC
     ''', (thirty_days_later, thirty_days_later, today_str))
-    future_schedules = cursor.fetchall()
 
-    # 각 일정의 마감 임박 실무 목록 가져오기
     future_schedules_with_tasks = []
     future_tasks_with_dday = []  # 기존 호환성을 위해 유지
-    for schedule in future_schedules:
-        cursor.execute('''
-            SELECT t.*, a.name as activist_name
-            FROM tasks t
-            LEFT JOIN activists a ON t.activist_id = a.id
-            WHERE t.schedule_id = ? AND t.is_idea = 0 AND t.is_completed = 0
-                  AND t.deadline <= ? AND t.deadline >= ?
-            ORDER BY t.deadline ASC
-        ''', (schedule['id'], thirty_days_later, today_str))
-        tasks = cursor.fetchall()
-
-        tasks_with_dday = []
-        for task in tasks:
-            task_dict = dict(task)
-            task_dict['schedule_id'] = schedule['id']
-            task_dict['schedule_title'] = schedule['title']
-            task_dict['schedule_date'] = schedule['date']
-            task_dict['schedule_category'] = schedule['category']
-            dday_text, dday_class = calc_dday(task['deadline'])
-            task_dict['dday_text'] = dday_text
-            task_dict['dday_class'] = dday_class
-            tasks_with_dday.append(task_dict)
-            future_tasks_with_dday.append(task_dict)  # 기존 호환성
+    schedule_dict = None
+    for task in cursor.fetchall():
+        if schedule_dict is None or schedule_dict['id'] != task['schedule_id']:
+            schedule_dict = {
+                'id': task['schedule_id'],
+                'title': task['schedule_title'],
+                'date': task['schedule_date'],
+                'category': task['schedule_category'],
+                'is_confirmed': task['schedule_is_confirmed'],
+                'tasks': [],
+            }
+            dday_text, dday_class = calc_dday(schedule_dict['date'])
+            schedule_dict['dday_text'] = dday_text
+            schedule_dict['dday_class'] = dday_class
+            future_schedules_with_tasks.append(schedule_dict)
 
-        schedule_dict = dict(schedule)
-        dday_text, dday_class = calc_dday(schedule['date'])
-        schedule_dict['dday_text'] = dday_text
-        schedule_dict['dday_class'] = dday_class
-        schedule_dict['tasks'] = tasks_with_dday
-        future_schedules_with_tasks.append(schedule_dict)
+        task_dict = dict(task)
+        dday_text, dday_class = calc_dday(task['deadline'])
+        task_dict['dday_text'] = dday_text
+        task_dict['dday_class'] = dday_class
+        schedule_dict['tasks'].append(task_dict)
+        future_tasks_with_dday.append(task_dict)  # 기존 호환성
 
     # 활동가 목록 (편집용)
-    cursor.execute('SELECT * FROM activists')
-    activists = cursor.fetchall()
+    activists = get_activists()
 
     # 연중 일정 조회
-    cursor.execute('''
-        SELECT s.*,
-               COUNT(CASE WHEN t.is_idea = 0 THEN t.id END) as task_count,
-               COUNT(CASE WHEN t.is_idea = 1 THEN t.id END) as idea_count
+    cursor.execute(f'''
+        SELECT s.*, {SCHEDULE_COUNTS}
         FROM schedules s
-        LEFT JOIN tasks t ON s.id = t.schedule_id
+        LEFT JOIN schedule_counts c ON c.schedule_id = s.id
         WHERE s.date = '연중' AND s.is_completed = 0
-        GROUP BY s.id
     ''')
     yearly_schedules = cursor.fetchall()
 
+    # 실시간 반영: 이 화면 이후의 변경을 /events에서 이어 받음
+    change_id = live.latest_change_id(conn)
+
     conn.close()
 
     # 일정에 D-day 및 태스크 정보 추가
@@ -651,25 +711,24 @@ def meeting():
                            yearly_schedules=yearly_schedules,
                            activists=activists,
                            today_str=today.strftime('%m월 %d일'),
-                           thirty_days_later=thirty_days_later)
+                           thirty_days_later=thirty_days_later,
+                           change_id=change_id)
 
 
 @app.route('/schedules')
 @approval_required
+@conditional_get
 def schedules():
     """일정 목록"""
     conn = get_db()
     cursor = conn.cursor()
 
     # 진행률 포함 쿼리 (전체 일정)
-    base_query = '''
-        SELECT s.*,
-               COUNT(CASE WHEN t.is_idea = 0 THEN t.id END) as task_count,
-               SUM(CASE WHEN t.is_completed = 1 AND t.is_idea = 0 THEN 1 ELSE 0 END) as completed_count,
-               COUNT(CASE WHEN t.is_idea = 1 THEN t.id END) as idea_count
+    base_query = f'''
+        SELECT s.*, {SCHEDULE_COUNTS}
         FROM schedules s
-        LEFT JOIN tasks t ON s.id = t.schedule_id
-        GROUP BY s.id
+        LEFT JOIN schedule_counts c ON c.schedule_id = s.id
+        ORDER BY s.sort_date ASC NULLS LAST, s.id ASC
     '''
 
     cursor.execute(base_query)
@@ -677,15 +736,6 @@ def schedules():
 
     conn.close()
 
-    # parse_date로 정렬 (초/중순/말 지원)
-    def sort_key(s):
-        dt = parse_date(s['date'])
-        if dt:
-            return dt
-        return datetime(9999, 12, 31)  # 날짜 미정은 맨 뒤
-
-    schedules_list = sorted(schedules_list, key=sort_key)
-
     # 연중 일정과 일반 일정 분리
     yearly_schedules = []
     regular_schedules = []
@@ -699,13 +749,9 @@ def schedules():
     from collections import OrderedDict
     grouped_schedules = OrderedDict()
     for schedule in regular_schedules:
-        date_str = schedule['date']
-        if date_str:
-            dt = parse_date(date_str)
-            if dt:
-                month_key = dt.strftime('%Y년 %m월')
-            else:
-                month_key = '날짜 미정'
+        sort_date = schedule['sort_date']
+        if sort_date:
+            month_key = f'{sort_date[:4]}년 {sort_date[5:7]}월'
         else:
             month_key = '날짜 미정'
 
@@ -720,12 +766,18 @@ def schedules():
 
 @app.route('/schedule/<schedule_id>')
 @approval_required
+@conditional_get
 def schedule_detail(schedule_id):
     """일정 상세 페이지"""
     conn = get_db()
     cursor = conn.cursor()
 
-    cursor.execute('SELECT * FROM schedules WHERE id = ?', (schedule_id,))
+    cursor.execute(f'''
+        SELECT s.*, {SCHEDULE_COUNTS}
+        FROM schedules s
+        LEFT JOIN schedule_counts c ON c.schedule_id = s.id
+        WHERE s.id = ?
+    ''', (schedule_id,))
     schedule = cursor.fetchone()
 
     if not schedule:
@@ -738,7 +790,7 @@ def schedule_detail(schedule_id):
         FROM tasks t
         LEFT JOIN activists a ON t.activist_id = a.id
         WHERE t.schedule_id = ? AND t.is_idea = 0
-        ORDER BY t.is_completed ASC, t.deadline ASC, t.priority ASC
+        ORDER BY t.is_completed ASC, t.sort_date ASC, t.priority ASC
     ''', (schedule_id,))
     action_tasks = cursor.fetchall()
 
@@ -753,13 +805,12 @@ def schedule_detail(schedule_id):
     idea_tasks = cursor.fetchall()
 
     # 진행률 계산
-    total = len(action_tasks)
-    completed = sum(1 for t in action_tasks if t['is_completed'])
+    total = schedule['task_count']
+    completed = schedule['completed_count']
     progress = int((completed / total * 100)) if total > 0 else 0
 
     # 활동가 목록
-    cursor.execute('SELECT * FROM activists')
-    activists = cursor.fetchall()
+    activists = get_activists()
 
     conn.close()
 
@@ -773,40 +824,9 @@ def schedule_detail(schedule_id):
                            completed_tasks=completed)
 
 
-def validate_date_format(date_str):
-    """날짜 형식을 검증합니다. YYYY-MM-DD, YYYY-MM, YYYY-MM-시기, 또는 연중 형식 허용."""
-    if not date_str:
-        return True  # 빈 값은 허용 (미정)
-    if date_str == '연중':
-        return True  # 연중 허용
-    import re
-    # YYYY-MM-DD (정확한 날짜)
-    if re.match(r'^\d{4}-\d{2}-\d{2}$', date_str):
-        try:
-            datetime.strptime(date_str, '%Y-%m-%d')
-            return True
-        except ValueError:
-            return False
-    # YYYY-MM (월만)
-    elif re.match(r'^\d{4}-\d{2}$', date_str):
-        try:
-            datetime.strptime(date_str + '-01', '%Y-%m-%d')
-            return True
-        except ValueError:
-            return False
-    # YYYY-MM-초/중순/말/미정 (대략적 시기)
-    elif re.match(r'^\d{4}-\d{2}-(초|중순|말|미정)$', date_str):
-        parts = date_str.split('-')
-        try:
-            month = int(parts[1])
-            return 1 <= month <= 12
-        except ValueError:
-            return False
-    return False
-
-
 @app.route('/schedule/add', methods=['GET', 'POST'])
 @approval_required
+@write_transaction
 def schedule_add():
     """일정 추가"""
     if request.method == 'POST':
@@ -838,12 +858,15 @@ def schedule_add():
                                               'details': details, 'start_time': start_time, 'end_time': end_time, 'location': location})
 
         schedule_id = generate_schedule_id()
+        sort_date, date_precision = sort_fields(date)
         conn = get_db()
         cursor = conn.cursor()
         cursor.execute('''
-            INSERT INTO schedules (id, date, category, title, is_confirmed, needs_advance_prep, details, start_time, end_time, location)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (schedule_id, date, category, title, is_confirmed, needs_advance_prep, details, start_time, end_time, location))
+            INSERT INTO schedules (id, date, category, title, is_confirmed, needs_advance_prep, details, start_time, end_time, location,
+                                   sort_date, date_precision)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (schedule_id, date, category, title, is_confirmed, needs_advance_prep, details, start_time, end_time, location,
+              sort_date, date_precision))
         conn.commit()
         conn.close()
 
@@ -855,6 +878,7 @@ def schedule_add():
 
 @app.route('/schedule/<schedule_id>/edit', methods=['GET', 'POST'])
 @approval_required
+@write_transaction
 def schedule_edit(schedule_id):
     """일정 수정"""
     conn = get_db()
@@ -886,16 +910,30 @@ def schedule_edit(schedule_id):
             form_schedule = {'id': schedule_id, 'date': date, 'category': category,
                              'title': title, 'is_confirmed': is_confirmed,
                              'needs_advance_prep': needs_advance_prep, 'details': details,
-                             'start_time': start_time, 'end_time': end_time, 'location': location}
+                             'start_time': start_time, 'end_time': end_time, 'location': location,
+                             'version': request_version()}
             conn.close()
             return render_template('schedule_form.html', schedule=form_schedule, form_data=None)
 
+        # 수정 화면을 연 뒤 다른 사람이 바꾼 일정이면 덮어쓰지 않음
+        version = request_version()
+        sort_date, date_precision = sort_fields(date)
         cursor.execute('''
             UPDATE schedules
-            SET date = ?, category = ?, title = ?, is_confirmed = ?, needs_advance_prep = ?, details = ?, start_time = ?, end_time = ?, location = ?
-            WHERE id = ?
-        ''', (date, category, title, is_confirmed, needs_advance_prep, details, start_time, end_time, location, schedule_id))
+            SET date = ?, category = ?, title = ?, is_confirmed = ?, needs_advance_prep = ?, details = ?, start_time = ?, end_time = ?, location = ?,
+                sort_date = ?, date_precision = ?, version = version + 1
+            WHERE id = ? AND (? IS NULL OR version = ?)
+        ''', (date, category, title, is_confirmed, needs_advance_prep, details, start_time, end_time, location,
+              sort_date, date_precision, schedule_id, version, version))
         conn.commit()
+
+        if cursor.rowcount == 0:
+            cursor.execute('SELECT 1 FROM schedules WHERE id = ?', (schedule_id,))
+            exists = cursor.fetchone()
+            conn.close()
+            if exists:
+                flash(CONFLICT_MESSAGE)
+                return redirect(url_for('schedule_edit', schedule_id=schedule_id))
         conn.close()
 
         flash('수정되었습니다.')
@@ -914,6 +952,7 @@ def schedule_edit(schedule_id):
 
 @app.route('/schedule/<schedule_id>/delete', methods=['POST'])
 @approval_required
+@write_transaction
 def schedule_delete(schedule_id):
     """일정 삭제"""
     conn = get_db()
@@ -930,36 +969,66 @@ def schedule_delete(schedule_id):
 @app.route('/schedule/<schedule_id>/toggle_complete', methods=['POST'])
 @approval_required
 def schedule_toggle_complete(schedule_id):
-    """일정 완료/미완료 토글"""
+    """일정 완료/미완료 토글 (한 문장으로 원자적으로 뒤집음)"""
+    version = request_version()
+
+    rows = run_write(lambda conn: conn.execute('''
+        UPDATE schedules SET is_completed = CASE WHEN is_completed THEN 0 ELSE 1 END, version = version + 1
+        WHERE id = ? AND (? IS NULL OR version = ?)
+        RETURNING is_completed, version
+    ''', (schedule_id, version, version)).fetchall())
     conn = get_db()
-    cursor = conn.cursor()
-
-    cursor.execute('SELECT is_completed FROM schedules WHERE id = ?', (schedule_id,))
-    schedule = cursor.fetchone()
 
-    if schedule:
-        new_status = 0 if schedule['is_completed'] else 1
-        cursor.execute('UPDATE schedules SET is_completed = ? WHERE id = ?', (new_status, schedule_id))
-        conn.commit()
+    if not rows:
+        current = conn.execute('SELECT is_completed, version FROM schedules WHERE id = ?', (schedule_id,)).fetchone()
+        if current:
+            conn.close()
+            return conflict_response({'new_status': current['is_completed'], 'version': current['version']},
+                                     url_for('schedules'))
 
+    if row_view(SCHEDULE_TEMPLATES):
+        return schedule_card_response(conn, schedule_id)
     conn.close()
 
     referer = request.referrer or url_for('schedules')
     return redirect(referer)
 
 
+@app.route('/schedule/<schedule_id>/fragment')
+@approval_required
+@conditional_get
+def schedule_card(schedule_id):
+    """일정 카드(상세 헤더) 조각만 다시 그림"""
+    return schedule_card_response(get_db(), schedule_id)
+
+
 # ========== 실무/TODO 관리 ==========
 
+# tasks(): ORDER BY is_completed, sort_date NULLS LAST, id 를 (완료 여부, 마감일 유무) 구간으로 나눔
+def _task_segments(completed):
+    return (
+        Segment(f't.is_completed = {completed} AND t.sort_date IS NOT NULL', '(t.sort_date, t.id) > (?, ?)',
+                't.sort_date, t.id', ('sort_date', 'id')),
+        Segment(f't.is_completed = {completed} AND t.sort_date IS NULL', 't.id > ?', 't.id', ('id',)),
+    )
+
+OPEN_TASK_SEGMENTS = _task_segments(0)
+ALL_TASK_SEGMENTS = OPEN_TASK_SEGMENTS + _task_segments(1)
+
+
 @app.route('/tasks')
 @approval_required
+@conditional_get
 def tasks():
-    """전체 실무 목록"""
+    """전체 실무 목록 (after 커서로 다음 페이지, partial=1이면 목록 조각만)"""
     conn = get_db()
     cursor = conn.cursor()
 
     show_completed = request.args.get('show_completed', '0') == '1'
     filter_activist = request.args.get('activist', '')
     filter_month = request.args.get('month', '')
+    after = request.args.get('after', '')
+    partial = request.args.get('partial') == '1'
 
     # 기본 쿼리
     query = '''
@@ -971,39 +1040,30 @@ def tasks():
     '''
     params = []
 
-    if not show_completed:
-        query += ' AND t.is_completed = 0'
-
     if filter_activist:
         query += ' AND t.activist_id = ?'
         params.append(filter_activist)
 
-    if filter_month:
-        query += " AND strftime('%Y-%m', t.deadline) = ?"
-        params.append(filter_month)
-
-    query += ' ORDER BY t.is_completed ASC, t.deadline ASC'
+    # 월 필터: 정규화된 마감일에 대한 반열린 구간 [해당 월 1일, 다음 달 1일)
+    month_bounds = month_range(filter_month) if filter_month else None
+    if month_bounds:
+        query += ' AND t.sort_date >= ? AND t.sort_date < ?'
+        params.extend(month_bounds)
 
-    cursor.execute(query, params)
-    tasks_list = cursor.fetchall()
+    segments = ALL_TASK_SEGMENTS if show_completed else OPEN_TASK_SEGMENTS
+    tasks_list, next_cursor = fetch_page(conn, query, params, segments, after)
 
     # D-day 계산 및 월별 그룹화
+    # (페이지 경계에 걸친 달은 '더 보기'에서 같은 data-group의 목록에 이어 붙임)
     from collections import OrderedDict
     grouped_tasks = OrderedDict()
     for task in tasks_list:
-        task_dict = dict(task)
-        dday_text, dday_class = calc_dday(task['deadline'])
-        task_dict['dday_text'] = dday_text
-        task_dict['dday_class'] = dday_class
+        task_dict = task_view(task)
 
         # 월별 그룹 키
-        deadline = task['deadline']
-        if deadline:
-            dt = parse_date(deadline)
-            if dt:
-                month_key = dt.strftime('%Y년 %m월')
-            else:
-                month_key = '마감일 미정'
+        sort_date = task['sort_date']
+        if sort_date:
+            month_key = f'{sort_date[:4]}년 {sort_date[5:7]}월'
         else:
             month_key = '마감일 미정'
 
@@ -1011,20 +1071,29 @@ def tasks():
             grouped_tasks[month_key] = []
         grouped_tasks[month_key].append(task_dict)
 
-    cursor.execute('SELECT id, title, category, date FROM schedules ORDER BY date ASC')
+    page_args = dict(show_completed='1' if show_completed else '0', activist=filter_activist,
+                     month=filter_month)
+    if partial:
+        conn.close()
+        return render_template('_page.html', items_template='_task_groups.html', list_id='task-groups',
+                               grouped_tasks=grouped_tasks, next_cursor=next_cursor, page_args=page_args)
+
+    cursor.execute('SELECT id, title, category, date FROM schedules ORDER BY sort_date ASC')
     schedules_list = cursor.fetchall()
 
-    cursor.execute('SELECT * FROM activists')
-    activists = cursor.fetchall()
+    activists = get_activists()
 
-    # 월 목록 (필터용)
-    cursor.execute("SELECT DISTINCT strftime('%Y-%m', deadline) as month FROM tasks WHERE deadline IS NOT NULL AND deadline != '' ORDER BY month DESC")
-    months = [row['month'] for row in cursor.fetchall() if row['month']]
+    # 월 목록 (필터용, 트리거로 유지되는 task_months에서 조회)
+    cursor.execute('SELECT month FROM task_months ORDER BY month DESC')
+    months = [row['month'] for row in cursor.fetchall()]
 
     conn.close()
 
     return render_template('tasks.html',
                            grouped_tasks=grouped_tasks,
+                           next_cursor=next_cursor,
+                           page_args=page_args,
+                           list_id='task-groups',
                            schedules=schedules_list,
                            activists=activists,
                            months=months,
@@ -1035,6 +1104,7 @@ def tasks():
 
 @app.route('/task/add', methods=['POST'])
 @approval_required
+@write_transaction
 def task_add():
     """TODO 추가"""
     schedule_id = request.form.get('schedule_id', '') or None
@@ -1051,13 +1121,16 @@ def task_add():
         referer = request.form.get('referer', '') or url_for('index')
         return redirect(referer)
 
+    sort_date, date_precision = sort_fields(deadline)
     conn = get_db()
     cursor = conn.cursor()
     created_at = get_kst_now().strftime('%Y-%m-%d %H:%M')
     cursor.execute('''
-        INSERT INTO tasks (schedule_id, priority, activist_id, is_idea, is_draft, deadline, content, is_completed, created_at, details)
-        VALUES (?, ?, ?, ?, ?, ?, ?, 0, ?, ?)
-    ''', (schedule_id, priority, activist_id, is_idea, is_draft, deadline, content, created_at, details))
+        INSERT INTO tasks (schedule_id, priority, activist_id, is_idea, is_draft, deadline, content, is_completed, created_at, details,
+                           sort_date, date_precision)
+        VALUES (?, ?, ?, ?, ?, ?, ?, 0, ?, ?, ?, ?)
+    ''', (schedule_id, priority, activist_id, is_idea, is_draft, deadline, content, created_at, details,
+          sort_date, date_precision))
     conn.commit()
     conn.close()
 
@@ -1071,31 +1144,128 @@ def task_add():
 @app.route('/task/<int:task_id>/toggle', methods=['POST'])
 @approval_required
 def task_toggle(task_id):
-    """TODO 완료/미완료 토글"""
+    """TODO 완료/미완료 토글 (한 문장으로 원자적으로 뒤집음)"""
+    version = request_version()
+
+    rows = run_write(lambda conn: conn.execute('''
+        UPDATE tasks SET is_completed = CASE WHEN is_completed THEN 0 ELSE 1 END, version = version + 1
+        WHERE id = ? AND (? IS NULL OR version = ?)
+        RETURNING is_completed, version
+    ''', (task_id, version, version)).fetchall())
     conn = get_db()
-    cursor = conn.cursor()
-
-    cursor.execute('SELECT is_completed FROM tasks WHERE id = ?', (task_id,))
-    task = cursor.fetchone()
 
     new_status = 0
-    if task:
-        new_status = 0 if task['is_completed'] else 1
-        cursor.execute('UPDATE tasks SET is_completed = ? WHERE id = ?', (new_status, task_id))
-        conn.commit()
+    new_version = None
+    if rows:
+        new_status, new_version = rows[0]['is_completed'], rows[0]['version']
+    else:
+        current = conn.execute('SELECT is_completed, version FROM tasks WHERE id = ?', (task_id,)).fetchone()
+        if current:
+            conn.close()
+            return conflict_response({'new_status': current['is_completed'], 'version': current['version'],
+                                      'task_id': task_id}, url_for('index'))
 
     conn.close()
 
     # AJAX 요청인 경우 JSON 응답
-    if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-        return jsonify({'success': True, 'new_status': new_status, 'task_id': task_id})
+    if is_ajax():
+        return jsonify({'success': True, 'new_status': new_status, 'version': new_version, 'task_id': task_id})
 
     referer = request.referrer or url_for('index')
     return redirect(referer)
 
 
+# 여러 실무 한꺼번에 처리 (회의 중 일괄 완료/담당자 변경 등)
+BULK_MAX_TASKS = 500
+BULK_ACTION_NAMES = {'complete': '완료', 'reopen': '미완료로 변경', 'assign': '담당자 변경',
+                     'reschedule': '마감일 변경', 'delete': '삭제'}
+
+
+def bulk_statement(action, form):
+    """작업 -> (실무 한 개에 실행할 SQL, 앞쪽 인자) 또는 오류 메시지(str)"""
+    if action == 'complete':
+        return 'UPDATE tasks SET is_completed = 1, version = version + 1', ()
+    if action == 'reopen':
+        return 'UPDATE tasks SET is_completed = 0, version = version + 1', ()
+    if action == 'assign':
+        return 'UPDATE tasks SET activist_id = ?, version = version + 1', (form.get('activist_id', '') or None,)
+    if action == 'reschedule':
+        deadline = form.get('deadline', '').strip()
+        if deadline and not validate_date_format(deadline):
+            return '날짜 형식이 올바르지 않습니다.'
+        return ('UPDATE tasks SET deadline = ?, sort_date = ?, date_precision = ?, version = version + 1',
+                (deadline, *sort_fields(deadline)))
+    if action == 'delete':
+        return 'DELETE FROM tasks', ()
+    return '알 수 없는 작업입니다.'
+
+
+@app.route('/tasks/bulk', methods=['POST'])
+@approval_required
+@write_transaction
+def tasks_bulk():
+    """여러 실무에 같은 작업을 한 트랜잭션(커밋 1번)으로 적용
+
+    task_id와 version을 같은 순서로 여러 번 받습니다. version이 있으면 그 버전일 때만 적용하고
+    (다른 사람이 먼저 바꾼 실무는 conflicts로 돌려줌), 나머지는 그대로 적용합니다.
+    """
+    action = request.form.get('action', '')
+    try:
+        task_ids = [int(task_id) for task_id in request.form.getlist('task_id')]
+    except ValueError:
+        task_ids = []
+    versions = request.form.getlist('version')
+    if len(versions) != len(task_ids):
+        versions = [''] * len(task_ids)
+
+    statement = bulk_statement(action, request.form)
+    error = None
+    if isinstance(statement, str):
+        error = statement
+    elif not task_ids:
+        error = '실무를 선택해주세요.'
+    elif len(task_ids) > BULK_MAX_TASKS:
+        error = f'한 번에 {BULK_MAX_TASKS}개까지 처리할 수 있습니다.'
+    if error:
+        if is_ajax():
+            return jsonify({'success': False, 'error': error}), 400
+        flash(error)
+        return redirect(request.referrer or url_for('tasks'))
+
+    sql, values = statement
+    conn = get_db()
+    applied = {}  # 실무 id -> 적용 후 {is_completed, version} (삭제는 None)
+    conflicts = []
+    for task_id, version in zip(task_ids, versions):
+        version = int(version) if version.isdigit() else None
+        rows = conn.execute(f'{sql} WHERE id = ? AND (? IS NULL OR version = ?) RETURNING is_completed, version',
+                            (*values, task_id, version, version)).fetchall()
+        if rows:
+            applied[task_id] = None if action == 'delete' else dict(rows[0])
+        elif version is not None:
+            conflicts.append(task_id)  # 다른 사람이 먼저 바꿨거나 지운 실무
+    conn.commit()
+
+    # 담당자/마감일은 행 표시가 바뀌므로 ?view= 화면의 행 조각을 같이 보냄
+    view = row_view(TASK_ROW_TEMPLATES)
+    rows = None
+    if view and applied and action in ('assign', 'reschedule'):
+        rows = render_task_rows(conn, list(applied), view)
+    conn.close()
+
+    if is_ajax():
+        return jsonify({'success': True, 'action': action, 'applied': applied, 'conflicts': conflicts,
+                        'view': view, 'rows': rows, 'error': CONFLICT_MESSAGE if conflicts else None})
+
+    flash(f'{len(applied)}개 실무를 {BULK_ACTION_NAMES[action]}했습니다.')
+    if conflicts:
+        flash(f'{len(conflicts)}개는 {CONFLICT_MESSAGE}')
+    return redirect(request.referrer or url_for('tasks'))
+
+
 @app.route('/task/<int:task_id>/delete', methods=['POST'])
 @approval_required
+@write_transaction
 def task_delete(task_id):
     """실무 삭제"""
     conn = get_db()
@@ -1104,17 +1274,29 @@ def task_delete(task_id):
     conn.commit()
     conn.close()
 
+    # 행 조각을 요청한 화면은 그 행만 빼면 됨
+    if row_view(TASK_ROW_TEMPLATES):
+        return '', 204
+
     referer = request.referrer or url_for('tasks')
     return redirect(referer)
 
 
+@app.route('/task/<int:task_id>/fragment')
+@approval_required
+@conditional_get
+def task_row(task_id):
+    """실무 한 행만 ?view= 화면의 모양으로 다시 그림 (충돌 뒤 최신 상태로 맞출 때)"""
+    view = request.args.get('view', '')
+    if view not in TASK_ROW_TEMPLATES:
+        return jsonify({'success': False, 'error': '알 수 없는 화면입니다.'}), 404
+    return task_row_response(get_db(), task_id, view)
+
+
 @app.route('/task/<int:task_id>/edit', methods=['POST'])
 @approval_required
 def task_edit(task_id):
     """TODO 수정"""
-    conn = get_db()
-    cursor = conn.cursor()
-
     content = request.form.get('content', '').strip()
     activist_id = request.form.get('activist_id', '') or None
     deadline = request.form.get('deadline', '')
@@ -1128,15 +1310,32 @@ def task_edit(task_id):
         flash('내용을 입력해주세요.')
         return redirect(request.referrer or url_for('index'))
 
-    cursor.execute('''
-        UPDATE tasks SET content = ?, activist_id = ?, deadline = ?, is_draft = ?, schedule_id = ?, details = ?
-        WHERE id = ?
-    ''', (content, activist_id, deadline, is_draft, schedule_id, details, task_id))
-    conn.commit()
+    # 화면을 연 뒤 다른 사람이 바꾼 행이면 덮어쓰지 않음
+    version = request_version()
+    sort_date, date_precision = sort_fields(deadline)
+    rows = run_write(lambda conn: conn.execute('''
+        UPDATE tasks SET content = ?, activist_id = ?, deadline = ?, is_draft = ?, schedule_id = ?, details = ?,
+                         sort_date = ?, date_precision = ?, version = version + 1
+        WHERE id = ? AND (? IS NULL OR version = ?)
+        RETURNING version
+    ''', (content, activist_id, deadline, is_draft, schedule_id, details, sort_date, date_precision, task_id,
+          version, version)).fetchall())
+    conn = get_db()
+
+    if not rows:
+        current = conn.execute('SELECT version FROM tasks WHERE id = ?', (task_id,)).fetchone()
+        if current:
+            conn.close()
+            return conflict_response({'task_id': task_id, 'version': current['version']}, url_for('index'))
+
+    view = row_view(TASK_ROW_TEMPLATES)
+    if view:
+        return task_row_response(conn, task_id, view)
     conn.close()
 
-    if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-        return jsonify({'success': True, 'task_id': task_id, 'content': content})
+    if is_ajax():
+        return jsonify({'success': True, 'task_id': task_id, 'content': content,
+                        'version': rows[0]['version'] if rows else None})
 
     flash('수정되었습니다.')
     referer = request.referrer or url_for('index')
@@ -1147,6 +1346,7 @@ def task_edit(task_id):
 
 @app.route('/activists')
 @approval_required
+@conditional_get
 def activists():
     """활동가 목록"""
     conn = get_db()
@@ -1168,6 +1368,7 @@ def activists():
 
 @app.route('/activist/add', methods=['POST'])
 @superadmin_required
+@write_transaction
 def activist_add():
     """활동가 추가"""
     activist_id = request.form.get('id', '').strip().upper()
@@ -1196,6 +1397,7 @@ def activist_add():
 
 @app.route('/activist/<activist_id>/edit', methods=['POST'])
 @superadmin_required
+@write_transaction
 def activist_edit(activist_id):
     """활동가 정보 수정"""
     new_id = request.form.get('new_id', '').strip().upper()
@@ -1217,7 +1419,8 @@ def activist_edit(activist_id):
             return redirect(url_for('activists'))
 
         # 연관된 실무의 activist_id도 함께 업데이트
-        cursor.execute('UPDATE tasks SET activist_id = ? WHERE activist_id = ?', (new_id, activist_id))
+        cursor.execute('UPDATE tasks SET activist_id = ?, version = version + 1 WHERE activist_id = ?',
+                       (new_id, activist_id))
         cursor.execute('UPDATE activists SET id = ?, name = ? WHERE id = ?', (new_id, new_name, activist_id))
     else:
         cursor.execute('UPDATE activists SET name = ? WHERE id = ?', (new_name, activist_id))
@@ -1231,13 +1434,14 @@ def activist_edit(activist_id):
 
 @app.route('/activist/<activist_id>/delete', methods=['POST'])
 @superadmin_required
+@write_transaction
 def activist_delete(activist_id):
     """활동가 삭제"""
     conn = get_db()
     cursor = conn.cursor()
 
-    cursor.execute('UPDATE tasks SET activist_id = NULL WHERE activist_id = ?', (activist_id,))
-    cursor.execute('UPDATE ideas SET activist_id = NULL WHERE activist_id = ?', (activist_id,))
+    cursor.execute('UPDATE tasks SET activist_id = NULL, version = version + 1 WHERE activist_id = ?', (activist_id,))
+    cursor.execute('UPDATE ideas SET activist_id = NULL, version = version + 1 WHERE activist_id = ?', (activist_id,))
     cursor.execute('DELETE FROM activists WHERE id = ?', (activist_id,))
     conn.commit()
     conn.close()
@@ -1250,41 +1454,54 @@ def activist_delete(activist_id):
 
 @app.route('/ideas')
 @approval_required
+@conditional_get
 def ideas():
-    """사업 아이디어 목록 - 일정과 무관한 아이디어"""
+    """사업 아이디어 목록 - 일정과 무관한 아이디어 (after 커서로 다음 페이지, partial=1이면 목록 조각만)"""
     conn = get_db()
     cursor = conn.cursor()
 
     show_adopted = request.args.get('show_adopted', '0') == '1'
     filter_activist = request.args.get('activist', '')
+    after = request.args.get('after', '')
+    partial = request.args.get('partial') == '1'
 
-    query = '''
-        SELECT i.*, a.name as activist_name
-        FROM ideas i
-        LEFT JOIN activists a ON i.activist_id = a.id
-        WHERE 1=1
-    '''
+    conditions = ''
     params = []
 
     if not show_adopted:
-        query += ' AND i.is_adopted = 0'
+        conditions += ' AND i.is_adopted = 0'
 
     if filter_activist:
-        query += ' AND i.activist_id = ?'
+        conditions += ' AND i.activist_id = ?'
         params.append(filter_activist)
 
-    query += ' ORDER BY i.created_at DESC'
+    query = '''
+        SELECT i.*, a.name as activist_name
+        FROM ideas i
+        LEFT JOIN activists a ON i.activist_id = a.id
+        WHERE 1=1
+    ''' + conditions
+    ideas_list, next_cursor = fetch_page(conn, query, params, IDEA_SEGMENTS, after)
 
-    cursor.execute(query, params)
-    ideas_list = cursor.fetchall()
+    page_args = dict(show_adopted='1' if show_adopted else '0', activist=filter_activist)
+    if partial:
+        conn.close()
+        return render_template('_page.html', items_template='_idea_items.html', list_id='idea-list',
+                               ideas=ideas_list, next_cursor=next_cursor, page_args=page_args)
 
-    cursor.execute('SELECT * FROM activists ORDER BY name')
-    activists = cursor.fetchall()
+    cursor.execute('SELECT COUNT(*) FROM ideas i WHERE 1=1' + conditions, params)
+    idea_count = cursor.fetchone()[0]
+
+    activists = get_activists()
 
     conn.close()
 
     return render_template('ideas.html',
                            ideas=ideas_list,
+                           idea_count=idea_count,
+                           next_cursor=next_cursor,
+                           page_args=page_args,
+                           list_id='idea-list',
                            activists=activists,
                            show_adopted=show_adopted,
                            filter_activist=filter_activist)
@@ -1292,6 +1509,7 @@ def ideas():
 
 @app.route('/idea/add', methods=['POST'])
 @approval_required
+@write_transaction
 def idea_add():
     """사업 아이디어 추가"""
     content = request.form.get('content', '').strip()
@@ -1318,29 +1536,38 @@ def idea_add():
 @app.route('/idea/<int:idea_id>/toggle', methods=['POST'])
 @approval_required
 def idea_toggle(idea_id):
-    """아이디어 채택 토글"""
+    """아이디어 채택 토글 (한 문장으로 원자적으로 뒤집음)"""
+    version = request_version()
+
+    rows = run_write(lambda conn: conn.execute('''
+        UPDATE ideas SET is_adopted = CASE WHEN is_adopted THEN 0 ELSE 1 END, version = version + 1
+        WHERE id = ? AND (? IS NULL OR version = ?)
+        RETURNING is_adopted, version
+    ''', (idea_id, version, version)).fetchall())
     conn = get_db()
-    cursor = conn.cursor()
-
-    cursor.execute('SELECT is_adopted FROM ideas WHERE id = ?', (idea_id,))
-    idea = cursor.fetchone()
 
     new_status = 0
-    if idea:
-        new_status = 0 if idea['is_adopted'] else 1
-        cursor.execute('UPDATE ideas SET is_adopted = ? WHERE id = ?', (new_status, idea_id))
-        conn.commit()
+    new_version = None
+    if rows:
+        new_status, new_version = rows[0]['is_adopted'], rows[0]['version']
+    else:
+        current = conn.execute('SELECT is_adopted, version FROM ideas WHERE id = ?', (idea_id,)).fetchone()
+        if current:
+            conn.close()
+            return conflict_response({'new_status': current['is_adopted'], 'version': current['version'],
+                                      'idea_id': idea_id}, url_for('ideas'))
 
     conn.close()
 
-    if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-        return jsonify({'success': True, 'new_status': new_status, 'idea_id': idea_id})
+    if is_ajax():
+        return jsonify({'success': True, 'new_status': new_status, 'version': new_version, 'idea_id': idea_id})
 
     return redirect(url_for('ideas'))
 
 
 @app.route('/idea/<int:idea_id>/delete', methods=['POST'])
 @approval_required
+@write_transaction
 def idea_delete(idea_id):
     """아이디어 삭제"""
     conn = get_db()
@@ -1349,10 +1576,73 @@ def idea_delete(idea_id):
     conn.commit()
     conn.close()
 
+    if row_view(IDEA_TEMPLATES):
+        return '', 204
+
     flash('아이디어가 삭제되었습니다.')
     return redirect(url_for('ideas'))
 
 
+@app.route('/idea/<int:idea_id>/fragment')
+@approval_required
+@conditional_get
+def idea_row(idea_id):
+    """아이디어 한 행만 다시 그림 (지워졌으면 204)"""
+    conn = get_db()
+    idea = conn.execute('''
+        SELECT i.*, a.name as activist_name
+        FROM ideas i
+        LEFT JOIN activists a ON i.activist_id = a.id
+        WHERE i.id = ?
+    ''', (idea_id,)).fetchone()
+    conn.close()
+    if not idea:
+        return '', 204
+    return render_template(IDEA_TEMPLATES['ideas'], idea=idea)
+
+
+# ========== 검색 ==========
+
+@app.route('/search')
+@approval_required
+def search():
+    """실무/일정/아이디어 통합 검색"""
+    query = request.args.get('q', '').strip()
+    cursor = request.args.get('after')
+
+    results, next_cursor = search_rows(get_db(), query, cursor)
+
+    return render_template('search.html',
+                           query=query,
+                           results=results,
+                           next_cursor=next_cursor,
+                           is_first_page=not cursor,
+                           KIND_SCHEDULE=KIND_SCHEDULE,
+                           KIND_TASK=KIND_TASK,
+                           KIND_IDEA=KIND_IDEA)
+
+
+# ========== 실시간 갱신 ==========
+
+@app.route('/events')
+@approval_required
+def events():
+    """실시간 변경 스트림 (Server-Sent Events)
+
+    Last-Event-ID(다시 연결할 때) 또는 ?after= 다음의 변경을 보냅니다.
+    요청마다 스레드가 있는 워커에서만 연결을 붙잡고(워커당 live.MAX_STREAMS개까지),
+    동기 워커나 자리가 없을 때는 밀린 것만 보내고 끝냅니다.
+    """
+    after = request.headers.get('Last-Event-ID') or request.args.get('after', '')
+    after = int(after) if after.isdigit() else None
+    hold = live.STREAM_SECONDS if request.environ.get('wsgi.multithread') else 0
+
+    response = Response(live.stream(after, hold), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # 프록시(nginx)가 모아서 보내지 않도록
+    return response
+
+
 if __name__ == '__main__':
     debug = os.environ.get('FLASK_ENV', 'development') == 'development'
     port = int(os.environ.get('PORT', 8000))
@@ -0,0 +1,8 @@
+"""
+부하 측정용 벤치마크
+
+    python -m benchmark --tasks 10000 --out bench.json
+
+합성 데이터베이스를 만들고 Flask 테스트 클라이언트로 모든 화면을 돌려
+경로별 지연시간(p50/p95/p99), 요청당 SQL 문 수, 요청당 최대 할당량과 프로세스 최대 RSS를 JSON으로 출력합니다.
+"""
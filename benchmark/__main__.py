@@ -0,0 +1,164 @@
+import argparse
+import json
+import os
+import platform
+import resource
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from urllib.parse import quote
+
+
+def percentile(samples, pct):
+    """최근접 순위(nearest-rank) 백분위수"""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_routes(conn):
+    """측정할 (이름, 메서드, 경로, 폼 데이터, 헤더) 목록"""
+    schedule_id = conn.execute('SELECT id FROM schedules ORDER BY id LIMIT 1').fetchone()[0]
+    task_id = conn.execute('SELECT id FROM tasks WHERE is_idea = 0 ORDER BY id LIMIT 1').fetchone()[0]
+    bulk_ids = [row[0] for row in conn.execute('SELECT id FROM tasks WHERE is_idea = 0 ORDER BY id LIMIT 20 OFFSET 1')]
+    idea_id = conn.execute('SELECT id FROM ideas ORDER BY id LIMIT 1').fetchone()[0]
+    month = conn.execute('SELECT month FROM task_months ORDER BY task_count DESC LIMIT 1').fetchone()[0]
+    ajax = {'X-Requested-With': 'XMLHttpRequest'}
+    return [
+        ('index', 'GET', '/', None, None),
+        ('index_completed', 'GET', '/?show_completed=1&activist=', None, None),
+        ('meeting', 'GET', '/meeting', None, None),
+        ('schedules', 'GET', '/schedules', None, None),
+        ('schedule_detail', 'GET', f'/schedule/{schedule_id}', None, None),
+        ('schedule_add_form', 'GET', '/schedule/add', None, None),
+        ('schedule_edit_form', 'GET', f'/schedule/{schedule_id}/edit', None, None),
+        ('tasks', 'GET', '/tasks', None, None),
+        ('tasks_completed', 'GET', '/tasks?show_completed=1', None, None),
+        ('tasks_month', 'GET', f'/tasks?month={month}', None, None),
+        ('activists', 'GET', '/activists', None, None),
+        ('ideas', 'GET', '/ideas', None, None),
+        ('admin_users', 'GET', '/admin/users', None, None),
+        ('search', 'GET', '/search?q=' + quote('아이디어'), None, None),
+        ('search_short', 'GET', '/search?q=' + quote('실무'), None, None),
+        ('events', 'GET', '/events', None, None),
+        ('task_toggle', 'POST', f'/task/{task_id}/toggle', None, ajax),
+        ('task_edit', 'POST', f'/task/{task_id}/edit',
+         {'content': '벤치마크 수정', 'deadline': '2026-05-중순', 'schedule_id': schedule_id}, ajax),
+        ('task_edit_row', 'POST', f'/task/{task_id}/edit?view=index',
+         {'content': '벤치마크 수정', 'deadline': '2026-05-중순', 'schedule_id': schedule_id}, ajax),
+        ('task_row', 'GET', f'/task/{task_id}/fragment?view=tasks', None, ajax),
+        ('task_add', 'POST', '/task/add', {'content': '벤치마크 추가', 'deadline': '2026-06', 'schedule_id': schedule_id,
+                                           'referer': '/tasks'}, None),
+        ('task_bulk_complete', 'POST', '/tasks/bulk', {'action': 'complete', 'task_id': bulk_ids}, ajax),
+        ('idea_toggle', 'POST', f'/idea/{idea_id}/toggle', None, ajax),
+        ('schedule_toggle', 'POST', f'/schedule/{schedule_id}/toggle_complete', None, None),
+        ('schedule_toggle_card', 'POST', f'/schedule/{schedule_id}/toggle_complete?view=detail', None, ajax),
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmark', description='합성 데이터로 모든 화면의 성능을 측정합니다.')
+    parser.add_argument('--tasks', type=int, default=1000, help='실무 수 (예: 1000, 10000, 100000)')
+    parser.add_argument('--schedules', type=int, default=None, help='일정 수 (기본: 실무 수 / 10)')
+    parser.add_argument('--activists', type=int, default=200)
+    parser.add_argument('--ideas', type=int, default=None, help='아이디어 수 (기본: 실무 수 / 20)')
+    parser.add_argument('--requests', type=int, default=30, help='경로별 요청 수')
+    parser.add_argument('--route', action='append', help='이 이름의 경로만 측정 (여러 번 지정 가능)')
+    parser.add_argument('--cold', action='store_true', help='매 요청마다 조각 캐시를 비움')
+    parser.add_argument('--db', help='데이터베이스 파일 경로 (기본: 임시 파일)')
+    parser.add_argument('--out', help='결과 JSON 파일 (기본: 표준 출력)')
+    args = parser.parse_args(argv)
+
+    db_path = args.db or os.path.join(tempfile.mkdtemp(prefix='bqa-bench-'), 'bench.db')
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    # models/app은 import 시점에 DATABASE_PATH를 읽으므로 먼저 설정
+    os.environ['DATABASE_PATH'] = db_path
+
+    from benchmark.datagen import generate
+
+    started = time.perf_counter()
+    scale = generate(tasks=args.tasks, schedules=args.schedules, activists=args.activists, ideas=args.ideas)
+    generate_seconds = time.perf_counter() - started
+
+    from app import app
+    from fragment_cache import fragment_cache
+
+    app.config['TESTING'] = True  # X-Query-Count 헤더 활성화
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = '1'
+
+    conn = sqlite3.connect(db_path)
+    routes = build_routes(conn)
+    conn.close()
+    if args.route:
+        routes = [route for route in routes if route[0] in args.route]
+
+    results = {}
+    for name, method, path, data, headers in routes:
+        timings = []
+        queries = []
+        status = None
+        for _ in range(args.requests):
+            if args.cold:
+                fragment_cache.clear()
+            started = time.perf_counter()
+            response = client.open(path, method=method, data=data, headers=headers)
+            timings.append((time.perf_counter() - started) * 1000)
+            queries.append(int(response.headers.get('X-Query-Count', 0)))
+            status = response.status_code
+        # 할당 최고치는 시간을 재지 않는 요청 하나로 (tracemalloc이 켜져 있으면 느려짐)
+        tracemalloc.start()
+        client.open(path, method=method, data=data, headers=headers)
+        peak_alloc = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        results[name] = {
+            'method': method,
+            'path': path,
+            'status': status,
+            'requests': len(timings),
+            'p50_ms': round(percentile(timings, 50), 3),
+            'p95_ms': round(percentile(timings, 95), 3),
+            'p99_ms': round(percentile(timings, 99), 3),
+            'mean_ms': round(sum(timings) / len(timings), 3),
+            'queries_per_request': round(sum(queries) / len(queries), 2),
+            # 요청 하나가 처리 중에 파이썬 객체로 잡은 메모리의 최고치
+            'peak_alloc_kb': round(peak_alloc / 1024, 1),
+        }
+        print(f'{name:20s} p50 {results[name]["p50_ms"]:9.2f}ms  p95 {results[name]["p95_ms"]:9.2f}ms  '
+              f'queries {results[name]["queries_per_request"]:6.1f}', file=sys.stderr)
+
+    report = {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'scale': scale,
+        'generate_seconds': round(generate_seconds, 3),
+        'requests_per_route': args.requests,
+        'cold_fragment_cache': args.cold,
+        # 프로세스 전체의 최대 RSS (모든 경로를 돈 뒤의 최고치라 경로별 값이 아님)
+        'process_peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'routes': results,
+    }
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
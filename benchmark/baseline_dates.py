@@ -0,0 +1,160 @@
+"""
+dates.py 이전의 날짜 함수 (기준 커밋 8bfcb1c의 app.py에서 그대로 옮김)
+
+python -m benchmark.dates의 성능 비교에서 "이전" 값을 재는 데만 씁니다. 고치지 마세요.
+"""
+from datetime import datetime, timedelta, timezone
+
+# 한국 시간대 (KST = UTC+9)
+KST = timezone(timedelta(hours=9))
+
+def get_kst_now():
+    """현재 한국 시간을 반환합니다."""
+    return datetime.now(KST)
+
+
+def parse_date(date_str):
+    """날짜 문자열을 파싱합니다. 대략적 시기도 정렬용으로 변환합니다."""
+    import re
+    if not date_str:
+        return None
+
+    # YYYY-MM-DD (정확한 날짜)
+    try:
+        return datetime.strptime(date_str, '%Y-%m-%d')
+    except ValueError:
+        pass
+
+    # YYYY-MM (월만) -> 15일로 설정
+    try:
+        return datetime.strptime(date_str + '-15', '%Y-%m-%d')
+    except ValueError:
+        pass
+
+    # YYYY-MM-초/중순/말/미정 (대략적 시기)
+    match = re.match(r'^(\d{4})-(\d{2})-(초|중순|말|미정)$', date_str)
+    if match:
+        year = int(match.group(1))
+        month = int(match.group(2))
+        timing = match.group(3)
+        if timing == '초':
+            day = 1
+        elif timing == '중순':
+            day = 15
+        elif timing == '말':
+            # 해당 월의 마지막 날 계산
+            import calendar
+            day = calendar.monthrange(year, month)[1]
+        else:  # 미정
+            day = 15
+        return datetime(year, month, day)
+
+    # YYYY-MM-시기~MM-시기 (범위) -> 첫 번째 월 기준
+    match = re.match(r'^(\d{4})-(\d{2})-(초|중순|말)?~', date_str)
+    if match:
+        year = int(match.group(1))
+        month = int(match.group(2))
+        timing = match.group(3) or '중순'
+        if timing == '초':
+            day = 1
+        elif timing == '중순':
+            day = 15
+        elif timing == '말':
+            import calendar
+            day = calendar.monthrange(year, month)[1]
+        else:
+            day = 15
+        return datetime(year, month, day)
+
+    # "연중" -> 연말(12월)로 정렬
+    if date_str == '연중':
+        return datetime(2026, 12, 31)
+
+    return None
+
+
+def calc_dday(deadline_str):
+    """D-day를 계산합니다. 반환: (일수, CSS클래스)"""
+    if not deadline_str:
+        return None, 'safe'
+
+    deadline = parse_date(deadline_str)
+    if not deadline:
+        return None, 'safe'
+
+    # 타임존 없는 날짜로 비교 (날짜만 비교하면 되므로)
+    today = get_kst_now().replace(tzinfo=None)
+    today = today.replace(hour=0, minute=0, second=0, microsecond=0)
+    diff = (deadline - today).days
+
+    if diff < 0:
+        return f'D+{abs(diff)}', 'overdue'
+    elif diff == 0:
+        return 'D-Day', 'd1'
+    elif diff == 1:
+        return 'D-1', 'd1'
+    elif diff == 2:
+        return 'D-2', 'd2'
+    elif diff == 3:
+        return 'D-3', 'd3'
+    else:
+        return f'D-{diff}', 'safe'
+
+
+def format_date_kr(date_str):
+    """날짜를 한국어 형식으로 변환합니다."""
+    import re
+    if not date_str:
+        return '미정'
+
+    # "연중"
+    if date_str == '연중':
+        return '연중 1회'
+
+    # YYYY-MM-DD (정확한 날짜)
+    if re.match(r'^\d{4}-\d{2}-\d{2}$', date_str):
+        dt = parse_date(date_str)
+        if dt:
+            return dt.strftime('%m월 %d일')
+
+    # YYYY-MM (월만)
+    if re.match(r'^\d{4}-\d{2}$', date_str):
+        try:
+            month = int(date_str[5:7])
+            return f'{month}월'
+        except ValueError:
+            pass
+
+    # YYYY-MM-초/중순/말/미정 (대략적 시기)
+    match = re.match(r'^(\d{4})-(\d{2})-(초|중순|말|미정)$', date_str)
+    if match:
+        month = int(match.group(2))
+        timing = match.group(3)
+        return f'{month}월 {timing}'
+
+    # YYYY-MM-시기~MM-시기 (범위)
+    match = re.match(r'^(\d{4})-(\d{2})-(초|중순|말)?~(\d{2})-(초|중순|말)?$', date_str)
+    if match:
+        month1 = int(match.group(2))
+        timing1 = match.group(3) or ''
+        month2 = int(match.group(4))
+        timing2 = match.group(5) or ''
+        return f'{month1}월 {timing1}~{month2}월 {timing2}'.strip()
+
+    # 그 외
+    dt = parse_date(date_str)
+    if dt:
+        return dt.strftime('%m월 %d일')
+    return date_str
+
+
+# 요일을 한글로 변환
+def format_weekday_kr(date_str):
+    """날짜 문자열에서 요일을 한글로 반환합니다."""
+    weekdays = ['월', '화', '수', '목', '금', '토', '일']
+    if not date_str:
+        return ''
+    dt = parse_date(date_str)
+    if dt:
+        return weekdays[dt.weekday()]
+    return ''
@@ -0,0 +1,189 @@
+"""
+토글 동시성 검사
+
+    python -m benchmark.concurrency --processes 4 --threads 4 --rounds 200
+
+실무 몇 개에 여러 프로세스 x 스레드가 동시에 /task/<id>/toggle을 보냅니다.
+각 작업자는 화면처럼 마지막으로 받은 행 버전을 기억해 같이 보내므로
+다른 작업자가 먼저 바꾼 행이면 409로 거부되고, 응답의 현재 버전으로 맞춘 뒤 계속합니다.
+
+끝나면 실무마다 (처음 버전 + 받아들여진 토글 수) == 최종 버전이고
+완료 여부가 받아들여진 토글 수의 홀짝과 맞는지 확인합니다.
+토글이 하나라도 사라지거나(lost update) 두 번 적용되면 어긋나서 실패합니다.
+--no-version이면 버전 없이 보내서 모든 토글이 받아들여져야 합니다.
+
+마지막으로 같은 버전을 본 두 화면이 차례로 수정하면 두 번째가 409로 거부되는지 확인합니다.
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import models
+from benchmark import datagen
+
+AJAX = {'X-Requested-With': 'XMLHttpRequest'}
+
+
+def load_app(db_path):
+    """db_path를 쓰는 앱 (프로세스마다 한 번)"""
+    os.environ['DATABASE_PATH'] = db_path
+    models.DATABASE = db_path
+    import app as app_module
+    app_module.app.config['TESTING'] = True
+    return app_module.app
+
+
+def login(app):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = '1'
+        session['_fresh'] = True
+    return client
+
+
+def hammer(app, versions, rounds, versioned, seed):
+    """토글을 rounds번 보냅니다. versions: {실무 id: 처음 버전}
+    반환: (실무별 받아들여진 토글 수, 상태 코드별 횟수)
+    """
+    rng = random.Random(seed)
+    client = login(app)
+    task_ids = list(versions)
+    known_versions = dict(versions)
+    applied = Counter()
+    statuses = Counter()
+    for _ in range(rounds):
+        task_id = rng.choice(task_ids)
+        data = {'version': known_versions[task_id]} if versioned else None
+        response = client.post(f'/task/{task_id}/toggle', data=data, headers=AJAX)
+        statuses[response.status_code] += 1
+        body = response.get_json(silent=True) or {}
+        if response.status_code == 200:
+            applied[task_id] += 1
+        if body.get('version'):
+            known_versions[task_id] = body['version']
+    return applied, statuses
+
+
+def run_process(db_path, versions, threads, rounds, versioned, seed):
+    """한 프로세스 안에서 threads개 스레드로 hammer"""
+    app = load_app(db_path)
+    applied = Counter()
+    statuses = Counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        futures = [executor.submit(hammer, app, versions, rounds, versioned, seed * 100 + i) for i in range(threads)]
+        for future in futures:
+            thread_applied, thread_statuses = future.result()
+            applied.update(thread_applied)
+            statuses.update(thread_statuses)
+    return applied, statuses
+
+
+def check_counts(db_path, initial, applied):
+    """실무별 최종 (완료 여부, 버전)이 받아들여진 토글 수와 맞는지. 반환: 어긋난 실무 목록"""
+    conn = sqlite3.connect(db_path)
+    mismatches = []
+    for task_id, is_completed, version in conn.execute('SELECT id, is_completed, version FROM tasks WHERE id IN (%s)'
+                                                        % ','.join('?' * len(initial)), list(initial)):
+        start_completed, start_version = initial[task_id]
+        count = applied.get(task_id, 0)
+        expected = (start_completed ^ (count % 2), start_version + count)
+        if (is_completed, version) != expected:
+            mismatches.append({'task_id': task_id, 'toggles': count, 'expected': expected,
+                               'actual': (is_completed, version)})
+    conn.close()
+    return mismatches
+
+
+def read_task(task_id, column):
+    conn = sqlite3.connect(models.DATABASE)
+    value = conn.execute(f'SELECT {column} FROM tasks WHERE id = ?', (task_id,)).fetchone()[0]
+    conn.close()
+    return value
+
+
+def check_stale_edit(app, task_id):
+    """같은 버전을 본 두 화면이 차례로 수정: 두 번째는 409, 내용은 첫 번째 것이어야 함"""
+    first, second = login(app), login(app)
+    version = read_task(task_id, 'version')
+    form = {'deadline': '2026-05-중순', 'version': version}
+    ok = first.post(f'/task/{task_id}/edit', data={**form, 'content': '첫 번째 수정'}, headers=AJAX)
+    stale = second.post(f'/task/{task_id}/edit', data={**form, 'content': '두 번째 수정'}, headers=AJAX)
+    content = read_task(task_id, 'content')
+    return {'first_status': ok.status_code, 'second_status': stale.status_code, 'content': content,
+            'passed': ok.status_code == 200 and stale.status_code == 409 and content == '첫 번째 수정'}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmark.concurrency')
+    parser.add_argument('--processes', type=int, default=4, help='프로세스 수 (0이면 현재 프로세스에서 스레드만)')
+    parser.add_argument('--threads', type=int, default=4, help='프로세스당 스레드 수')
+    parser.add_argument('--rounds', type=int, default=200, help='스레드당 토글 요청 수')
+    parser.add_argument('--tasks', type=int, default=5, help='토글할 실무 수 (적을수록 경합이 심함)')
+    parser.add_argument('--no-version', action='store_true', help='버전 없이 토글 (모두 받아들여져야 함)')
+    parser.add_argument('--out', help='결과 JSON 파일 (기본: 표준 출력)')
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix='bqa-concurrency-')
+    db_path = os.path.join(workdir, 'bench.db')
+    models.DATABASE = db_path
+    datagen.generate(tasks=max(args.tasks, 100))
+
+    conn = sqlite3.connect(db_path)
+    initial = {task_id: (is_completed, version) for task_id, is_completed, version in
+               conn.execute('SELECT id, is_completed, version FROM tasks ORDER BY id LIMIT ?', (args.tasks,))}
+    conn.close()
+    versions = {task_id: version for task_id, (_, version) in initial.items()}
+    versioned = not args.no_version
+
+    started = time.perf_counter()
+    applied = Counter()
+    statuses = Counter()
+    if args.processes:
+        with ProcessPoolExecutor(max_workers=args.processes) as executor:
+            futures = [executor.submit(run_process, db_path, versions, args.threads, args.rounds, versioned, seed)
+                       for seed in range(args.processes)]
+            for future in futures:
+                process_applied, process_statuses = future.result()
+                applied.update(process_applied)
+                statuses.update(process_statuses)
+    else:
+        applied, statuses = run_process(db_path, versions, args.threads, args.rounds, versioned, 0)
+    seconds = time.perf_counter() - started
+
+    mismatches = check_counts(db_path, initial, applied)
+    stale_edit = check_stale_edit(load_app(db_path), next(iter(initial)))
+    requests = sum(statuses.values())
+    report = {
+        'processes': args.processes,
+        'threads': args.threads,
+        'tasks': args.tasks,
+        'versioned': versioned,
+        'requests': requests,
+        'seconds': round(seconds, 3),
+        'requests_per_second': round(requests / seconds, 1),
+        'statuses': {str(code): count for code, count in sorted(statuses.items())},
+        'applied_toggles': sum(applied.values()),
+        'mismatches': mismatches,
+        'stale_edit': stale_edit,
+    }
+    passed = (not mismatches and stale_edit['passed'] and set(statuses) <= ({200, 409} if versioned else {200}))
+    report['passed'] = passed
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+    return 0 if passed else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""합성 데이터 생성기 - 실제 엑셀에 나오는 모든 날짜 형식을 섞어서 만듭니다."""
+import random
+import string
+
+import models
+from dates import sort_fields
+
+CATEGORIES = ('정기모임', '정기모임 연계활동', '연대사업', '의결기관')
+TIMINGS = ('초', '중순', '말', '미정')
+
+
+def random_date(rng, year=2026):
+    """schedules.date / tasks.deadline에 들어가는 자유 텍스트 날짜 하나"""
+    month = rng.randint(1, 12)
+    kind = rng.random()
+    if kind < 0.55:
+        return f'{year}-{month:02d}-{rng.randint(1, 28):02d}'
+    elif kind < 0.70:
+        return f'{year}-{month:02d}'
+    elif kind < 0.85:
+        return f'{year}-{month:02d}-{rng.choice(TIMINGS)}'
+    elif kind < 0.92:
+        month2 = min(month + 1, 12)
+        return f'{year}-{month:02d}-{rng.choice(TIMINGS[:3])}~{month2:02d}-{rng.choice(TIMINGS[:3])}'
+    elif kind < 0.96:
+        return '연중'
+    return ''
+
+
+def _activist_ids(count):
+    ids = []
+    for i in range(count):
+        # A, B, ..., Z, AA, AB, ...
+        name, n = '', i
+        while True:
+            name = string.ascii_uppercase[n % 26] + name
+            n = n // 26 - 1
+            if n < 0:
+                break
+        ids.append(name)
+    return ids
+
+
+def generate(tasks=1000, schedules=None, activists=200, ideas=None, users=20, seed=2026):
+    """models.DATABASE에 합성 데이터를 채웁니다. 반환: 만든 행 수"""
+    rng = random.Random(seed)
+    schedules = schedules if schedules is not None else max(tasks // 10, 5)
+    ideas = ideas if ideas is not None else max(tasks // 20, 5)
+
+    models.init_db()
+    conn = models._connect()
+
+    activist_ids = _activist_ids(activists)
+    conn.executemany('INSERT OR IGNORE INTO activists (id, name) VALUES (?, ?)',
+                     [(a, f'활동가{i}') for i, a in enumerate(activist_ids)])
+
+    schedule_ids = [f'S{i:06d}' for i in range(schedules)]
+    rows = []
+    for schedule_id in schedule_ids:
+        date = random_date(rng)
+        rows.append((schedule_id, date, rng.choice(CATEGORIES), f'일정 {schedule_id}',
+                     int(rng.random() < 0.5), int(rng.random() < 0.2), int(rng.random() < 0.3),
+                     '<p>세부 내용</p>' * rng.randint(0, 5), *sort_fields(date)))
+    conn.executemany('''
+        INSERT INTO schedules (id, date, category, title, is_confirmed, is_completed, needs_advance_prep, details,
+                               sort_date, date_precision)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
+
+    rows = []
+    for i in range(tasks):
+        deadline = random_date(rng)
+        rows.append((rng.choice(schedule_ids), rng.randint(1, 5),
+                     rng.choice(activist_ids) if rng.random() < 0.9 else None,
+                     int(rng.random() < 0.15), int(rng.random() < 0.1), deadline, f'실무 {i}',
+                     int(rng.random() < 0.6), '2026-01-01 09:00', *sort_fields(deadline)))
+    conn.executemany('''
+        INSERT INTO tasks (schedule_id, priority, activist_id, is_idea, is_draft, deadline, content, is_completed,
+                           created_at, sort_date, date_precision)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
+
+    conn.executemany('INSERT INTO ideas (content, activist_id, is_adopted, created_at) VALUES (?, ?, ?, ?)',
+                     [(f'아이디어 {i}', rng.choice(activist_ids), int(rng.random() < 0.3),
+                       f'2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} 10:00') for i in range(ideas)])
+
+    # 1번 사용자는 최고 관리자 (벤치마크 로그인용)
+    conn.executemany('''
+        INSERT OR IGNORE INTO users (id, google_id, email, name, is_approved, created_at, activist_id)
+        VALUES (?, ?, ?, ?, 1, '2026-01-01 09:00', ?)
+    ''', [(i + 1, f'google-{i}', f'user{i}@example.com', f'사용자{i}', activist_ids[i % activists])
+          for i in range(users)])
+
+    conn.commit()
+    conn.execute('ANALYZE')
+    conn.close()
+    return {'tasks': tasks, 'schedules': schedules, 'activists': activists, 'ideas': ideas, 'users': users}
@@ -0,0 +1,109 @@
+"""
+날짜 규칙표 검사와 벤치마크
+
+    python -m benchmark.dates --samples 2000 --calls 100000
+
+- 규칙표 검사: 저장 형식과 엑셀 표현을 섞은 무작위 입력으로 dates의 규칙표 성질을 확인합니다.
+- 벤치마크: 기준 커밋(8bfcb1c) app.py의 날짜 함수(benchmark.baseline_dates)와
+  규칙표의 캐시 없는/캐시된 호출당 비용을 비교합니다.
+"""
+import argparse
+import random
+import timeit
+
+from benchmark import baseline_dates
+from dates import (DATE_RULES, WEEKDAYS_KR, _dday, calc_dday, format_date_kr, format_weekday_kr, get_kst_now,
+                   normalize_date_phrase, parse_date, parse_date_value, validate_date_format)
+
+
+def corpus(rng, n):
+    """저장 형식과 엑셀 표현을 섞은 무작위 입력"""
+    timings = ('초', '중순', '말', '미정', '')
+    samples = []
+    for _ in range(n):
+        month, day = rng.randint(0, 13), rng.randint(0, 32)
+        month2, timing, timing2 = rng.randint(1, 12), rng.choice(timings), rng.choice(timings[:3] + ('',))
+        samples += [
+            f'2026-{month:02d}-{day:02d}', f'2026-{month}-{day}', f'2026-{month:02d}', f'2026-{month:02d}-{timing}',
+            f'2026-{month:02d}-{timing2}~{month2:02d}-{rng.choice(timings[:3])}',
+            f'{month}월', f'{month}월 {timing}', f'{month}월 {day}일({rng.choice(WEEKDAYS_KR)})',
+            f'{month}월 {timing2}~{month2}월 {timing2}', f'{month}월 {day}일 또는 {day + 1}일', f'{month}~{month2}월 중',
+        ]
+    return samples + ['', '연중', '연중 1회', '미정', '상시', 'bad-date']
+
+
+def check_corpus(n=2000, seed=2026):
+    """규칙표의 성질을 무작위 입력으로 확인합니다.
+
+    - 파싱된 값의 text는 다시 파싱해도 같은 값이고 검증을 통과한다
+    - start <= end, start <= anchor (범위의 anchor는 첫 달 시기 기준)
+    - 빠른 경로와 규칙표 결과가 같다
+    - 엑셀 표현을 옮긴 결과는 빈 값이거나 저장 형식이다
+    """
+    samples = corpus(random.Random(seed), n)
+    day_pattern, day_build = DATE_RULES[0]
+    for text in samples:
+        value = parse_date_value(text)
+        if value is not None:
+            assert parse_date_value(value.text) == value, text
+            assert validate_date_format(value.text), text
+            assert value.start <= value.end and value.start <= value.anchor.date(), text
+            assert format_date_kr(text) == value.label, text
+        match = day_pattern.match(text)
+        if match:
+            try:
+                expected = day_build(match)
+            except ValueError:
+                expected = None
+            assert parse_date_value.__wrapped__(text) == expected, text
+        normalized, _ = normalize_date_phrase(text)
+        assert normalized == '' or validate_date_format(normalized) or parse_date_value(normalized) is None, text
+    print(f'규칙표 확인: 입력 {len(samples)}개 통과')
+
+
+def benchmark(n=100000):
+    """기준 커밋(8bfcb1c) app.py의 날짜 함수와 호출당 비용을 비교합니다."""
+    samples = ['2026-03-21', '2026-03', '2026-04-중순', '2026-04-말', '2026-06-미정',
+               '2026-05-말~06-초', '2026-07-~08-', '연중', '', 'bad-date']
+    samples += [f'2026-{m:02d}-{d:02d}' for m in range(1, 13) for d in range(1, 29)]
+    inputs = [random.choice(samples) for _ in range(n)]
+    today = get_kst_now().date()
+
+    # YYYY-MM-DD 빠른 경로 vs 규칙표의 정규식
+    day_pattern, day_build = DATE_RULES[0]
+    days = [s for s in samples if day_pattern.match(s)]
+    fast = timeit.timeit(lambda: [parse_date_value.__wrapped__(s) for s in days], number=100)
+    slow = timeit.timeit(lambda: [day_build(day_pattern.match(s)) for s in days], number=100)
+    print(f'YYYY-MM-DD         정규식 {slow / len(days) / 100 * 1e9:8.0f} ns/회   빠른 경로 {fast / len(days) / 100 * 1e9:8.0f} ns/회')
+
+    # 이름: (이전 app.py, 규칙표 캐시 없음, 규칙표 캐시)
+    functions = {
+        'parse_date': (baseline_dates.parse_date, lambda s: parse_date_value.__wrapped__(s), parse_date),
+        'calc_dday': (baseline_dates.calc_dday, lambda s: _dday(s, today), calc_dday),
+        'format_date_kr': (baseline_dates.format_date_kr, None, format_date_kr),
+        'format_weekday_kr': (baseline_dates.format_weekday_kr, None, format_weekday_kr),
+        'normalize_phrase': (None, normalize_date_phrase.__wrapped__, normalize_date_phrase),
+    }
+    for name, variants in functions.items():
+        costs = []
+        for function in variants:
+            if function is None:
+                costs.append(f'{"-":>13s}')
+                continue
+            seconds = timeit.timeit(lambda: [function(s) for s in inputs], number=1)
+            costs.append(f'{seconds / n * 1e9:8.0f} ns/회')
+        print(f'{name:18s} 이전 {costs[0]}   캐시 없음 {costs[1]}   캐시 {costs[2]}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmark.dates')
+    parser.add_argument('--samples', type=int, default=2000, help='규칙표 검사의 무작위 입력 묶음 수')
+    parser.add_argument('--calls', type=int, default=100000, help='벤치마크의 함수별 호출 수')
+    args = parser.parse_args(argv)
+
+    check_corpus(args.samples)
+    benchmark(args.calls)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+"""
+임포터 벤치마크
+
+    python -m benchmark.importer --rows 50000
+
+주요 실무표 시트에 --rows개 행이 있는 합성 워크북을 만들고
+import_excel.run_import로 빈 데이터베이스에 임포트하는 시간과,
+같은 워크북을 증분 모드로 다시 임포트하는 시간(쓰기 0건이어야 함)을 잽니다.
+
+    python -m benchmark.importer --rows 20000 --files 8 --jobs 1,2,4,8
+
+--files가 2 이상이면 워크북을 여러 개 만들고 import_excel.run_batch_import를
+--jobs의 프로세스 수별로 실행해 걸린 시간과 1개 대비 속도 향상을 잽니다.
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from openpyxl import Workbook
+
+import import_excel
+import models
+from benchmark.datagen import TIMINGS, _activist_ids
+
+
+def excel_date(rng):
+    """엑셀 셀에 사람이 적는 형태의 날짜"""
+    month = rng.randint(1, 12)
+    kind = rng.random()
+    if kind < 0.4:
+        return f'{month}월 {rng.randint(1, 28)}일(목)'
+    elif kind < 0.55:
+        return f'{month}월'
+    elif kind < 0.75:
+        return f'{month}월 {rng.choice(TIMINGS[:3])}'
+    elif kind < 0.85:
+        return f'{month}월 말~{min(month + 1, 12)}월 초'
+    elif kind < 0.9:
+        return '연중 1회'
+    elif kind < 0.95:
+        return '미정'
+    return None
+
+
+def write_workbook(path, rows, seed=2026, id_offset=0):
+    """활동가/주요 일정표/주요 실무표 시트를 가진 워크북을 만듭니다.
+
+    id_offset: 일정 ID 시작 번호 (여러 워크북의 일정 ID가 겹치지 않게)
+    """
+    rng = random.Random(seed)
+    workbook = Workbook(write_only=True)
+    activist_ids = _activist_ids(200)
+    letters = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    # 일정 ID는 대문자 4자리, 겹치지 않게 순서대로 부여
+    schedule_ids = ['(' + ''.join(letters[i // 26 ** k % 26] for k in (3, 2, 1, 0)) + ')'
+                    for i in range(id_offset, id_offset + max(rows // 10, 5))]
+
+    sheet = workbook.create_sheet('활동가')
+    sheet.append(['활동가'])
+    sheet.append([None, 'ID', '이름'])
+    for i, activist_id in enumerate(activist_ids):
+        sheet.append([None, activist_id, f'활동가{i}'])
+
+    sheet = workbook.create_sheet('주요 일정표')
+    sheet.append(['주요 일정표'])
+    sheet.append([])
+    sheet.append([None, 'ID', '날짜', '분류', '일정명', '확정', '세부'])
+    for i, schedule_id in enumerate(schedule_ids):
+        sheet.append([None, f'자동부여 \n{schedule_id}', excel_date(rng), '정기모임', f'일정 {i}',
+                      rng.choice([1, 0, 'O', None]), '세부 내용'])
+
+    sheet = workbook.create_sheet('주요 실무표')
+    sheet.append(['주요 실무표'])
+    sheet.append([None, '일정 ID', '우선순위', '담당', '아이디어', '마감', '내용'])
+    for i in range(rows):
+        sheet.append([None, rng.choice(schedule_ids), rng.randint(1, 5), rng.choice(activist_ids),
+                      rng.choice([0, 1, None]), rng.choice([f'{rng.randint(1, 12)}월', None, '2026-05-10']),
+                      f'실무 {i}'])
+
+    workbook.save(path)
+
+
+def single_file(workdir, rows):
+    """워크북 하나: 전체 임포트와 변경 없는 증분 재임포트"""
+    excel_path = os.path.join(workdir, 'bench.xlsx')
+    db_path = os.path.join(workdir, 'bench.db')
+
+    started = time.perf_counter()
+    write_workbook(excel_path, rows)
+    write_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    counts = import_excel.run_import(excel_path, db_path, full=True)
+    import_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    reimport_counts = import_excel.run_import(excel_path, db_path)
+    reimport_seconds = time.perf_counter() - started
+
+    total = sum(counts.values())
+    return {
+        'rows': rows,
+        'workbook_bytes': os.path.getsize(excel_path),
+        'write_workbook_seconds': round(write_seconds, 3),
+        'import_seconds': round(import_seconds, 3),
+        'rows_per_second': round(total / import_seconds, 1),
+        'counts': counts,
+        'reimport_seconds': round(reimport_seconds, 3),
+        'reimport_writes': sum(reimport_counts.values()),
+    }
+
+
+def multi_file(workdir, rows, files, jobs_list):
+    """워크북 여러 개: 프로세스 수별 병렬 임포트"""
+    excel_paths = []
+    for i in range(files):
+        excel_path = os.path.join(workdir, f'bench-{i}.xlsx')
+        write_workbook(excel_path, rows, seed=2026 + i, id_offset=i * max(rows // 10, 5))
+        excel_paths.append(excel_path)
+
+    runs = []
+    for jobs in jobs_list:
+        db_path = os.path.join(workdir, f'bench-jobs{jobs}.db')
+        started = time.perf_counter()
+        counts = import_excel.run_batch_import(excel_paths, db_path, full=True, jobs=jobs)
+        seconds = time.perf_counter() - started
+        runs.append({'jobs': jobs, 'seconds': round(seconds, 3), 'rows': sum(counts.values())})
+
+    for run in runs:
+        run['speedup'] = round(runs[0]['seconds'] / run['seconds'], 2)
+    return {'rows_per_file': rows, 'files': files, 'cpu_count': os.cpu_count(), 'runs': runs}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmark.importer')
+    parser.add_argument('--rows', type=int, default=50000, help='주요 실무표 행 수 (파일당)')
+    parser.add_argument('--files', type=int, default=1, help='워크북 수 (2 이상이면 병렬 임포트)')
+    parser.add_argument('--jobs', default='1,2,4', help='병렬 임포트 프로세스 수 목록 (쉼표 구분)')
+    parser.add_argument('--out', help='결과 JSON 파일 (기본: 표준 출력)')
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix='bqa-import-')
+    # benchmark.datagen이 models를 먼저 import하므로 경로는 모듈에 직접 지정
+    models.DATABASE = os.path.join(workdir, 'bench.db')
+
+    if args.files > 1:
+        jobs_list = [int(jobs) for jobs in args.jobs.split(',')]
+        report = multi_file(workdir, args.rows, args.files, jobs_list)
+    else:
+        report = single_file(workdir, args.rows)
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
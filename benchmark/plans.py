@@ -0,0 +1,156 @@
+"""
+쿼리 계획 검사
+
+    python -m benchmark.plans --tasks 100000
+
+합성 데이터베이스에서 목록 화면(/, /meeting, /schedule/<id>, /schedules, /tasks, /activists, /ideas)을
+필터별로 실제로 요청하면서 실행된 SELECT 문을 모으고, 각 문을 EXPLAIN QUERY PLAN으로 확인합니다.
+tasks, schedules, ideas를 처음부터 끝까지 훑는(SEARCH가 아닌 SCAN) 계획이 EXPECTED_SCANS에 없으면
+실패합니다. 인덱스 순서로 훑더라도(USING INDEX) 행을 전부 읽기는 마찬가지라 같이 잡습니다.
+인덱스나 쿼리를 고치다가 전체 스캔이 되살아나면 여기서 걸립니다.
+"""
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+
+import models
+from benchmark import datagen
+from benchmark.concurrency import load_app, login
+
+# 인덱스 없이 훑으면 안 되는 테이블 (행 수가 데이터와 함께 늘어남)
+CHECKED_TABLES = ('tasks', 'schedules', 'ideas')
+
+# 의도한 전체 스캔: {경로 이름: {계획 줄: 이유}}. 여기 없는 스캔은 실패
+# (/activists는 활동가 명단 전체를 읽지만 tasks는 활동가별 SEARCH라 목록에 없음)
+SCHEDULE_SELECT = {'SCAN schedules USING INDEX idx_schedules_sort': '실무 추가 폼의 일정 선택 목록 (모든 일정)'}
+EXPECTED_SCANS = {
+    'tasks': SCHEDULE_SELECT,
+    'tasks_completed': SCHEDULE_SELECT,
+    'tasks_month': SCHEDULE_SELECT,
+    'schedules': {'SCAN s USING INDEX idx_schedules_sort': '모든 일정을 날짜순으로 보여 주는 화면'},
+    'ideas_adopted': {'SCAN i USING COVERING INDEX idx_ideas_created': '채택 포함 전체 아이디어 수 (COUNT(*), 커버링 인덱스)'},
+}
+
+TABLE_ALIAS = re.compile(r'\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?', re.IGNORECASE)
+SCAN = re.compile(r'^SCAN (\w+)(?: AS (\w+))?')
+NOT_ALIASES = {'where', 'join', 'left', 'inner', 'cross', 'on', 'order', 'group', 'limit', 'union', 'as', 'using'}
+
+
+def build_routes(conn):
+    """검사할 (이름, 경로) 목록"""
+    schedule_id = conn.execute('SELECT id FROM schedules ORDER BY id LIMIT 1').fetchone()[0]
+    activist_id = conn.execute('SELECT activist_id FROM users WHERE id = 1').fetchone()[0]
+    month = conn.execute('SELECT month FROM task_months ORDER BY task_count DESC LIMIT 1').fetchone()[0]
+    return [
+        ('index', '/'),
+        ('index_completed', '/?show_completed=1&activist='),
+        ('index_activist', f'/?activist={activist_id}'),
+        ('meeting', '/meeting'),
+        ('schedule_detail', f'/schedule/{schedule_id}'),
+        ('tasks', '/tasks'),
+        ('tasks_completed', '/tasks?show_completed=1'),
+        ('tasks_month', f'/tasks?month={month}'),
+        ('schedules', '/schedules'),
+        ('activists', '/activists'),
+        ('ideas', '/ideas'),
+        ('ideas_adopted', '/ideas?show_adopted=1'),
+        ('ideas_activist', f'/ideas?activist={activist_id}'),
+    ]
+
+
+def checked_names(statement):
+    """문에서 CHECKED_TABLES를 가리키는 이름 (테이블 이름과 별칭)"""
+    names = set()
+    for table, alias in TABLE_ALIAS.findall(statement):
+        if table.lower() in CHECKED_TABLES:
+            names.add(table.lower())
+            if alias and alias.lower() not in NOT_ALIASES:
+                names.add(alias.lower())
+    return names
+
+
+def full_scans(conn, statement):
+    """statement의 계획 중 CHECKED_TABLES를 전부 훑는(SCAN) 줄"""
+    names = checked_names(statement)
+    if not names:
+        return []
+    scans = []
+    for row in conn.execute('EXPLAIN QUERY PLAN ' + statement):
+        detail = row[3]
+        match = SCAN.match(detail)
+        if match and {name.lower() for name in match.groups() if name} & names:
+            scans.append(detail)
+    return scans
+
+
+def capture_statements():
+    """풀 연결에서 실행되는 SQL 문을 모을 목록 (models._count_query를 감쌈)"""
+    statements = []
+    count_query = models._count_query
+
+    def record(statement):
+        statements.append(statement)
+        count_query(statement)
+
+    models._count_query = record
+    return statements
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmark.plans',
+                                     description='목록 화면의 쿼리가 tasks/schedules/ideas를 전체 스캔하지 않는지 확인합니다.')
+    parser.add_argument('--tasks', type=int, default=100000, help='실무 수')
+    parser.add_argument('--out', help='결과 JSON 파일 (기본: 표준 출력)')
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix='bqa-plans-')
+    db_path = os.path.join(workdir, 'bench.db')
+    models.DATABASE = db_path
+    scale = datagen.generate(tasks=args.tasks)
+
+    # 연결을 풀에 만들기 전에 감싸야 trace 콜백으로 걸림
+    statements = capture_statements()
+    client = login(load_app(db_path))
+
+    conn = sqlite3.connect(db_path)
+    routes = {}
+    for name, path in build_routes(conn):
+        statements.clear()
+        status = client.get(path).status_code
+        selects = [s for s in statements if s.lstrip().upper().startswith(('SELECT', 'WITH'))]
+        expected = EXPECTED_SCANS.get(name, {})
+        scans, allowed = {}, {}
+        for statement in selects:
+            for detail in full_scans(conn, statement):
+                if detail in expected:
+                    allowed[detail] = expected[detail]
+                else:
+                    scans.setdefault(' '.join(statement.split()), []).append(detail)
+        routes[name] = {'path': path, 'status': status, 'statements': len(selects), 'full_scans': scans,
+                        'expected_scans': allowed}
+        print(f'{name:20s} {status}  selects {len(selects):3d}  full scans {len(scans)}  expected {len(allowed)}',
+              file=sys.stderr)
+    conn.close()
+
+    passed = all(route['status'] == 200 and not route['full_scans'] for route in routes.values())
+    report = {
+        'scale': scale,
+        'sqlite': sqlite3.sqlite_version,
+        'routes': routes,
+        'passed': passed,
+    }
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+    return 0 if passed else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
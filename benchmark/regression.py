@@ -0,0 +1,117 @@
+"""
+회귀 검사
+
+    python -m benchmark.regression --small 2000 --large 20000
+
+- 요청당 SQL 문 수: python -m benchmark를 두 규모로 따로 돌려서
+  모든 GET 경로의 queries_per_request가 같은지 확인합니다.
+  데이터가 늘수록 문 수가 늘면 (일정마다 한 번씩 조회하는 식의) N+1 쿼리가 되살아난 것입니다.
+  작은 규모도 모든 목록의 첫 페이지를 채워야 합니다. 첫 구간이 PAGE_SIZE보다 적으면
+  키셋 페이지네이션이 다음 구간을 한 번 더 조회하므로 (1000개면 /ideas, /tasks?month=) 문 수가 달라집니다.
+- 조건부 GET: 작은 규모의 데이터베이스에서 조회 화면을 한 번 받고 그 ETag로 다시 요청하면
+  304가 오고, 변경 버전을 읽는 것 말고는 쿼리도 템플릿 렌더링도 없어야 합니다.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sqlite3
+import sys
+import tempfile
+
+from flask import template_rendered
+
+# @conditional_get이 붙은 화면 (benchmark.__main__.build_routes의 이름)
+CONDITIONAL_ROUTES = ('index', 'index_completed', 'meeting', 'schedules', 'schedule_detail', 'tasks',
+                      'tasks_completed', 'tasks_month', 'activists', 'ideas', 'task_row')
+# 304 응답에서 실행되는 문: 읽기 트랜잭션의 BEGIN과 cache_versions 읽기
+NOT_MODIFIED_QUERIES = 2
+
+
+def run_benchmark(tasks, requests, workdir):
+    """python -m benchmark를 새 프로세스로 돌린 결과 (DATABASE_PATH를 import 시점에 읽으므로 규모마다 따로)"""
+    out = os.path.join(workdir, f'bench-{tasks}.json')
+    subprocess.run([sys.executable, '-m', 'benchmark', '--tasks', str(tasks), '--requests', str(requests),
+                    '--db', os.path.join(workdir, f'bench-{tasks}.db'), '--out', out], check=True)
+    with open(out, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def check_query_counts(small, large):
+    """두 규모에서 GET 경로별 요청당 문 수가 다른 경로"""
+    mismatches = {}
+    for name, route in small['routes'].items():
+        if route['method'] != 'GET':
+            continue
+        counts = (route['queries_per_request'], large['routes'][name]['queries_per_request'])
+        if counts[0] != counts[1]:
+            mismatches[name] = {'small': counts[0], 'large': counts[1]}
+    return mismatches
+
+
+def check_conditional_get(db_path):
+    """같은 화면을 ETag로 다시 요청했을 때 304가 아니거나 쿼리/렌더링을 한 경로"""
+    from benchmark.__main__ import build_routes
+    from benchmark.concurrency import load_app, login
+
+    app = load_app(db_path)
+    client = login(app)
+    conn = sqlite3.connect(db_path)
+    routes = {name: (path, headers) for name, method, path, _, headers in build_routes(conn)}
+    conn.close()
+
+    rendered = []
+
+    def record(sender, template, context, **extra):
+        rendered.append(template.name)
+
+    failures = {}
+    with template_rendered.connected_to(record, app):
+        for name in CONDITIONAL_ROUTES:
+            path, headers = routes[name]
+            etag = client.get(path, headers=headers).headers.get('ETag')
+            if not etag:
+                failures[name] = {'etag': None}
+                continue
+            rendered.clear()
+            response = client.get(path, headers={**(headers or {}), 'If-None-Match': etag})
+            queries = int(response.headers.get('X-Query-Count', 0))
+            if response.status_code != 304 or queries != NOT_MODIFIED_QUERIES or rendered:
+                failures[name] = {'status': response.status_code, 'queries': queries, 'rendered': list(rendered)}
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmark.regression')
+    parser.add_argument('--small', type=int, default=2000, help='작은 규모의 실무 수')
+    parser.add_argument('--large', type=int, default=20000, help='큰 규모의 실무 수')
+    parser.add_argument('--requests', type=int, default=3, help='경로별 요청 수')
+    parser.add_argument('--out', help='결과 JSON 파일 (기본: 표준 출력)')
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix='bqa-regression-')
+    small = run_benchmark(args.small, args.requests, workdir)
+    large = run_benchmark(args.large, args.requests, workdir)
+    mismatches = check_query_counts(small, large)
+    conditional_failures = check_conditional_get(os.path.join(workdir, f'bench-{args.small}.db'))
+
+    report = {
+        'scales': [small['scale'], large['scale']],
+        'queries_per_request': {name: route['queries_per_request'] for name, route in small['routes'].items()
+                                if route['method'] == 'GET'},
+        'query_count_mismatches': mismatches,
+        'conditional_get_failures': conditional_failures,
+    }
+    report['passed'] = not mismatches and not conditional_failures
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+    return 0 if report['passed'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""
+여러 프로세스 쓰기 부하 검사
+
+    python -m benchmark.writes --processes 4 --threads 4 --rounds 100
+    python -m benchmark.writes --writer-thread     # 워커마다 쓰기 스레드로 모아 커밋
+    python -m benchmark.writes --legacy            # 이전 방식과 비교 (busy_timeout 5000, DEFERRED, 다시 시도 없음)
+
+gunicorn 워커처럼 여러 프로세스 x 스레드가 같은 DB 파일에 토글/수정/추가/일괄 처리를 섞어 보내고,
+별도 프로세스 하나는 500개 실무의 마감일을 한꺼번에 바꾸는 느린 쓰기를 계속 보냅니다.
+
+"database is locked"로 실패한 요청(locked)이 없어야 통과입니다.
+상태 코드별 횟수, 요청 지연 시간 분포, 워커별 쓰기 잠금 대기 통계(writes.stats)를 합쳐 보여줍니다.
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import models
+from benchmark import datagen
+from benchmark.__main__ import percentile
+from benchmark.concurrency import login
+
+AJAX = {'X-Requested-With': 'XMLHttpRequest'}
+SLOW_BULK_SIZE = 500
+STAT_KEYS = ('transactions', 'retries', 'failures', 'batches', 'batched_writes')
+
+
+def load_app(db_path, writer_thread, legacy):
+    """db_path를 쓰는 앱 (프로세스마다 한 번). 설정은 모듈을 불러오기 전에 맞춤"""
+    os.environ['DATABASE_PATH'] = db_path
+    os.environ['DB_WRITER_THREAD'] = '1' if writer_thread else '0'
+    models.DATABASE = db_path
+    if legacy:
+        models.DB_PRAGMAS = tuple((name, 5000 if name == 'busy_timeout' else value) for name, value in models.DB_PRAGMAS)
+    import app as app_module
+    import writes
+    if legacy:
+        # 잠금을 미리 잡지 않고 첫 쓰기에서 DEFERRED 트랜잭션을 엶
+        app_module.begin_immediate = writes.begin_immediate = lambda conn: 0.0
+        acquire = models.pool.acquire
+
+        def deferred_acquire():
+            conn = acquire()
+            conn.isolation_level = ''
+            return conn
+        models.pool.acquire = deferred_acquire
+    app_module.app.config['TESTING'] = True
+    return app_module.app, writes
+
+
+def pick_write(rng, task_ids, schedule_id):
+    """(이름, 경로, 폼) 하나를 무작위로"""
+    task_id = rng.choice(task_ids)
+    roll = rng.random()
+    if roll < 0.5:
+        return 'toggle', f'/task/{task_id}/toggle', None
+    if roll < 0.75:
+        return 'edit', f'/task/{task_id}/edit', {'content': f'부하 수정 {rng.random():.6f}', 'deadline': '2026-05-중순',
+                                                 'schedule_id': schedule_id}
+    if roll < 0.9:
+        return 'add', '/task/add', {'content': '부하 추가', 'deadline': '2026-06', 'schedule_id': schedule_id}
+    return 'bulk', '/tasks/bulk', {'action': 'complete', 'task_id': rng.sample(task_ids, 10)}
+
+
+def hammer(app, task_ids, schedule_id, rounds, seed):
+    """쓰기를 rounds번 보냄. 반환: (작업별 지연 시간 목록, 상태별 횟수)"""
+    rng = random.Random(seed)
+    client = login(app)
+    latencies = {}
+    statuses = Counter()
+    for _ in range(rounds):
+        name, path, data = pick_write(rng, task_ids, schedule_id)
+        started = time.perf_counter()
+        try:
+            status = str(client.post(path, data=data, headers=AJAX).status_code)
+        except sqlite3.OperationalError as e:
+            status = 'locked' if 'locked' in str(e) or 'busy' in str(e) else 'error'
+        latencies.setdefault(name, []).append((time.perf_counter() - started) * 1000)
+        statuses[status] += 1
+    return latencies, statuses
+
+
+def run_process(db_path, task_ids, schedule_id, threads, rounds, seed, writer_thread, legacy):
+    app, writes = load_app(db_path, writer_thread, legacy)
+    latencies = {}
+    statuses = Counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        futures = [executor.submit(hammer, app, task_ids, schedule_id, rounds, seed * 100 + i) for i in range(threads)]
+        for future in futures:
+            thread_latencies, thread_statuses = future.result()
+            for name, samples in thread_latencies.items():
+                latencies.setdefault(name, []).extend(samples)
+            statuses.update(thread_statuses)
+    return latencies, statuses, writes.write_stats.stats()
+
+
+def run_slow_writer(db_path, task_ids, seconds, writer_thread, legacy):
+    """느린 쓰기 (마감일 일괄 변경 SLOW_BULK_SIZE개)를 seconds 동안 반복"""
+    app, writes = load_app(db_path, writer_thread, legacy)
+    client = login(app)
+    latencies = []
+    statuses = Counter()
+    ids = task_ids[:SLOW_BULK_SIZE]
+    deadline = time.monotonic() + seconds
+    day = 0
+    while time.monotonic() < deadline:
+        day = day % 28 + 1
+        started = time.perf_counter()
+        try:
+            status = str(client.post('/tasks/bulk', data={'action': 'reschedule', 'task_id': ids,
+                                                            'deadline': f'2026-07-{day:02d}'}, headers=AJAX).status_code)
+        except sqlite3.OperationalError as e:
+            status = 'locked' if 'locked' in str(e) or 'busy' in str(e) else 'error'
+        latencies.append((time.perf_counter() - started) * 1000)
+        statuses[status] += 1
+    return {'slow_bulk': latencies}, statuses, writes.write_stats.stats()
+
+
+def summarize(samples):
+    return {'requests': len(samples), 'p50_ms': round(percentile(samples, 50), 2),
+            'p95_ms': round(percentile(samples, 95), 2), 'p99_ms': round(percentile(samples, 99), 2),
+            'max_ms': round(max(samples), 2)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmark.writes')
+    parser.add_argument('--processes', type=int, default=4, help='쓰기 프로세스 수 (gunicorn 워커 역할)')
+    parser.add_argument('--threads', type=int, default=4, help='프로세스당 스레드 수')
+    parser.add_argument('--rounds', type=int, default=100, help='스레드당 쓰기 요청 수')
+    parser.add_argument('--tasks', type=int, default=5000, help='생성할 실무 수')
+    parser.add_argument('--no-slow-writer', action='store_true', help='느린 일괄 쓰기 프로세스 없이')
+    parser.add_argument('--writer-thread', action='store_true', help='워커마다 쓰기 스레드로 모아 커밋')
+    parser.add_argument('--legacy', action='store_true', help='이전 방식 (busy_timeout 5000, DEFERRED, 다시 시도 없음)')
+    parser.add_argument('--out', help='결과 JSON 파일 (기본: 표준 출력)')
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix='bqa-writes-')
+    db_path = os.path.join(workdir, 'bench.db')
+    models.DATABASE = db_path
+    datagen.generate(tasks=args.tasks)
+
+    conn = sqlite3.connect(db_path)
+    task_ids = [row[0] for row in conn.execute('SELECT id FROM tasks WHERE is_idea = 0 ORDER BY id')]
+    schedule_id = conn.execute('SELECT id FROM schedules ORDER BY id LIMIT 1').fetchone()[0]
+    conn.close()
+
+    started = time.perf_counter()
+    latencies = {}
+    statuses = Counter()
+    stats = Counter()
+    wait_max = 0.0
+    with ProcessPoolExecutor(max_workers=args.processes + 1) as executor:
+        futures = [executor.submit(run_process, db_path, task_ids, schedule_id, args.threads, args.rounds, seed,
+                                   args.writer_thread, args.legacy) for seed in range(args.processes)]
+        if not args.no_slow_writer:
+            # 다른 쓰기들이 도는 동안 계속 (대략적인 길이: 스레드당 요청 수 x 20ms)
+            futures.append(executor.submit(run_slow_writer, db_path, task_ids, max(2.0, args.rounds * 0.02),
+                                           args.writer_thread, args.legacy))
+        for future in futures:
+            process_latencies, process_statuses, process_stats = future.result()
+            for name, samples in process_latencies.items():
+                latencies.setdefault(name, []).extend(samples)
+            statuses.update(process_statuses)
+            stats.update({key: process_stats[key] for key in STAT_KEYS})
+            stats['lock_wait_ms_total'] += process_stats['lock_wait_ms_total']
+            wait_max = max(wait_max, process_stats['lock_wait_ms_max'])
+    seconds = time.perf_counter() - started
+
+    requests = sum(statuses.values())
+    report = {
+        'processes': args.processes,
+        'threads': args.threads,
+        'writer_thread': args.writer_thread,
+        'legacy': args.legacy,
+        'slow_writer': not args.no_slow_writer,
+        'requests': requests,
+        'seconds': round(seconds, 3),
+        'requests_per_second': round(requests / seconds, 1),
+        'statuses': dict(sorted(statuses.items())),
+        'latency': {name: summarize(samples) for name, samples in sorted(latencies.items())},
+        'lock_wait': {
+            **{key: stats[key] for key in STAT_KEYS},
+            'wait_ms_total': round(stats['lock_wait_ms_total'], 1),
+            'wait_ms_avg': round(stats['lock_wait_ms_total'] / stats['transactions'], 3) if stats['transactions'] else 0,
+            'wait_ms_max': wait_max,
+        },
+    }
+    report['passed'] = not statuses.get('locked') and not statuses.get('error') and not statuses.get('503')
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+    return 0 if report['passed'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,313 @@
+"""
+날짜 파싱과 표시
+
+schedules.date / tasks.deadline의 자유 텍스트 날짜를 규칙표(DATE_RULES) 하나로 읽어
+정렬용 값(sort_date), D-day, 한국어 표시를 만듭니다. 앱과 엑셀 임포트가 같은 규칙표를 씁니다.
+정규식은 import 시점에 한 번 컴파일하고, 결과는 원본 문자열 기준으로 캐시합니다
+(D-day는 KST 자정에 캐시를 통째로 교체).
+"""
+import calendar
+import re
+import time
+from collections import namedtuple
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+
+
+# 한국 시간대 (KST = UTC+9)
+KST = timezone(timedelta(hours=9))
+
+# date_precision 값
+PRECISION_DAY = 'day'        # 2026-03-21
+PRECISION_MONTH = 'month'    # 2026-03
+PRECISION_PART = 'part'      # 2026-04-중순, 2026-04-미정
+PRECISION_RANGE = 'range'    # 2026-05-말~06-초
+PRECISION_YEAR = 'year'      # 연중
+
+# 연도가 없는 표현(엑셀의 "4월 초", "연중")에 쓰는 연도
+DEFAULT_YEAR = 2026
+
+# 대략적 시기 -> (시작일, 끝일). None이면 그 달의 마지막 날
+TIMING_DAYS = {'초': (1, 10), '중순': (11, 20), '말': (21, None), '미정': (1, None)}
+
+WEEKDAYS_KR = ('월', '화', '수', '목', '금', '토', '일')
+
+# 파싱/포맷 결과 캐시 크기 (원본 문자열 기준)
+DATE_CACHE_SIZE = 4096
+
+# 정규화된 날짜 값
+#   text: 저장 형식 문자열, start/end: 해당 기간의 첫날/마지막 날(date),
+#   anchor: 정렬과 D-day 기준일(datetime), precision: 정밀도, label: 화면 표시용 한국어
+DateValue = namedtuple('DateValue', ['text', 'start', 'end', 'anchor', 'precision', 'label'])
+
+# D-day 필터 결과: (표시 텍스트, CSS 클래스)
+DDay = namedtuple('DDay', ['text', 'css_class'])
+
+
+def get_kst_now():
+    """현재 한국 시간을 반환합니다."""
+    return datetime.now(KST)
+
+
+def _timing_day(year, month, timing):
+    """초/중순/말을 정렬용 일(day)로 바꿉니다."""
+    if timing == '초':
+        return 1
+    elif timing == '말':
+        # 해당 월의 마지막 날 계산
+        return _month_days(year, month)
+    return 15  # 중순, 미정
+
+
+@lru_cache(maxsize=None)
+def _month_days(year, month):
+    """해당 월의 일수 (잘못된 월이면 ValueError)"""
+    if not 1 <= month <= 12:
+        raise ValueError(f'month must be in 1..12: {month}')
+    return calendar.monthrange(year, month)[1]
+
+
+def _timing_span(year, month, timing):
+    """시기의 (첫날, 마지막 날). 시기가 없으면 그 달 전체"""
+    first, last = TIMING_DAYS.get(timing, (1, None))
+    return date(year, month, first), date(year, month, last or _month_days(year, month))
+
+
+def _day_value(year, month, day):
+    dt = datetime(year, month, day)
+    day_date = dt.date()
+    return DateValue(f'{year:04d}-{month:02d}-{day:02d}', day_date, day_date, dt, PRECISION_DAY,
+                     f'{month:02d}월 {day:02d}일')
+
+
+def _month_value(year, month):
+    start, end = _timing_span(year, month, None)
+    return DateValue(f'{year:04d}-{month:02d}', start, end, datetime(year, month, 15), PRECISION_MONTH, f'{month}월')
+
+
+def _build_day(m):
+    return _day_value(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+
+
+def _build_month(m):
+    return _month_value(int(m.group(1)), int(m.group(2)))
+
+
+def _build_part(m):
+    year, month, timing = int(m.group(1)), int(m.group(2)), m.group(3)
+    start, end = _timing_span(year, month, timing)
+    return DateValue(m.group(0), start, end, datetime(year, month, _timing_day(year, month, timing)),
+                     PRECISION_PART, f'{month}월 {timing}')
+
+
+def _build_range(m):
+    year, month1, timing1, month2, timing2 = int(m.group(1)), int(m.group(2)), m.group(3), int(m.group(4)), m.group(5)
+    start = _timing_span(year, month1, timing1)[0]
+    end = _timing_span(year, month2, timing2)[1]
+    if end < start:  # 12월 말~1월 초처럼 해를 넘기는 범위
+        end = _timing_span(year + 1, month2, timing2)[1]
+    anchor = datetime(year, month1, _timing_day(year, month1, timing1 or '중순'))
+    label = f'{month1}월 {timing1 or ""}~{month2}월 {timing2 or ""}'.strip()
+    return DateValue(m.group(0), start, end, anchor, PRECISION_RANGE, label)
+
+
+def _build_year(m):
+    return DateValue('연중', date(DEFAULT_YEAR, 1, 1), date(DEFAULT_YEAR, 12, 31), datetime(DEFAULT_YEAR, 12, 31),
+                     PRECISION_YEAR, '연중 1회')
+
+
+# 저장 형식 규칙표: 위에서부터 처음 맞는 규칙을 씁니다. (YYYY-MM-DD는 parse_date_value의 빠른 경로)
+DATE_RULES = (
+    (re.compile(r'^(\d{4})-(\d{2})-(\d{2})$'), _build_day),                         # 2026-03-21
+    (re.compile(r'^(\d{4})-(\d{2})$'), _build_month),                                # 2026-03 -> 15일 기준
+    (re.compile(r'^(\d{4})-(\d{2})-(초|중순|말|미정)$'), _build_part),                # 2026-04-중순
+    (re.compile(r'^(\d{4})-(\d{2})-(초|중순|말)?~(\d{2})-(초|중순|말)?$'), _build_range),  # 2026-05-말~06-초
+    (re.compile(r'^연중$'), _build_year),                                             # 연중 -> 연말로 정렬
+    # 자릿수가 모자란 날짜(2026-4-2 등)도 읽되 text는 자릿수를 채운 형식
+    (re.compile(r'^(\d{4})-(\d{1,2})-(\d{1,2})$'), _build_day),
+    (re.compile(r'^(\d{4})-(\d{1,2})$'), _build_month),
+)
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_date_value(date_str):
+    """날짜 문자열을 DateValue로 바꿉니다. 알 수 없는 형식이면 None"""
+    if not date_str:
+        return None
+
+    # 빠른 경로: YYYY-MM-DD (가장 흔한 형태라 정규식 없이 처리)
+    if len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-' \
+            and date_str[:4].isdigit() and date_str[5:7].isdigit() and date_str[8:].isdigit():
+        try:
+            dt = datetime(int(date_str[:4]), int(date_str[5:7]), int(date_str[8:]))
+        except ValueError:
+            return None
+        day_date = dt.date()
+        return DateValue(date_str, day_date, day_date, dt, PRECISION_DAY, date_str[5:7] + '월 ' + date_str[8:] + '일')
+
+    for pattern, build in DATE_RULES:
+        match = pattern.match(date_str)
+        if match:
+            try:
+                return build(match)
+            except ValueError:
+                return None  # 2026-13, 2026-02-30 등
+    return None
+
+
+def parse_date_with_precision(date_str):
+    """날짜 문자열을 파싱합니다. 반환: (datetime, 정밀도) 또는 (None, None)"""
+    value = parse_date_value(date_str)
+    if value is None:
+        return None, None
+    return value.anchor, value.precision
+
+
+def parse_date(date_str):
+    """날짜 문자열을 파싱합니다. 대략적 시기도 정렬용으로 변환합니다."""
+    value = parse_date_value(date_str)
+    return value.anchor if value else None
+
+
+def validate_date_format(date_str):
+    """저장 형식(YYYY-MM-DD, YYYY-MM, YYYY-MM-시기, 범위, 연중)인지 검증합니다. 빈 값은 허용(미정)"""
+    if not date_str:
+        return True
+    value = parse_date_value(date_str)
+    return value is not None and value.text == date_str
+
+
+def _phrase_month(m):
+    return f'{DEFAULT_YEAR}-{int(m.group(1)):02d}'
+
+
+def _phrase_timing(timing):
+    return '중순' if timing == '중' else timing or ''
+
+
+def _phrase_part(m):
+    return f'{DEFAULT_YEAR}-{int(m.group(1)):02d}-{_phrase_timing(m.group(2))}'
+
+
+def _phrase_range(m):
+    return (f'{DEFAULT_YEAR}-{int(m.group(1)):02d}-{_phrase_timing(m.group(2))}'
+            f'~{int(m.group(3)):02d}-{_phrase_timing(m.group(4))}')
+
+
+def _phrase_day(m):
+    return f'{DEFAULT_YEAR}-{int(m.group(1)):02d}-{int(m.group(2)):02d}'
+
+
+# 엑셀에 사람이 적은 표현 -> 저장 형식. (패턴, 변환, 그대로 옮겨졌는지)
+# 그대로 옮겨지지 않은 경우(False) 임포터는 원문을 세부 내용에 남깁니다.
+PHRASE_RULES = (
+    (re.compile(r'^(\d{1,2})월$'), _phrase_month, True),                                     # 7월
+    (re.compile(r'^(\d{1,2})월\s*(초|중순?|말)(?:\s*미정)?$'), _phrase_part, True),            # 4월 초, 9월 중 미정
+    (re.compile(r'^(\d{1,2})월\s*(초|중순?|말)?[~\-](\d{1,2})월\s*(초|중순?|말)?$'), _phrase_range, True),  # 5월 말~6월 초
+    (re.compile(r'^(\d{1,2})월\s*(\d{1,2})일(?:\s*\([월화수목금토일]\))?$'), _phrase_day, True),  # 4월 2일(목)
+    (re.compile(r'^(\d{1,2})월\s*(\d{1,2})일'), _phrase_day, False),                          # 3월 6일(금) 또는 7일(토)
+    (re.compile(r'^미정$'), lambda m: '', True),
+    (re.compile(r'^연중'), lambda m: '연중', True),                                           # 연중 1회
+)
+RE_PHRASE_MONTH = re.compile(r'(\d{1,2})월')
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def normalize_date_phrase(text):
+    """사람이 적은 날짜 표현을 저장 형식으로 바꿉니다. 반환: (저장 형식 또는 '', 그대로 옮겨졌는지)"""
+    if not text:
+        return '', True
+
+    # 이미 저장 형식이면 그대로
+    if validate_date_format(text):
+        return text, True
+
+    for pattern, convert, exact in PHRASE_RULES:
+        match = pattern.match(text)
+        if match:
+            return convert(match), exact
+
+    # 그 외 복잡한 형식은 월 정보라도 추출 (예: "4~5월 중 협의" -> 2026-04-미정)
+    month_only = RE_PHRASE_MONTH.search(text)
+    if month_only:
+        return f'{DEFAULT_YEAR}-{int(month_only.group(1)):02d}-미정', False
+    return '', False
+
+
+def sort_fields(date_str):
+    """DB에 저장할 정렬용 값을 반환합니다. 반환: (sort_date 'YYYY-MM-DD', date_precision)"""
+    dt, precision = parse_date_with_precision(date_str)
+    if not dt:
+        return None, None
+    return dt.strftime('%Y-%m-%d'), precision
+
+
+def month_range(month_str):
+    """'YYYY-MM'을 반열린 구간 [시작일, 다음 달 1일)로 바꿉니다. 형식이 틀리면 None"""
+    try:
+        start = datetime.strptime(month_str, '%Y-%m')
+    except ValueError:
+        return None
+    if start.month == 12:
+        end = start.replace(year=start.year + 1, month=1)
+    else:
+        end = start.replace(month=start.month + 1)
+    return start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d')
+
+
+def _dday(deadline_str, today):
+    """today(date) 기준 D-day를 계산합니다."""
+    deadline = parse_date(deadline_str)
+    if not deadline:
+        return DDay(None, 'safe')
+
+    diff = (deadline.date() - today).days
+    if diff < 0:
+        return DDay(f'D+{abs(diff)}', 'overdue')
+    elif diff == 0:
+        return DDay('D-Day', 'd1')
+    elif diff == 1:
+        return DDay('D-1', 'd1')
+    elif diff == 2:
+        return DDay('D-2', 'd2')
+    elif diff == 3:
+        return DDay('D-3', 'd3')
+    else:
+        return DDay(f'D-{diff}', 'safe')
+
+
+# D-day 결과는 KST 자정이 지나면 모두 달라지므로 (만료 시각, 캐시)를 통째로 교체
+_dday_cache = (0.0, None, {})
+
+
+def calc_dday(deadline_str):
+    """D-day를 계산합니다. 반환: (일수, CSS클래스)"""
+    global _dday_cache
+    if not deadline_str:
+        return DDay(None, 'safe')
+
+    expires_at, today, cache = _dday_cache
+    if time.time() >= expires_at or len(cache) >= DATE_CACHE_SIZE:
+        today = get_kst_now().date()
+        midnight = datetime(today.year, today.month, today.day, tzinfo=KST) + timedelta(days=1)
+        cache = {}
+        _dday_cache = (midnight.timestamp(), today, cache)
+
+    result = cache.get(deadline_str)
+    if result is None:
+        result = cache[deadline_str] = _dday(deadline_str, today)
+    return result
+
+
+def format_date_kr(date_str):
+    """날짜를 한국어 형식으로 변환합니다."""
+    if not date_str:
+        return '미정'
+    value = parse_date_value(date_str)
+    return value.label if value else date_str
+
+
+def format_weekday_kr(date_str):
+    """날짜 문자열에서 요일을 한글로 반환합니다."""
+    value = parse_date_value(date_str)
+    return WEEKDAYS_KR[value.anchor.weekday()] if value else ''
@@ -0,0 +1,113 @@
+"""
+템플릿 조각(fragment) 캐시
+
+    {% cache 'tasks_month', month, tasks %} ... {% endcache %}
+
+키는 조각 이름, 넘겨준 값(행 데이터 자체), KST 날짜로 만듭니다.
+행 내용이 그대로 키에 들어가므로 관련 행이 바뀌면 자동으로 새로 렌더링되고,
+D-day 표시는 자정이 지나면 날짜가 바뀌어 다시 계산됩니다.
+조각 안에서 쓰는 변수는 모두 키에 넘겨야 합니다.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from jinja2 import nodes
+from jinja2.ext import Extension
+
+from dates import get_kst_now
+
+# 캐시에 보관할 렌더링 결과의 최대 크기 (문자 수 기준, 기본 약 8MB)
+FRAGMENT_CACHE_MAX_CHARS = int(os.environ.get('FRAGMENT_CACHE_MAX_CHARS', 8 * 1024 * 1024))
+
+
+class FragmentCache:
+    """크기 제한이 있는 LRU 캐시"""
+
+    def __init__(self, max_chars):
+        self.max_chars = max_chars
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._chars = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        if len(value) > self.max_chars:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._chars -= len(old)
+            self._entries[key] = value
+            self._chars += len(value)
+            while self._chars > self.max_chars:
+                _, evicted = self._entries.popitem(last=False)
+                self._chars -= len(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._chars = 0
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'entries': len(self._entries), 'chars': self._chars, 'max_chars': self.max_chars}
+
+
+fragment_cache = FragmentCache(FRAGMENT_CACHE_MAX_CHARS)
+
+
+def _normalize(value):
+    """sqlite3.Row처럼 repr에 내용이 드러나지 않는 값을 키로 쓸 수 있게 바꿉니다."""
+    if isinstance(value, sqlite3.Row):
+        return tuple(value)
+    if isinstance(value, dict):
+        return tuple((k, _normalize(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize(v) for v in value)
+    return value
+
+
+def fragment_key(name, args):
+    """조각 이름, 값, KST 날짜로 캐시 키를 만듭니다."""
+    raw = repr((name, get_kst_now().strftime('%Y-%m-%d'), _normalize(args)))
+    return hashlib.blake2b(raw.encode(), digest_size=16).digest()
+
+
+class FragmentCacheExtension(Extension):
+    """{% cache 이름, 값... %} ... {% endcache %} 태그"""
+    tags = {'cache'}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        name = parser.parse_expression()
+        args = []
+        while parser.stream.skip_if('comma'):
+            args.append(parser.parse_expression())
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+        return nodes.CallBlock(self.call_method('_render', [name, nodes.List(args)]),
+                               [], [], body).set_lineno(lineno)
+
+    def _render(self, name, args, caller):
+        key = fragment_key(name, args)
+        rendered = fragment_cache.get(key)
+        if rendered is None:
+            rendered = caller()
+            fragment_cache.set(key, rendered)
+        return rendered
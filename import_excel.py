@@ -1,92 +1,197 @@
 #!/usr/bin/env python3
 """
 엑셀 파일(스케치.xlsx)에서 데이터를 읽어 데이터베이스에 임포트하는 스크립트
+
+시트는 openpyxl 읽기 전용 모드로 한 행씩 읽고(DataFrame을 만들지 않음),
+정규화는 제너레이터로 이어서 executemany로 한 번에 씁니다.
+모든 시트를 하나의 연결, 하나의 트랜잭션으로 처리합니다.
+
+기본은 증분 임포트입니다. 원본 행마다 내용 해시(import_hash)를 저장해 두고
+다시 임포트할 때 해시가 다른 행만 추가/수정/삭제하므로 완료 여부 같은
+앱에서 바꾼 상태가 유지됩니다.
+
+    python import_excel.py [엑셀 파일] [--dry-run] [--full]
+
+여러 파일을 주면 파일별 읽기/정규화는 프로세스 풀에서 병렬로 하고
+쓰기는 한 프로세스가 배치 단위로 커밋합니다. (--full은 배치로 나누지 않고 한 트랜잭션)
+
+    python import_excel.py 2024.xlsx 2025.xlsx 2026.xlsx --jobs 4
 """
-import pandas as pd
-import sqlite3
+import argparse
+import hashlib
 import os
 import re
 import random
+import sqlite3
 import string
-from datetime import datetime
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from itertools import chain, islice
+
+from openpyxl import load_workbook
+
+import models
+from dates import normalize_date_phrase, sort_fields
+from migrations import latest_version, schema_version
 
 DATABASE = 'database.db'
 EXCEL_FILE = '스케치.xlsx'
 
-# 일정 ID 매핑 (괄호 안 ID -> 생성된 ID)
-schedule_id_map = {}
+# 시트 이름과 헤더 행 수
+ACTIVIST_SHEET = ('활동가', 2)
+SCHEDULE_SHEET = ('주요 일정표', 3)
+TASK_SHEET = ('주요 실무표', 2)
+
+# 진행 상황 출력 간격 (행)
+PROGRESS_EVERY = 10000
+
+# 여러 파일 임포트에서 한 번에 커밋하는 행 수
+BATCH_SIZE = 20000
+
+RE_BRACKET_ID = re.compile(r'\(([A-Z]{4})\)')
+
 
 def generate_id():
     """4자리 랜덤 ID 생성"""
     return ''.join(random.choices(string.ascii_uppercase, k=4))
 
-def extract_schedule_id(id_text):
-    """ID 텍스트에서 실제 ID 추출 또는 생성"""
-    if pd.isna(id_text):
-        return generate_id()
 
-    id_str = str(id_text).strip()
+def is_blank(value):
+    """빈 셀 여부 (None 또는 NaN)"""
+    return value is None or (isinstance(value, float) and value != value)
+
+
+def cell(row, index):
+    """행 길이가 짧아도(read-only 모드) 안전하게 셀 값을 꺼냅니다."""
+    return row[index] if index < len(row) else None
+
+
+def cell_text(row, index):
+    """셀 값을 앞뒤 공백을 제거한 문자열로, 빈 셀이면 None"""
+    value = cell(row, index)
+    if is_blank(value):
+        return None
+    return str(value).strip()
 
-    # 괄호 안에 ID가 있는 경우 (예: "자동부여 \n(FFFF)")
-    match = re.search(r'\(([A-Z]{4})\)', id_str)
-    if match:
-        return match.group(1)
 
-    # 기존 ID가 없으면 새로 생성
-    return generate_id()
+def read_sheet(workbook, sheet):
+    """시트를 한 행씩 읽습니다. 헤더 행은 건너뜁니다."""
+    name, header_rows = sheet
+    worksheet = workbook[name]
+    for row in worksheet.iter_rows(min_row=header_rows + 1, values_only=True):
+        yield row
 
-def clear_database():
+
+class Progress:
+    """행을 그대로 흘려보내면서 처리 속도를 출력합니다. (시트를 다 읽으면 합계)"""
+
+    def __init__(self, label, every=PROGRESS_EVERY):
+        self.label = label
+        self.every = every
+        self.count = 0
+        self.started = time.perf_counter()
+
+    def wrap(self, rows):
+        for row in rows:
+            self.count += 1
+            if self.count % self.every == 0:
+                print(f"  [{self.label}] {self.count}행 ({self.rate():.0f}행/초)")
+            yield row
+        self.report()
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def rate(self):
+        elapsed = self.elapsed()
+        return self.count / elapsed if elapsed > 0 else 0.0
+
+    def report(self):
+        print(f"[{self.label}] {self.count}행 읽음 ({self.elapsed():.2f}초, {self.rate():.0f}행/초)")
+
+
+def clear_database(cursor):
     """기존 데이터를 모두 삭제합니다."""
-    conn = sqlite3.connect(DATABASE)
-    cursor = conn.cursor()
     cursor.execute('DELETE FROM tasks')
     cursor.execute('DELETE FROM schedules')
     cursor.execute('DELETE FROM activists')
-    conn.commit()
-    conn.close()
     print("기존 데이터 삭제 완료")
 
-def import_activists(df):
-    """활동가 데이터를 임포트합니다."""
-    conn = sqlite3.connect(DATABASE)
-    cursor = conn.cursor()
 
-    count = 0
-    # 2행부터 데이터 (0-indexed로 row 2+)
-    for i, row in df.iloc[2:].iterrows():
-        activist_id = str(row.iloc[1]).strip() if pd.notna(row.iloc[1]) else None
-        name = str(row.iloc[2]).strip() if pd.notna(row.iloc[2]) else None
+def normalize_schedule_date(date_val, details):
+    """일정 날짜 셀을 저장 형식으로 바꿉니다. 반환: (date_str, details)"""
+    if is_blank(date_val):
+        return '', details
 
-        if activist_id and name and activist_id != 'nan':
-            cursor.execute('INSERT INTO activists (id, name) VALUES (?, ?)', (activist_id, name))
-            count += 1
+    if isinstance(date_val, (datetime, date)):
+        return date_val.strftime('%Y-%m-%d'), details
 
-    conn.commit()
-    conn.close()
-    print(f"활동가 {count}명 임포트 완료")
+    if not isinstance(date_val, str):
+        return '', details
 
-def import_schedules(df):
-    """일정 데이터를 임포트합니다."""
-    global schedule_id_map
-    conn = sqlite3.connect(DATABASE)
-    cursor = conn.cursor()
+    original_text = date_val.strip().replace('\n', ' ')
+    date_str, exact = normalize_date_phrase(original_text)
+
+    # 대략적으로만 옮긴 경우 원본 텍스트를 details에 보존
+    if date_str and not exact:
+        details = f"[일정 참고: {original_text}]\n{details}" if details else f"[일정 참고: {original_text}]"
+
+    return date_str, details
 
-    count = 0
-    # 3행부터 데이터 (0-indexed로 row 3+)
-    for i, row in df.iloc[3:].iterrows():
-        id_text = row.iloc[1]
-        schedule_id = extract_schedule_id(id_text)
 
-        # 괄호 안 ID가 있으면 매핑 저장 (실무 테이블에서 참조용)
-        match = re.search(r'\(([A-Z]{4})\)', str(id_text) if pd.notna(id_text) else '')
-        if match:
-            schedule_id_map[match.group(1)] = schedule_id
+def normalize_flag(value, true_values):
+    """체크 여부 셀(불리언/숫자/문자열)을 0 또는 1로"""
+    if is_blank(value):
+        return 0
+    if isinstance(value, bool):
+        return 1 if value else 0
+    if isinstance(value, (int, float)):
+        return 1 if value == 1 else 0
+    if isinstance(value, str):
+        return 1 if value.strip().lower() in true_values else 0
+    return 0
 
-        date_val = row.iloc[2]
-        category = str(row.iloc[3]).strip() if pd.notna(row.iloc[3]) else ''
-        title = str(row.iloc[4]).strip() if pd.notna(row.iloc[4]) else ''
-        is_confirmed_val = row.iloc[5] if len(row) > 5 else None
-        details = str(row.iloc[6]).strip() if len(row) > 6 and pd.notna(row.iloc[6]) else ''
+
+def normalize_deadline(deadline_val):
+    """실무 마감일 셀을 저장 형식으로 바꿉니다. 옮길 수 없는 표현은 원문 그대로"""
+    if is_blank(deadline_val):
+        return ''
+    if isinstance(deadline_val, (datetime, date)):
+        return deadline_val.strftime('%Y-%m-%d')
+    if isinstance(deadline_val, str):
+        deadline_str = deadline_val.strip()
+        normalized, exact = normalize_date_phrase(deadline_str)
+        return normalized if exact else deadline_str
+    return ''
+
+
+def row_hash(values):
+    """정규화된 원본 행 값의 내용 해시"""
+    return hashlib.blake2b(repr(values).encode(), digest_size=16).hexdigest()
+
+
+def activist_rows(rows):
+    """활동가 시트 행 -> (id, (name,))"""
+    for row in rows:
+        activist_id = cell_text(row, 1)
+        name = cell_text(row, 2)
+        if activist_id and name and activist_id != 'nan':
+            yield activist_id, (name,)
+
+
+def schedule_rows(rows):
+    """일정 시트 행 -> (괄호 안 ID 또는 None, (date, category, title, is_confirmed, details))"""
+    for row in rows:
+        id_text = cell(row, 1)
+
+        # 괄호 안 ID (예: "자동부여 \n(FFFF)") - 실무 테이블은 이 ID로 일정을 참조
+        match = RE_BRACKET_ID.search(str(id_text) if not is_blank(id_text) else '')
+        schedule_id = match.group(1) if match else None
+
+        category = cell_text(row, 3) or ''
+        title = cell_text(row, 4) or ''
+        details = cell_text(row, 6) or ''
 
         if not title:
             continue
@@ -94,102 +199,39 @@ def import_schedules(df):
         # 제목에서 줄바꿈 정리
         title = title.replace('\n', ' ').strip()
 
-        # 날짜 처리
-        date_str = ''
-        if pd.notna(date_val):
-            if isinstance(date_val, (pd.Timestamp, datetime)):
-                date_str = date_val.strftime('%Y-%m-%d')
-            elif isinstance(date_val, str):
-                date_str = date_val.strip().replace('\n', ' ')
-
-                # 이미 YYYY-MM-DD 또는 YYYY-MM 형식이면 그대로
-                if re.match(r'^\d{4}-\d{2}(-\d{2})?$', date_str):
-                    pass
-                # "7월", "1월" -> 2026-MM
-                elif re.match(r'^(\d{1,2})월$', date_str):
-                    month = int(re.match(r'^(\d{1,2})월$', date_str).group(1))
-                    date_str = f'2026-{month:02d}'
-                # "4월 초", "3월 말", "6월 중순", "9월 중 미정" 등 -> 2026-MM-시기
-                elif match := re.match(r'^(\d{1,2})월\s*(초|중순?|말)(?:\s*미정)?$', date_str):
-                    month = int(match.group(1))
-                    timing = match.group(2)
-                    if timing in ['중', '중순']:
-                        timing = '중순'
-                    date_str = f'2026-{month:02d}-{timing}'
-                # "5월 말~6월 초" 같은 범위
-                elif match := re.match(r'^(\d{1,2})월\s*(초|중순?|말)?[~\-](\d{1,2})월\s*(초|중순?|말)?$', date_str):
-                    month1 = int(match.group(1))
-                    timing1 = match.group(2) or ''
-                    month2 = int(match.group(3))
-                    timing2 = match.group(4) or ''
-                    date_str = f'2026-{month1:02d}-{timing1}~{month2:02d}-{timing2}'
-                # "4월 2일(목)" 같은 특정 날짜 -> 2026-04-02
-                elif match := re.match(r'^(\d{1,2})월\s*(\d{1,2})일(?:\s*\([월화수목금토일]\))?$', date_str):
-                    month = int(match.group(1))
-                    day = int(match.group(2))
-                    date_str = f'2026-{month:02d}-{day:02d}'
-                # "3월 6일(금) 또는 7일(토)" 같은 복잡한 형식 -> 대략적으로 처리
-                elif match := re.match(r'^(\d{1,2})월\s*(\d{1,2})일', date_str):
-                    month = int(match.group(1))
-                    day = int(match.group(2))
-                    # 원본 텍스트를 details에 보존
-                    original_text = date_str
-                    date_str = f'2026-{month:02d}-{day:02d}'
-                    details = f"[일정 참고: {original_text}]\n{details}" if details else f"[일정 참고: {original_text}]"
-                # "5월 17일(일)까지" 같은 형식
-                elif match := re.match(r'^(\d{1,2})월\s*(\d{1,2})일(?:\s*\([월화수목금토일]\))?(?:까지|부터)?$', date_str):
-                    month = int(match.group(1))
-                    day = int(match.group(2))
-                    date_str = f'2026-{month:02d}-{day:02d}'
-                # "미정"
-                elif date_str == '미정':
-                    date_str = ''
-                # "연중 1회", "연중" 등
-                elif re.match(r'^연중', date_str):
-                    date_str = '연중'
-                # 그 외 복잡한 형식은 그대로 보존
-                else:
-                    # 월 정보라도 추출 시도
-                    month_only = re.search(r'(\d{1,2})월', date_str)
-                    if month_only:
-                        month = int(month_only.group(1))
-                        # 원본 텍스트 보존하면서 정렬용 월 정보 사용
-                        original_text = date_str
-                        date_str = f'2026-{month:02d}-미정'
-                        details = f"[일정 참고: {original_text}]\n{details}" if details else f"[일정 참고: {original_text}]"
-                    else:
-                        date_str = ''
-
-        # 확정 여부 처리
-        is_confirmed = 0
-        if pd.notna(is_confirmed_val):
-            if isinstance(is_confirmed_val, bool):
-                is_confirmed = 1 if is_confirmed_val else 0
-            elif isinstance(is_confirmed_val, (int, float)):
-                is_confirmed = 1 if is_confirmed_val == 1 else 0
-            elif isinstance(is_confirmed_val, str):
-                is_confirmed = 1 if is_confirmed_val.strip().lower() in ['1', 'true', 'o', '확정'] else 0
-
-        cursor.execute('''
-            INSERT INTO schedules (id, date, category, title, is_confirmed, is_completed, details)
-            VALUES (?, ?, ?, ?, ?, 0, ?)
-        ''', (schedule_id, date_str, category, title, is_confirmed, details))
-        count += 1
-
-    conn.commit()
-    conn.close()
-    print(f"일정 {count}건 임포트 완료")
-    print(f"ID 매핑: {schedule_id_map}")
+        date_str, details = normalize_schedule_date(cell(row, 2), details)
+        is_confirmed = normalize_flag(cell(row, 5), ['1', 'true', 'o', '확정'])
+
+        yield schedule_id, (date_str, category, title, is_confirmed, details)
+
+
+def assign_schedule_ids(records, stored, stored_titles):
+    """ID가 없는 일정에 ID를 붙입니다.
+
+    같은 제목의 기존 일정이 있으면 그 ID를 다시 쓰고,
+    없으면 기존 ID와 겹치지 않는 새 ID를 생성합니다.
+    """
+    used = set()
+    for schedule_id, values in records:
+        if schedule_id is None:
+            schedule_id = stored_titles.pop(values[2], None)
+            if schedule_id is None or schedule_id in used:
+                schedule_id = generate_id()
+                while schedule_id in used or schedule_id in stored:
+                    schedule_id = generate_id()
+        used.add(schedule_id)
+        yield schedule_id, values
 
-def import_tasks(df):
-    """실무 데이터를 임포트합니다."""
-    conn = sqlite3.connect(DATABASE)
-    cursor = conn.cursor()
 
-    count = 0
-    # 2행부터 데이터 (0-indexed로 row 2+)
-    for i, row in df.iloc[2:].iterrows():
-        schedule_id_text = str(row.iloc[1]).strip() if pd.notna(row.iloc[1]) else None
+def task_key(schedule_id, content, occurrence):
+    """실무 행 키: 일정 ID + 내용 (같은 내용이 반복되면 몇 번째인지)"""
+    return row_hash((schedule_id, content, occurrence))
+
+
+def task_rows(rows):
+    """실무 시트 행 -> (schedule_id, priority, activist_id, is_idea, deadline, content)"""
+    for row in rows:
+        schedule_id_text = cell_text(row, 1)
 
         if not schedule_id_text:
             continue
@@ -197,96 +239,398 @@ def import_tasks(df):
         # 괄호 제거하여 ID 추출 (예: "(FFFF)" -> "FFFF")
         schedule_id = re.sub(r'[()]', '', schedule_id_text)
 
-        # ID 매핑에서 실제 ID 찾기
-        if schedule_id in schedule_id_map:
-            schedule_id = schedule_id_map[schedule_id]
+        priority_val = cell(row, 2)
+        priority = int(priority_val) if isinstance(priority_val, (int, float)) and not is_blank(priority_val) else 1
 
-        priority_val = row.iloc[2]
-        priority = int(priority_val) if pd.notna(priority_val) and isinstance(priority_val, (int, float)) else 1
-
-        activist_id = str(row.iloc[3]).strip() if pd.notna(row.iloc[3]) else None
-        is_idea_val = row.iloc[4] if len(row) > 4 else None
-        deadline_val = row.iloc[5] if len(row) > 5 else None
-        content = str(row.iloc[6]).strip() if len(row) > 6 and pd.notna(row.iloc[6]) else ''
+        activist_id = cell_text(row, 3)
+        content = cell_text(row, 6) or ''
 
         if not content:
             continue
 
-        # 아이디어 여부 처리
-        is_idea = 0
-        if pd.notna(is_idea_val):
-            if isinstance(is_idea_val, bool):
-                is_idea = 1 if is_idea_val else 0
-            elif isinstance(is_idea_val, (int, float)):
-                is_idea = 1 if is_idea_val == 1 else 0
-            elif isinstance(is_idea_val, str):
-                is_idea = 1 if is_idea_val.strip().lower() in ['1', 'true', 'o'] else 0
-
-        # 마감일 처리
-        deadline = ''
-        if pd.notna(deadline_val):
-            if isinstance(deadline_val, (pd.Timestamp, datetime)):
-                deadline = deadline_val.strftime('%Y-%m-%d')
-            elif isinstance(deadline_val, str):
-                deadline_str = deadline_val.strip()
-                # "4월" 같은 월만 있는 경우 -> 2026-04 형식으로
-                month_match = re.match(r'^(\d{1,2})월$', deadline_str)
-                if month_match:
-                    month = int(month_match.group(1))
-                    deadline = f'2026-{month:02d}'
-                else:
-                    deadline = deadline_str
+        is_idea = normalize_flag(cell(row, 4), ['1', 'true', 'o'])
+        deadline = normalize_deadline(cell(row, 5))
 
         # activist_id가 빈 문자열이면 None으로
         if activist_id == '' or activist_id == 'nan':
             activist_id = None
 
-        cursor.execute('''
-            INSERT INTO tasks (schedule_id, priority, activist_id, is_idea, is_draft, deadline, content, is_completed)
-            VALUES (?, ?, ?, ?, 0, ?, ?, 0)
-        ''', (schedule_id, priority, activist_id, is_idea, deadline, content))
-        count += 1
-
-    conn.commit()
-    conn.close()
-    print(f"실무 {count}건 임포트 완료")
-
-def main():
-    if not os.path.exists(EXCEL_FILE):
-        print(f"오류: {EXCEL_FILE} 파일을 찾을 수 없습니다.")
-        return
+        yield schedule_id, priority, activist_id, is_idea, deadline, content
 
-    print(f"\n=== {EXCEL_FILE} 데이터 임포트 시작 ===\n")
 
-    # 엑셀 파일 읽기
-    xlsx = pd.ExcelFile(EXCEL_FILE)
-    print(f"시트 목록: {xlsx.sheet_names}")
+def task_records(values_list):
+    """실무 값 -> (키, 값). 같은 일정/내용이 반복되면 나온 순서로 구분합니다."""
+    occurrences = {}
+    for values in values_list:
+        schedule_id, content = values[0], values[5]
+        occurrence = occurrences.get((schedule_id, content), 0)
+        occurrences[(schedule_id, content)] = occurrence + 1
+        yield task_key(schedule_id, content, occurrence), values
 
-    # 기존 데이터 삭제
-    clear_database()
 
-    # 활동가 임포트 (header=None으로 읽기)
-    if '활동가' in xlsx.sheet_names:
-        df_activists = pd.read_excel(xlsx, sheet_name='활동가', header=None)
-        print(f"\n[활동가] {len(df_activists)}행 (헤더 제외 {len(df_activists) - 2}건)")
-        import_activists(df_activists)
+# 테이블별 INSERT/UPDATE/DELETE (UPDATE는 엑셀에서 오는 컬럼만 바꾸고 완료 여부 등은 유지)
+ACTIVIST_INSERT = 'INSERT INTO activists (id, name, import_hash) VALUES (?, ?, ?)'
+ACTIVIST_UPDATE = 'UPDATE activists SET name = ?, import_hash = ? WHERE id = ?'
+ACTIVIST_DELETE = 'DELETE FROM activists WHERE id = ?'
 
-    # 일정 임포트 (header=None으로 읽기)
-    if '주요 일정표' in xlsx.sheet_names:
-        df_schedules = pd.read_excel(xlsx, sheet_name='주요 일정표', header=None)
-        print(f"\n[주요 일정표] {len(df_schedules)}행 (헤더 제외 {len(df_schedules) - 3}건)")
-        import_schedules(df_schedules)
+SCHEDULE_INSERT = '''
+    INSERT INTO schedules (id, date, category, title, is_confirmed, is_completed, details, sort_date, date_precision,
+                           import_hash)
+    VALUES (?, ?, ?, ?, ?, 0, ?, ?, ?, ?)
+'''
+SCHEDULE_UPDATE = '''
+    UPDATE schedules SET date = ?, category = ?, title = ?, is_confirmed = ?, details = ?, sort_date = ?,
+                         date_precision = ?, import_hash = ?, version = version + 1
+    WHERE id = ?
+'''
+SCHEDULE_DELETE = 'DELETE FROM schedules WHERE id = ?'
 
-    # 실무 임포트 (header=None으로 읽기)
-    if '주요 실무표' in xlsx.sheet_names:
-        df_tasks = pd.read_excel(xlsx, sheet_name='주요 실무표', header=None)
-        print(f"\n[주요 실무표] {len(df_tasks)}행 (헤더 제외 {len(df_tasks) - 2}건)")
-        import_tasks(df_tasks)
+TASK_INSERT = '''
+    INSERT INTO tasks (schedule_id, priority, activist_id, is_idea, is_draft, deadline, content, is_completed,
+                       sort_date, date_precision, import_key, import_hash)
+    VALUES (?, ?, ?, ?, 0, ?, ?, 0, ?, ?, ?, ?)
+'''
+TASK_UPDATE = '''
+    UPDATE tasks SET schedule_id = ?, priority = ?, activist_id = ?, is_idea = ?, deadline = ?, content = ?,
+                     sort_date = ?, date_precision = ?, import_key = ?, import_hash = ?, version = version + 1
+    WHERE id = ?
+'''
+TASK_DELETE = 'DELETE FROM tasks WHERE id = ?'
 
-    print("\n=== 임포트 완료 ===")
 
-    # 결과 확인
-    conn = sqlite3.connect(DATABASE)
+def activist_params(key, digest, values):
+    return (key, *values, digest)
+
+
+def activist_update_params(ref, key, digest, values):
+    return (*values, digest, ref)
+
+
+def schedule_params(key, digest, values):
+    return (key, *values, *sort_fields(values[0]), digest)
+
+
+def schedule_update_params(ref, key, digest, values):
+    return (*values, *sort_fields(values[0]), digest, ref)
+
+
+def task_params(key, digest, values):
+    return (*values, *sort_fields(values[4]), key, digest)
+
+
+def task_update_params(ref, key, digest, values):
+    return (*task_params(key, digest, values), ref)
+
+
+# 테이블별 (INSERT, INSERT 값, UPDATE, UPDATE 값, DELETE) - 참조되는 테이블부터
+TABLE_WRITES = (
+    ('activists', ACTIVIST_INSERT, activist_params, ACTIVIST_UPDATE, activist_update_params, ACTIVIST_DELETE),
+    ('schedules', SCHEDULE_INSERT, schedule_params, SCHEDULE_UPDATE, schedule_update_params, SCHEDULE_DELETE),
+    ('tasks', TASK_INSERT, task_params, TASK_UPDATE, task_update_params, TASK_DELETE),
+)
+
+
+class Diff:
+    """한 시트와 저장된 행의 차이"""
+
+    def __init__(self, label):
+        self.label = label
+        self.inserts = []    # (키, 해시, 값)
+        self.updates = []    # (행 id, 키, 해시, 값)
+        self.deletes = []    # 행 id
+        self.unchanged = 0
+
+    @property
+    def writes(self):
+        return len(self.inserts) + len(self.updates) + len(self.deletes)
+
+    def summary(self):
+        return (f"[{self.label}] 추가 {len(self.inserts)}, 수정 {len(self.updates)}, "
+                f"삭제 {len(self.deletes)}, 변경 없음 {self.unchanged}")
+
+
+def diff_rows(label, stored, records):
+    """원본 행과 저장된 행을 비교합니다.
+
+    stored는 {키: (행 id, 해시)}이며 해시가 NULL인 행(앱에서 만들었거나
+    해시 도입 전 임포트한 행)은 같은 키의 원본 행이 있으면 수정으로 넘겨
+    해시를 채우고, 없으면 삭제하지 않고 그대로 둡니다.
+    """
+    diff = Diff(label)
+    seen = set()
+    for key, values in records:
+        if key in seen:
+            continue  # 중복 행은 첫 행만 사용
+        seen.add(key)
+        digest = row_hash(values)
+        entry = stored.get(key)
+        if entry is None:
+            diff.inserts.append((key, digest, values))
+        elif entry[1] != digest:
+            diff.updates.append((entry[0], key, digest, values))
+        else:
+            diff.unchanged += 1
+    diff.deletes = [ref for key, (ref, digest) in stored.items() if digest is not None and key not in seen]
+    return diff
+
+
+def stored_tasks(cursor):
+    """저장된 실무 {키: (id, 해시)}. 키가 없는 실무는 일정 ID + 내용으로 키를 만들어 맞춰봅니다."""
+    stored = {}
+    cursor.execute('SELECT id, import_key, import_hash FROM tasks WHERE import_key IS NOT NULL')
+    for task_id, key, digest in cursor.fetchall():
+        stored[key] = (task_id, digest)
+
+    occurrences = {}
+    cursor.execute('SELECT id, schedule_id, content FROM tasks WHERE import_key IS NULL ORDER BY id')
+    for task_id, schedule_id, content in cursor.fetchall():
+        occurrence = occurrences.get((schedule_id, content), 0)
+        occurrences[(schedule_id, content)] = occurrence + 1
+        stored.setdefault(task_key(schedule_id, content, occurrence), (task_id, None))
+    return stored
+
+
+def read_records(workbook, progress=True):
+    """워크북의 시트별 정규화된 행 (제너레이터). 없는 시트는 빠집니다.
+
+    activists: (id, 값), schedules: (괄호 안 ID 또는 None, 값), tasks: 값
+    """
+    def rows(sheet):
+        if not progress:
+            return read_sheet(workbook, sheet)
+        return Progress(sheet[0]).wrap(read_sheet(workbook, sheet))
+
+    records = {}
+    if ACTIVIST_SHEET[0] in workbook.sheetnames:
+        records['activists'] = activist_rows(rows(ACTIVIST_SHEET))
+    if SCHEDULE_SHEET[0] in workbook.sheetnames:
+        records['schedules'] = schedule_rows(rows(SCHEDULE_SHEET))
+    if TASK_SHEET[0] in workbook.sheetnames:
+        records['tasks'] = task_rows(rows(TASK_SHEET))
+    return records
+
+
+def plan_import(cursor, records):
+    """read_records의 행을 저장된 행과 비교해 테이블별 Diff를 만듭니다. (DB에는 쓰지 않음)"""
+    diffs = {}
+
+    if 'activists' in records:
+        stored = {row[0]: (row[0], row[1]) for row in cursor.execute('SELECT id, import_hash FROM activists')}
+        diffs['activists'] = diff_rows('활동가', stored, records['activists'])
+
+    if 'schedules' in records:
+        stored = {}
+        stored_titles = {}
+        # ID 없는 행은 제목으로 기존 일정을 찾음 (이전에 임포트한 일정 우선)
+        cursor.execute('SELECT id, title, import_hash FROM schedules ORDER BY import_hash IS NULL, id')
+        for schedule_id, title, digest in cursor.fetchall():
+            stored[schedule_id] = (schedule_id, digest)
+            stored_titles.setdefault(title, schedule_id)
+        diffs['schedules'] = diff_rows('주요 일정표', stored,
+                                       assign_schedule_ids(records['schedules'], stored, stored_titles))
+
+    if 'tasks' in records:
+        diff = diff_rows('주요 실무표', stored_tasks(cursor), task_records(records['tasks']))
+
+        # 삭제되는 일정의 나머지 실무도 함께 삭제 (앱의 일정 삭제와 동일)
+        if 'schedules' in diffs and diffs['schedules'].deletes:
+            removed = set(diffs['schedules'].deletes)
+            keep = {ref for ref, *_ in diff.updates} | set(diff.deletes)
+            cursor.execute('SELECT id, schedule_id FROM tasks WHERE import_key IS NULL')
+            diff.deletes += [task_id for task_id, schedule_id in cursor.fetchall()
+                             if schedule_id in removed and task_id not in keep]
+        diffs['tasks'] = diff
+
+    return diffs
+
+
+def write_rows(conn, sql, params, batch_size=None):
+    """executemany로 씁니다. batch_size가 있으면 그만큼 쓸 때마다 커밋합니다. 반환: 쓴 행 수"""
+    if not batch_size:
+        return conn.executemany(sql, params).rowcount
+    written = 0
+    params = iter(params)
+    while True:
+        batch = list(islice(params, batch_size))
+        if not batch:
+            return written
+        written += conn.executemany(sql, batch).rowcount
+        conn.commit()
+
+
+def unique_keys(records):
+    """같은 키의 행은 첫 행만 (증분 임포트의 diff_rows와 같은 규칙)"""
+    seen = set()
+    for key, values in records:
+        if key not in seen:
+            seen.add(key)
+            yield key, values
+
+
+def full_import(conn, records):
+    """기존 데이터를 지우고 행을 그대로 씁니다. 반환: 시트별 저장 건수
+
+    지우기와 쓰기가 한 트랜잭션이라 중간에 실패하면 기존 데이터가 그대로 남고,
+    앱은 커밋 전까지 예전 데이터를 봅니다. (배치 커밋을 하면 지운 상태가 먼저 확정됨)
+    """
+    counts = {}
+    clear_database(conn.cursor())
+
+    if 'activists' in records:
+        params = (activist_params(key, row_hash(values), values) for key, values in unique_keys(records['activists']))
+        counts['activists'] = write_rows(conn, ACTIVIST_INSERT, params)
+
+    if 'schedules' in records:
+        params = (schedule_params(key, row_hash(values), values)
+                  for key, values in unique_keys(assign_schedule_ids(records['schedules'], {}, {})))
+        counts['schedules'] = write_rows(conn, SCHEDULE_INSERT, params)
+
+    if 'tasks' in records:
+        params = (task_params(key, row_hash(values), values) for key, values in unique_keys(task_records(records['tasks'])))
+        counts['tasks'] = write_rows(conn, TASK_INSERT, params)
+
+    for table, count in counts.items():
+        print(f"[{table}] {count}건 저장")
+    return counts
+
+
+def incremental_import(conn, records, dry_run=False, batch_size=None):
+    """바뀐 행만 추가/수정/삭제합니다. 반환: 시트별 쓰기 건수"""
+    diffs = plan_import(conn.cursor(), records)
+
+    print("\n--- 변경 내용 ---")
+    for diff in diffs.values():
+        print(diff.summary())
+
+    if dry_run:
+        print("\n--dry-run: 저장하지 않았습니다.")
+        return {table: 0 for table in diffs}
+
+    # 추가/수정은 참조되는 테이블부터, 삭제는 참조하는 테이블부터
+    for table, insert_sql, insert_params, update_sql, update_params, _ in TABLE_WRITES:
+        if table in diffs:
+            diff = diffs[table]
+            write_rows(conn, insert_sql, (insert_params(*entry) for entry in diff.inserts), batch_size)
+            write_rows(conn, update_sql, (update_params(*entry) for entry in diff.updates), batch_size)
+    for table, *_, delete_sql in reversed(TABLE_WRITES):
+        if table in diffs:
+            write_rows(conn, delete_sql, ((ref,) for ref in diffs[table].deletes), batch_size)
+
+    return {table: diff.writes for table, diff in diffs.items()}
+
+
+class SchemaOutdated(Exception):
+    """--dry-run인데 데이터베이스 스키마가 최신이 아님 (dry-run은 마이그레이션하지 않음)"""
+
+
+def open_read_only(database):
+    """dry-run용 읽기 전용 연결. 파일이 없거나 마이그레이션이 밀려 있으면 SchemaOutdated"""
+    if not os.path.exists(database):
+        raise SchemaOutdated(f'{database} 파일이 없습니다. --dry-run 없이 임포트하면 새로 만듭니다.')
+    conn = sqlite3.connect(f'file:{database}?mode=ro', uri=True)
+    version, latest = schema_version(conn), latest_version()
+    if version < latest:
+        conn.close()
+        raise SchemaOutdated(f'{database} 스키마 버전이 {version}/{latest}입니다. 마이그레이션 {latest - version}단계가 '
+                             f'밀려 있어 비교할 수 없습니다. python migrations.py로 먼저 맞추세요.')
+    return conn
+
+
+def write_import(database, records, full=False, dry_run=False, batch_size=None):
+    """정규화된 행을 하나의 연결로 씁니다.
+
+    batch_size가 없거나 full이면 전체가 한 트랜잭션입니다. 증분 임포트를 배치로 커밋하다 실패하면
+    마지막으로 커밋한 배치까지만 반영됩니다.
+    dry_run이면 읽기 전용으로 열고 마이그레이션도 하지 않습니다 (스키마가 밀려 있으면 SchemaOutdated).
+    """
+    if dry_run:
+        conn = open_read_only(database)
+    else:
+        # 정렬용/임포트용 컬럼이 있는 최신 스키마로 맞춤
+        models.DATABASE = database
+        models.init_db()
+        conn = sqlite3.connect(database)
+    try:
+        with conn:  # 실패하면 (마지막 배치 이후) 전부 롤백
+            if full:
+                return full_import(conn, records)
+            return incremental_import(conn, records, dry_run, batch_size)
+    finally:
+        conn.close()
+
+
+def run_import(excel_file=EXCEL_FILE, database=DATABASE, full=False, dry_run=False):
+    """엑셀 파일을 하나의 트랜잭션으로 임포트합니다. 반환: 시트별 쓰기 건수
+
+    기본은 증분 임포트(바뀐 행만 반영)이고, full=True면 기존 데이터를 지우고 다시 씁니다.
+    """
+    started = time.perf_counter()
+    workbook = load_workbook(excel_file, read_only=True, data_only=True)
+    print(f"시트 목록: {workbook.sheetnames}")
+    try:
+        counts = write_import(database, read_records(workbook), full, dry_run)
+    finally:
+        workbook.close()
+
+    total = sum(counts.values())
+    elapsed = time.perf_counter() - started
+    print(f"\n총 {total}건 저장 ({elapsed:.2f}초)")
+    return counts
+
+
+def parse_workbook(excel_file):
+    """워크북 하나를 읽어 정규화된 행 목록으로 만듭니다. (작업 프로세스에서 실행)
+
+    반환: (파일, {시트: 행 목록}, 읽은 행 수, 걸린 시간)
+    """
+    started = time.perf_counter()
+    workbook = load_workbook(excel_file, read_only=True, data_only=True)
+    try:
+        records = {table: list(rows) for table, rows in read_records(workbook, progress=False).items()}
+    finally:
+        workbook.close()
+    rows = sum(len(rows) for rows in records.values())
+    return excel_file, records, rows, time.perf_counter() - started
+
+
+def run_batch_import(excel_files, database=DATABASE, full=False, dry_run=False, jobs=None,
+                     batch_size=BATCH_SIZE):
+    """여러 워크북을 프로세스 풀에서 병렬로 읽고, 쓰기는 이 프로세스 하나에서 합니다.
+
+    파일 순서대로 이어 붙인 하나의 워크북처럼 처리하므로 같은 ID가 여러 파일에
+    있으면 앞 파일의 행이 쓰입니다. 증분 모드에서는 주어진 파일 전체를 원본으로 보므로
+    목록에서 빠진 파일에서 임포트했던 행은 삭제됩니다. 증분 쓰기는 batch_size 행마다 커밋하고,
+    full이면 기존 데이터 삭제까지 한 트랜잭션으로 씁니다.
+    반환: 시트별 쓰기 건수
+    """
+    started = time.perf_counter()
+    parsed = []
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        # map은 파일 순서를 유지하고, 끝난 파일부터 바로 받음
+        for excel_file, records, rows, seconds in executor.map(parse_workbook, excel_files):
+            print(f"[읽기] {excel_file}: {rows}행 ({seconds:.2f}초, {rows / seconds if seconds > 0 else 0:.0f}행/초)")
+            parsed.append(records)
+    parse_seconds = time.perf_counter() - started
+
+    merged = {}
+    for records in parsed:
+        for table, rows in records.items():
+            merged.setdefault(table, []).append(rows)
+    merged = {table: chain.from_iterable(rows) for table, rows in merged.items()}
+
+    write_started = time.perf_counter()
+    counts = write_import(database, merged, full, dry_run, batch_size)
+    write_seconds = time.perf_counter() - write_started
+
+    total = sum(counts.values())
+    print(f"\n파일 {len(excel_files)}개, 총 {total}건 저장 "
+          f"(읽기 {parse_seconds:.2f}초, 쓰기 {write_seconds:.2f}초, 합계 {time.perf_counter() - started:.2f}초)")
+    return counts
+
+
+def print_summary(database=DATABASE):
+    """임포트 결과를 출력합니다."""
+    conn = sqlite3.connect(database)
     cursor = conn.cursor()
 
     cursor.execute('SELECT COUNT(*) FROM activists')
@@ -300,7 +644,7 @@ def main():
 
     # 샘플 데이터 출력
     print("\n--- 활동가 목록 ---")
-    cursor.execute('SELECT * FROM activists')
+    cursor.execute('SELECT * FROM activists LIMIT 20')
     for row in cursor.fetchall():
         print(f"  {row[0]}: {row[1]}")
 
@@ -316,5 +660,44 @@ def main():
 
     conn.close()
 
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='엑셀 데이터를 데이터베이스로 임포트합니다.')
+    parser.add_argument('excel_files', nargs='*', default=[EXCEL_FILE], metavar='excel_file',
+                        help='여러 개면 병렬로 읽어 한 번에 임포트')
+    parser.add_argument('--database', default=DATABASE)
+    parser.add_argument('--dry-run', action='store_true', help='변경 내용만 출력하고 저장하지 않음 (읽기 전용, 스키마가 최신이 아니면 중단)')
+    parser.add_argument('--full', action='store_true',
+                        help='기존 데이터를 모두 지우고 다시 임포트 (한 트랜잭션: --batch-size 무시, 실패하면 기존 데이터 유지)')
+    parser.add_argument('--jobs', type=int, help='여러 파일을 읽을 프로세스 수 (기본: CPU 수)')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                        help='여러 파일 증분 임포트의 커밋 단위 (행). 중간에 실패하거나 중단되면 '
+                             '마지막으로 커밋한 배치까지만 반영되고, 그동안 앱에도 일부만 반영된 상태가 보임')
+    args = parser.parse_args(argv)
+
+    if args.full and args.dry_run:
+        parser.error('--dry-run은 증분 임포트에서만 쓸 수 있습니다.')
+
+    missing = [excel_file for excel_file in args.excel_files if not os.path.exists(excel_file)]
+    if missing:
+        print(f"오류: {', '.join(missing)} 파일을 찾을 수 없습니다.")
+        return
+
+    print(f"\n=== {', '.join(args.excel_files)} 데이터 임포트 시작 ===\n")
+    try:
+        if len(args.excel_files) == 1:
+            run_import(args.excel_files[0], args.database, full=args.full, dry_run=args.dry_run)
+        else:
+            run_batch_import(args.excel_files, args.database, full=args.full, dry_run=args.dry_run,
+                             jobs=args.jobs, batch_size=args.batch_size)
+    except SchemaOutdated as e:
+        print(f"오류: {e}")
+        return
+    if args.dry_run:
+        return
+    print("\n=== 임포트 완료 ===")
+    print_summary(args.database)
+
+
 if __name__ == '__main__':
     main()
@@ -0,0 +1,107 @@
+"""
+실시간 반영 (Server-Sent Events)
+
+회의 중 여러 사람이 /meeting 과 / 를 띄워 두고 새로고침하는 대신,
+트리거로 쌓이는 change_log를 /events 로 흘려보내 화면이 바뀐 행만 고치게 합니다.
+
+- 워커 간 공유: 모든 워커가 같은 DB 파일의 change_log를 보므로 가장 큰 id가 공통 변경 버전입니다.
+  PRAGMA data_version(다른 연결이 커밋하면 바뀜)이 그대로면 change_log도 읽지 않습니다.
+- 동기 워커 보호: 스레드 워커(gthread 등)에서만 연결을 STREAM_SECONDS 동안 붙잡고,
+  동기 워커에서는 밀린 변경만 보내고 바로 끝냅니다. EventSource가 retry 뒤 Last-Event-ID로 다시 붙습니다.
+- 스레드 보호: 연결을 붙잡는 스트림은 워커당 MAX_STREAMS개까지만. 자리가 없으면 기다리지 않고
+  동기 워커처럼 밀린 변경만 보내고 끝내므로, 화면을 많이 띄워 둬도 쓰기 요청이 스레드를 받을 수 있습니다.
+"""
+import json
+import os
+import threading
+import time
+
+import models
+
+POLL_SECONDS = 1
+STREAM_SECONDS = 25      # 한 연결을 붙잡는 최대 시간 (끝나면 브라우저가 다시 연결)
+HEARTBEAT_SECONDS = 15   # 프록시가 유휴 연결을 끊지 않도록 보내는 주석 줄
+RETRY_MS = 5000          # 다시 연결할 때까지 기다릴 시간
+MAX_BATCH = 200          # 이보다 많이 밀렸으면 하나씩 보내지 않고 reset (새로고침 안내)
+
+# 워커당 동시에 붙잡는 스트림 수 (gunicorn --threads보다 작아야 다른 요청이 스레드를 받음)
+MAX_STREAMS = int(os.environ.get('SSE_MAX_STREAMS', 4))
+_stream_slots = threading.BoundedSemaphore(MAX_STREAMS)
+
+CHANGES_QUERY = '''
+    SELECT id, kind, ref, action, version, is_completed FROM change_log
+    WHERE id > ? ORDER BY id LIMIT ?
+'''
+
+
+def latest_change_id(conn):
+    """지금까지의 마지막 변경 id (페이지에 심어 두고 /events?after= 로 이어 받음)"""
+    return conn.execute('SELECT COALESCE(MAX(id), 0) FROM change_log').fetchone()[0]
+
+
+def format_event(event, event_id, data):
+    return f'id: {event_id}\nevent: {event}\ndata: {json.dumps(data, separators=(",", ":"))}\n\n'
+
+
+def format_change(row):
+    """change_log 한 줄 -> change 이벤트 (실무 id는 정수, 일정 id는 문자열)"""
+    data = {'kind': row['kind'], 'id': int(row['ref']) if row['kind'] == 'task' else row['ref'],
+            'action': row['action']}
+    if row['version'] is not None:
+        data['version'] = row['version']
+        data['done'] = row['is_completed']
+    return format_event('change', row['id'], data)
+
+
+def pending_events(conn, after):
+    """after 다음 변경들의 이벤트 문자열과 새 after.
+
+    기록이 지워져 중간이 비었거나 MAX_BATCH보다 많이 밀렸으면 reset 하나로 대신합니다.
+    """
+    rows = conn.execute(CHANGES_QUERY, (after, MAX_BATCH + 1)).fetchall()
+    if not rows:
+        return [], after
+    if rows[0]['id'] > after + 1 or len(rows) > MAX_BATCH:
+        latest = latest_change_id(conn)
+        return [format_event('reset', latest, {})], latest
+    return [format_change(row) for row in rows], rows[-1]['id']
+
+
+def stream(after=None, hold=0):
+    """SSE 본문 생성기. hold초 동안 POLL_SECONDS마다 새 변경을 확인합니다 (0이면 한 번만).
+
+    붙잡을 자리(MAX_STREAMS)가 없으면 hold=0으로 한 번만 보냅니다.
+    요청 풀의 연결을 오래 붙잡지 않도록 스트림 전용 읽기 연결(query_only)을 따로 엽니다.
+    트랜잭션 없이 읽으므로 확인할 때마다 최신 스냅샷을 봅니다.
+    """
+    holding = bool(hold) and _stream_slots.acquire(blocking=False)
+    if not holding:
+        hold = 0
+    conn = models._connect(read_only=True)
+    try:
+        if after is None:
+            after = latest_change_id(conn)
+        yield f'retry: {RETRY_MS}\n\n'
+
+        started = last_sent = time.monotonic()
+        data_version = None
+        while True:
+            current = conn.execute('PRAGMA data_version').fetchone()[0]
+            if current != data_version:
+                data_version = current
+                events, after = pending_events(conn, after)
+                if events:
+                    yield ''.join(events)
+                    last_sent = time.monotonic()
+
+            now = time.monotonic()
+            if now - started >= hold:
+                break
+            if now - last_sent >= HEARTBEAT_SECONDS:
+                yield ': ping\n\n'
+                last_sent = now
+            time.sleep(POLL_SECONDS)
+    finally:
+        conn.close()
+        if holding:
+            _stream_slots.release()
@@ -0,0 +1,345 @@
+"""
+스키마 마이그레이션
+
+워커마다 앱을 불러올 때 init_db()가 호출되므로, 스키마가 최신이면 PRAGMA user_version 한 번만 읽고 끝냅니다.
+최신이 아니면 파일 잠금(DB 파일 옆의 .migrate-lock)을 잡은 워커 하나만 마이그레이션하고,
+동시에 부팅한 다른 워커는 잠금을 기다렸다가 버전만 다시 확인합니다.
+
+- 마이그레이션은 @migration을 붙인 함수이고 정의 순서가 버전입니다 (첫 함수가 1).
+  스키마를 바꿀 때는 기존 함수를 고치지 말고 맨 뒤에 새 함수를 추가합니다.
+  (models.INDEXES 같은 정의를 바꿔도 이미 그 단계를 지난 DB에는 다시 적용되지 않음)
+- 각 단계는 자기 트랜잭션 안에서 실행되고 같은 트랜잭션에서 user_version을 올립니다.
+  중간에 실패하면 그 단계만 롤백되고 다음 부팅 때 그 단계부터 다시 합니다.
+- 버전 기록이 없던 기존 DB(user_version 0)도 처음부터 적용할 수 있도록 모든 단계는
+  이미 적용된 부분을 건너뜁니다 (IF NOT EXISTS, 컬럼 존재 확인).
+"""
+import sqlite3
+
+try:
+    import fcntl
+except ImportError:  # Windows 개발 환경: 잠금 없이 진행 (버전 확인과 멱등 단계로 충분)
+    fcntl = None
+
+import models
+from dates import sort_fields
+from writes import begin_immediate
+
+MIGRATIONS = []
+
+
+def migration(f):
+    """마이그레이션 단계로 등록 (버전 = 등록 순서)"""
+    MIGRATIONS.append(f)
+    return f
+
+
+def latest_version():
+    return len(MIGRATIONS)
+
+
+def _columns(cursor, table):
+    return {row[1] for row in cursor.execute(f'PRAGMA table_info({table})')}
+
+
+def _table_exists(cursor, name):
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,))
+    return cursor.fetchone() is not None
+
+
+def add_column(cursor, table, column, definition):
+    """컬럼이 없을 때만 추가합니다. 반환: 추가했는지"""
+    if column in _columns(cursor, table):
+        return False
+    cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+    return True
+
+
+def backfill_sort_dates(cursor, table, source):
+    """기존 행의 sort_date/date_precision을 원본 날짜 텍스트로부터 채웁니다."""
+    cursor.execute(f"SELECT id, {source} FROM {table} WHERE {source} IS NOT NULL AND {source} != ''")
+    rows = [(*sort_fields(row[1]), row[0]) for row in cursor.fetchall()]
+    cursor.executemany(f'UPDATE {table} SET sort_date = ?, date_precision = ? WHERE id = ?', rows)
+
+
+TASKS_TABLE = '''
+    CREATE TABLE {name} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        schedule_id TEXT,
+        priority INTEGER DEFAULT 1,
+        activist_id TEXT,
+        is_idea INTEGER DEFAULT 0,
+        is_draft INTEGER DEFAULT 0,
+        deadline TEXT,
+        content TEXT NOT NULL,
+        is_completed INTEGER DEFAULT 0,
+        created_at TEXT,
+        FOREIGN KEY (schedule_id) REFERENCES schedules(id),
+        FOREIGN KEY (activist_id) REFERENCES activists(id)
+    )
+'''
+
+
+@migration
+def base_tables(cursor):
+    """기본 테이블과 버전 관리 이전에 추가된 컬럼"""
+    # 활동가 테이블
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS activists (
+            id TEXT PRIMARY KEY,
+            name TEXT NOT NULL
+        )
+    ''')
+
+    # 주요 일정표 테이블
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS schedules (
+            id TEXT PRIMARY KEY,
+            date TEXT,
+            category TEXT NOT NULL,
+            title TEXT NOT NULL,
+            is_confirmed INTEGER DEFAULT 0,
+            is_completed INTEGER DEFAULT 0,
+            details TEXT
+        )
+    ''')
+
+    # 실무/TODO 테이블 (schedule_id는 NULL 가능 - TODO는 일정 없이도 존재 가능)
+    if not _table_exists(cursor, 'tasks'):
+        cursor.execute(TASKS_TABLE.format(name='tasks'))
+    else:
+        # 예전 스키마의 schedule_id NOT NULL 제거
+        # SQLite는 ALTER COLUMN을 지원하지 않으므로 테이블 재생성 (양쪽에 있는 컬럼만 복사)
+        cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'tasks'")
+        if 'schedule_id TEXT NOT NULL' in cursor.fetchone()[0]:
+            old_columns = _columns(cursor, 'tasks')
+            cursor.execute('ALTER TABLE tasks RENAME TO tasks_old')
+            cursor.execute(TASKS_TABLE.format(name='tasks'))
+            columns = ', '.join(column for column in
+                                ('id', 'schedule_id', 'priority', 'activist_id', 'is_idea', 'is_draft',
+                                 'deadline', 'content', 'is_completed', 'created_at')
+                                if column in old_columns)
+            cursor.execute(f'INSERT INTO tasks ({columns}) SELECT {columns} FROM tasks_old')
+            cursor.execute('DROP TABLE tasks_old')
+
+    # 사업 아이디어 테이블 (일정과 무관한 아이디어)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS ideas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            content TEXT NOT NULL,
+            activist_id TEXT,
+            is_adopted INTEGER DEFAULT 0,
+            created_at TEXT,
+            FOREIGN KEY (activist_id) REFERENCES activists(id)
+        )
+    ''')
+
+    # 사용자 테이블 (Google OAuth)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            google_id TEXT UNIQUE NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            name TEXT,
+            picture TEXT,
+            is_approved INTEGER DEFAULT 0,
+            created_at TEXT
+        )
+    ''')
+
+    add_column(cursor, 'tasks', 'is_draft', 'INTEGER DEFAULT 0')
+    add_column(cursor, 'tasks', 'created_at', 'TEXT')
+    add_column(cursor, 'tasks', 'details', 'TEXT')  # 아이디어 상세 내용용
+    # 1이면 2개월 전부터, 0이면 1개월 전부터 사전준비 알림
+    add_column(cursor, 'schedules', 'needs_advance_prep', 'INTEGER DEFAULT 0')
+    add_column(cursor, 'schedules', 'start_time', 'TEXT')
+    add_column(cursor, 'schedules', 'end_time', 'TEXT')
+    add_column(cursor, 'schedules', 'location', 'TEXT')
+    add_column(cursor, 'users', 'activist_id', 'TEXT')  # 연결된 활동가
+
+
+@migration
+def sort_dates(cursor):
+    """정렬용 날짜 컬럼 (date/deadline 자유 텍스트를 YYYY-MM-DD로 정규화)"""
+    for table, source in (('schedules', 'date'), ('tasks', 'deadline')):
+        added = add_column(cursor, table, 'sort_date', 'TEXT')
+        added = add_column(cursor, table, 'date_precision', 'TEXT') or added
+        if added:
+            backfill_sort_dates(cursor, table, source)
+
+
+@migration
+def import_hashes(cursor):
+    """엑셀 증분 임포트용 원본 행 해시 (앱에서 만든 행은 NULL)"""
+    for table, columns in (('activists', ('import_hash',)), ('schedules', ('import_hash',)),
+                           ('tasks', ('import_key', 'import_hash'))):
+        for column in columns:
+            add_column(cursor, table, column, 'TEXT')
+
+
+@migration
+def row_versions(cursor):
+    """행 버전 (수정할 때마다 1씩 올려서 오래된 화면에서 보낸 수정/토글을 거부)"""
+    for table in ('schedules', 'tasks', 'ideas'):
+        add_column(cursor, table, 'version', 'INTEGER NOT NULL DEFAULT 1')
+
+
+@migration
+def task_months(cursor):
+    """월별 실무 수 (실무 목록의 월 필터용, 트리거로 유지)"""
+    if not _table_exists(cursor, 'task_months'):
+        cursor.execute('''
+            CREATE TABLE task_months (
+                month TEXT PRIMARY KEY,
+                task_count INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        cursor.execute('''
+            INSERT INTO task_months (month, task_count)
+            SELECT substr(sort_date, 1, 7), COUNT(*) FROM tasks
+            WHERE sort_date IS NOT NULL
+            GROUP BY substr(sort_date, 1, 7)
+        ''')
+    for statement in models.TASK_MONTH_TRIGGERS:
+        cursor.execute(statement)
+
+
+@migration
+def cache_versions(cursor):
+    """변경 버전 (캐시와 ETag를 워커 간에 맞추기 위해 트리거로 증가)"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS cache_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    for table, counter in models.VERSIONED_TABLES.items():
+        cursor.execute('INSERT OR IGNORE INTO cache_versions (name, version) VALUES (?, 0)', (counter,))
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_version_{event.lower()} AFTER {event} ON {table}
+                BEGIN
+                    UPDATE cache_versions SET version = version + 1 WHERE name = '{counter}';
+                END
+            ''')
+
+
+@migration
+def change_log(cursor):
+    """변경 기록 (id가 워커 간 공통 변경 버전: 가장 큰 id보다 크면 새 변경)"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS change_log (
+            id INTEGER PRIMARY KEY,
+            kind TEXT NOT NULL,
+            ref TEXT NOT NULL,
+            action TEXT NOT NULL,
+            version INTEGER,
+            is_completed INTEGER
+        )
+    ''')
+    for statement in models.CHANGE_LOG_TRIGGERS:
+        cursor.execute(statement)
+
+
+@migration
+def search_tables(cursor):
+    """전체 텍스트 검색 테이블 (처음 만들 때 기존 행으로 채움)
+
+    FTS5/trigram이 없는 SQLite(3.34 미만)에서는 건너뛰고 검색은 LIKE로 동작합니다.
+    (SQLite를 올린 뒤 검색 색인을 만들려면 user_version을 이 단계 앞으로 되돌리고 다시 시작)
+    """
+    cursor.execute('SAVEPOINT search_tables')
+    try:
+        for name, (create, populate) in models.SEARCH_TABLES.items():
+            if not _table_exists(cursor, name):
+                cursor.execute(create)
+                cursor.execute(populate)
+        for statement in models.SEARCH_TRIGGERS:
+            cursor.execute(statement)
+    except sqlite3.OperationalError:
+        cursor.execute('ROLLBACK TO search_tables')  # FTS5 미지원
+    cursor.execute('RELEASE search_tables')
+
+
+@migration
+def indexes(cursor):
+    """조회용 인덱스 (sort_date 도입 전 인덱스는 삭제)"""
+    for name in models.OBSOLETE_INDEXES:
+        cursor.execute(f'DROP INDEX IF EXISTS {name}')
+    for statement in models.INDEXES:
+        cursor.execute(statement)
+
+
+@migration
+def schedule_counts(cursor):
+    """일정별 실무/완료/아이디어 수 (tasks 트리거로 유지, 점검/복구: flask check-counters)"""
+    if not _table_exists(cursor, 'schedule_counts'):
+        cursor.execute('''
+            CREATE TABLE schedule_counts (
+                schedule_id TEXT PRIMARY KEY,
+                task_count INTEGER NOT NULL DEFAULT 0,
+                completed_count INTEGER NOT NULL DEFAULT 0,
+                idea_count INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        cursor.execute(f'INSERT INTO schedule_counts {models.SCHEDULE_COUNTS_QUERY}')
+    for statement in models.SCHEDULE_COUNT_TRIGGERS:
+        cursor.execute(statement)
+
+
+@migration
+def reminder_dates(cursor):
+    """사전준비 알림 시작일 (가상 컬럼 + 알림 대상만 담은 부분 인덱스)"""
+    add_column(cursor, 'schedules', 'remind_from', f'TEXT GENERATED ALWAYS AS ({models.REMIND_FROM}) VIRTUAL')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_schedules_remind ON schedules(remind_from) '
+                   'WHERE remind_from IS NOT NULL')
+    cursor.execute('DROP INDEX IF EXISTS idx_schedules_prep_sort')  # 알림 조회가 쓰던 인덱스
+
+
+def schema_version(conn):
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def _apply(conn):
+    """밀린 단계를 하나씩 적용합니다. 반환: 적용한 단계 수"""
+    applied = 0
+    for version, step in enumerate(MIGRATIONS, start=1):
+        if version <= schema_version(conn):
+            continue
+        begin_immediate(conn)
+        try:
+            step(conn.cursor())
+            conn.execute(f'PRAGMA user_version = {version}')
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        applied += 1
+    if applied:
+        conn.execute('PRAGMA optimize')
+    return applied
+
+
+def migrate():
+    """스키마를 최신 버전으로 맞춥니다. 반환: 적용한 단계 수 (최신이었으면 0)"""
+    conn = models._connect()
+    conn.isolation_level = None  # 트랜잭션은 단계마다 직접 시작/커밋
+    try:
+        if schema_version(conn) >= latest_version():
+            return 0
+        if fcntl is None:
+            return _apply(conn)
+        with open(f'{models.DATABASE}.migrate-lock', 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)  # 다른 워커가 마이그레이션 중이면 끝날 때까지 기다림
+            try:
+                return _apply(conn)  # 기다리는 동안 끝났으면 버전만 확인하고 0
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    applied = migrate()
+    conn = models._connect()
+    print(f'스키마 버전 {schema_version(conn)}/{latest_version()} (이번에 적용 {applied}단계)')
+    conn.close()
@@ -1,171 +1,538 @@
 import sqlite3
+import threading
 from datetime import datetime
 import os
 
+from flask import g, has_app_context, has_request_context, request
+
+from dates import sort_fields
+
 DATABASE = os.environ.get('DATABASE_PATH', 'database.db')
 
+# 워커(프로세스)당 보관할 유휴 연결 수 (쓰기용, 읽기용 풀 각각)
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 4))
+
+# 이 메서드의 요청은 query_only 연결에서 한 읽기 트랜잭션(같은 WAL 스냅샷)으로 처리
+READ_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# 연결을 새로 만들 때 한 번만 적용하는 PRAGMA
+# WAL: 읽기와 쓰기가 서로 막지 않음, NORMAL: WAL에서는 커밋마다 fsync하지 않아도 안전
+DB_PRAGMAS = (
+    ('journal_mode', 'WAL'),
+    ('synchronous', 'NORMAL'),
+    ('busy_timeout', 1000),        # ms, 잠금 대기 시간 (넘기면 writes.begin_immediate가 지터를 두고 다시 시도)
+    ('cache_size', -16000),        # 음수는 KiB 단위 (약 16MB)
+    ('mmap_size', 64 * 1024 * 1024),
+    ('temp_store', 'MEMORY'),
+)
+
 # DB 경로의 디렉토리가 없으면 생성 (Docker/Coolify 배포용)
 db_dir = os.path.dirname(DATABASE)
 if db_dir and not os.path.exists(db_dir):
     os.makedirs(db_dir, exist_ok=True)
 
-def get_db():
-    """데이터베이스 연결을 반환합니다."""
-    conn = sqlite3.connect(DATABASE)
+class PooledConnection(sqlite3.Connection):
+    """풀에서 빌려주는 연결. close()는 무시하고 요청 종료 시 풀로 반납합니다."""
+
+    def close(self):
+        pass  # 반납은 release_db()가 담당
+
+    def discard(self):
+        sqlite3.Connection.close(self)
+
+
+def _connect(factory=sqlite3.Connection, read_only=False):
+    """PRAGMA가 적용된 새 연결을 만듭니다. read_only면 PRAGMA query_only로 쓰기를 막습니다."""
+    conn = sqlite3.connect(DATABASE, factory=factory, check_same_thread=False)
     conn.row_factory = sqlite3.Row
+    for name, value in DB_PRAGMAS:
+        conn.execute(f'PRAGMA {name} = {value}')
+    if read_only:
+        conn.execute('PRAGMA query_only = 1')
     return conn
 
+
+class ConnectionPool:
+    """워커별 SQLite 연결 풀 (fork 후에는 부모의 연결을 버리고 새로 시작)"""
+
+    def __init__(self, size, read_only=False):
+        self.size = size
+        self.read_only = read_only
+        self.hits = 0
+        self.misses = 0
+        self._idle = []
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def acquire(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                self._idle = []
+                self._pid = os.getpid()
+                self.hits = self.misses = 0
+            if self._idle:
+                self.hits += 1
+                return self._idle.pop()
+            self.misses += 1
+        conn = _connect(PooledConnection, self.read_only)
+        # 읽기 연결은 트랜잭션을 get_db()가 직접 열고,
+        # 쓰기 연결은 암묵적으로 여는 트랜잭션도 쓰기 잠금을 처음에 잡음 (writes.py 참고)
+        conn.isolation_level = None if self.read_only else 'IMMEDIATE'
+        conn.set_trace_callback(_count_query)
+        return conn
+
+    def release(self, conn):
+        try:
+            if conn.in_transaction:
+                conn.rollback()  # 커밋되지 않은 변경은 다음 요청으로 넘기지 않음 (읽기 연결은 스냅샷을 놓음)
+        except sqlite3.Error:
+            conn.discard()
+            return
+        with self._lock:
+            if self._pid == os.getpid() and len(self._idle) < self.size:
+                self._idle.append(conn)
+                return
+        conn.discard()
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'idle': len(self._idle), 'size': self.size}
+
+
+pool = ConnectionPool(DB_POOL_SIZE)
+read_pool = ConnectionPool(DB_POOL_SIZE, read_only=True)
+
+
+def _count_query(statement):
+    """풀 연결에서 실행된 SQL 문 수를 요청 단위로 셉니다.
+
+    '-- '로 시작하는 문은 트리거/FTS5 가상 테이블이 안에서 실행한 것이라 세지 않습니다.
+    RETURNING이 있는 UPDATE는 트리거를 거칠 때마다 같은 문이 다시 불리므로 바로 앞과 같은 문도 세지 않습니다.
+    """
+    if not has_app_context() or statement.startswith('-- '):
+        return
+    if statement != g.get('last_statement'):
+        g.query_count = g.get('query_count', 0) + 1
+    g.last_statement = statement
+
+
+def query_count():
+    """현재 요청에서 지금까지 실행된 SQL 문 수"""
+    return g.get('query_count', 0)
+
+
+def _read_request():
+    return has_request_context() and request.method in READ_METHODS
+
+
+def get_db(write=False):
+    """데이터베이스 연결을 반환합니다.
+
+    앱 컨텍스트 안에서는 풀에서 빌린 연결을 요청 동안 재사용하고,
+    그 밖(스크립트 등)에서는 새 연결을 만듭니다.
+    GET 요청은 query_only 연결을 받고, 모든 문이 처음 읽을 때 잡힌 같은 스냅샷을 봅니다.
+    (DEFERRED 읽기 트랜잭션이라 쓰기와 서로 막지 않음) GET인데 써야 하면 write=True.
+    """
+    if not has_app_context():
+        return _connect()
+    if write or not _read_request():
+        if 'db' not in g:
+            g.db = pool.acquire()
+        return g.db
+    if 'read_db' not in g:
+        g.read_db = read_pool.acquire()
+        g.read_db.execute('BEGIN')
+    return g.read_db
+
+
+def release_db(exc=None):
+    """요청에서 빌린 연결을 풀로 반납합니다. (teardown_appcontext용)"""
+    conn = g.pop('db', None)
+    if conn is not None:
+        pool.release(conn)
+    conn = g.pop('read_db', None)
+    if conn is not None:
+        read_pool.release(conn)
+
+# 각 화면의 실제 쿼리에 맞춘 인덱스 (날짜 정렬/범위는 sort_date 기준)
+INDEXES = (
+    # index(): is_idea = 0 [AND is_completed = 0] ORDER BY is_completed, sort_date
+    'CREATE INDEX IF NOT EXISTS idx_tasks_open_sort ON tasks(is_idea, is_completed, sort_date)',
+    # index()/tasks() 활동가 필터, activists()의 미완료 실무 수
+    'CREATE INDEX IF NOT EXISTS idx_tasks_activist_sort ON tasks(activist_id, is_idea, is_completed, sort_date)',
+    # 일정별 실무/아이디어 (meeting(), schedule_detail(), 진행률 집계)
+    'CREATE INDEX IF NOT EXISTS idx_tasks_schedule_sort ON tasks(schedule_id, is_idea, is_completed, sort_date)',
+    # tasks(): [is_completed = 0] ORDER BY is_completed, sort_date
+    'CREATE INDEX IF NOT EXISTS idx_tasks_completed_sort ON tasks(is_completed, sort_date)',
+    # schedules(): 전체 일정 날짜순
+    'CREATE INDEX IF NOT EXISTS idx_schedules_sort ON schedules(sort_date)',
+    # 미완료 일정 날짜순, meeting()의 날짜 범위
+    'CREATE INDEX IF NOT EXISTS idx_schedules_open_sort ON schedules(is_completed, sort_date)',
+    # ideas(): [is_adopted = 0] [AND activist_id = ?] ORDER BY created_at DESC
+    'CREATE INDEX IF NOT EXISTS idx_ideas_open ON ideas(is_adopted, created_at)',
+    'CREATE INDEX IF NOT EXISTS idx_ideas_activist ON ideas(activist_id, is_adopted, created_at)',
+    # ideas(show_adopted=1): 채택 여부와 무관하게 created_at 키셋
+    'CREATE INDEX IF NOT EXISTS idx_ideas_created ON ideas(created_at)',
+    'CREATE INDEX IF NOT EXISTS idx_activists_name ON activists(name)',
+    'CREATE INDEX IF NOT EXISTS idx_users_created ON users(created_at)',
+    # import_excel 증분 임포트: 원본 행 키로 기존 실무 찾기
+    'CREATE UNIQUE INDEX IF NOT EXISTS idx_tasks_import_key ON tasks(import_key) WHERE import_key IS NOT NULL',
+)
+
+
+# sort_date 도입 전 원본 텍스트 컬럼 기준으로 만들었던 인덱스
+OBSOLETE_INDEXES = (
+    'idx_tasks_open', 'idx_tasks_activist', 'idx_tasks_schedule', 'idx_tasks_completed',
+    'idx_schedules_open', 'idx_schedules_prep',
+)
+
+
+# 사전준비 알림 시작일 (미확정/미완료 일정만, needs_advance_prep=1이면 70일 전, 아니면 35일 전부터)
+# schedules.remind_from 가상 컬럼의 식: 쓰기 경로(앱, 엑셀 임포트)와 무관하게 SQLite가 계산하고,
+# 부분 인덱스에 미리 계산된 값으로 저장되어 index()는 오늘 날짜로 범위 조회만 합니다.
+PREP_DAYS = 35
+ADVANCE_PREP_DAYS = 70
+REMIND_FROM = f'''
+    CASE WHEN is_completed = 0 AND is_confirmed = 0 AND date_precision != 'year'
+         THEN date(sort_date, CASE WHEN needs_advance_prep = 1 THEN '-{ADVANCE_PREP_DAYS} days'
+                                   ELSE '-{PREP_DAYS} days' END)
+    END
+'''
+
+
+# task_months를 tasks.sort_date와 맞춰 두는 트리거
+TASK_MONTH_TRIGGERS = (
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_task_months_insert AFTER INSERT ON tasks
+    WHEN NEW.sort_date IS NOT NULL
+    BEGIN
+        INSERT INTO task_months (month, task_count) VALUES (substr(NEW.sort_date, 1, 7), 1)
+        ON CONFLICT(month) DO UPDATE SET task_count = task_count + 1;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_task_months_delete AFTER DELETE ON tasks
+    WHEN OLD.sort_date IS NOT NULL
+    BEGIN
+        UPDATE task_months SET task_count = task_count - 1 WHERE month = substr(OLD.sort_date, 1, 7);
+        DELETE FROM task_months WHERE month = substr(OLD.sort_date, 1, 7) AND task_count <= 0;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_task_months_update AFTER UPDATE OF sort_date ON tasks
+    WHEN OLD.sort_date IS NOT NEW.sort_date
+    BEGIN
+        UPDATE task_months SET task_count = task_count - 1 WHERE month = substr(OLD.sort_date, 1, 7);
+        DELETE FROM task_months WHERE month = substr(OLD.sort_date, 1, 7) AND task_count <= 0;
+        INSERT INTO task_months (month, task_count)
+        SELECT substr(NEW.sort_date, 1, 7), 1 WHERE NEW.sort_date IS NOT NULL
+        ON CONFLICT(month) DO UPDATE SET task_count = task_count + 1;
+    END
+    ''',
+)
+
+
+# 일정별 실무/완료/아이디어 수 (일정 목록, 회의, 알림의 진행률용)
+# 화면마다 tasks 전체를 GROUP BY 하지 않도록 schedule_counts에 두고 tasks 트리거로 맞춥니다.
+# schedules에 직접 두면 실무를 토글할 때마다 일정의 버전/변경 기록 트리거까지 돌기 때문에 별도 테이블
+SCHEDULE_COUNTS_QUERY = '''
+    SELECT schedule_id,
+           COUNT(CASE WHEN is_idea = 0 THEN 1 END) AS task_count,
+           COUNT(CASE WHEN is_idea = 0 AND is_completed = 1 THEN 1 END) AS completed_count,
+           COUNT(CASE WHEN is_idea = 1 THEN 1 END) AS idea_count
+    FROM tasks WHERE schedule_id IS NOT NULL
+    GROUP BY schedule_id
+'''
+
+SCHEDULE_COUNT_TRIGGERS = (
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_schedule_counts_insert AFTER INSERT ON tasks
+    WHEN NEW.schedule_id IS NOT NULL
+    BEGIN
+        INSERT INTO schedule_counts (schedule_id, task_count, completed_count, idea_count)
+        VALUES (NEW.schedule_id, NEW.is_idea IS 0, NEW.is_idea IS 0 AND NEW.is_completed IS 1, NEW.is_idea IS 1)
+        ON CONFLICT(schedule_id) DO UPDATE SET
+            task_count = task_count + excluded.task_count,
+            completed_count = completed_count + excluded.completed_count,
+            idea_count = idea_count + excluded.idea_count;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_schedule_counts_delete AFTER DELETE ON tasks
+    WHEN OLD.schedule_id IS NOT NULL
+    BEGIN
+        UPDATE schedule_counts SET
+            task_count = task_count - (OLD.is_idea IS 0),
+            completed_count = completed_count - (OLD.is_idea IS 0 AND OLD.is_completed IS 1),
+            idea_count = idea_count - (OLD.is_idea IS 1)
+        WHERE schedule_id = OLD.schedule_id;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_schedule_counts_update AFTER UPDATE OF schedule_id, is_idea, is_completed ON tasks
+    WHEN OLD.schedule_id IS NOT NEW.schedule_id OR OLD.is_idea IS NOT NEW.is_idea
+         OR OLD.is_completed IS NOT NEW.is_completed
+    BEGIN
+        UPDATE schedule_counts SET
+            task_count = task_count - (OLD.is_idea IS 0),
+            completed_count = completed_count - (OLD.is_idea IS 0 AND OLD.is_completed IS 1),
+            idea_count = idea_count - (OLD.is_idea IS 1)
+        WHERE schedule_id = OLD.schedule_id;
+        INSERT INTO schedule_counts (schedule_id, task_count, completed_count, idea_count)
+        SELECT NEW.schedule_id, NEW.is_idea IS 0, NEW.is_idea IS 0 AND NEW.is_completed IS 1, NEW.is_idea IS 1
+        WHERE NEW.schedule_id IS NOT NULL
+        ON CONFLICT(schedule_id) DO UPDATE SET
+            task_count = task_count + excluded.task_count,
+            completed_count = completed_count + excluded.completed_count,
+            idea_count = idea_count + excluded.idea_count;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_schedule_counts_schedule_delete AFTER DELETE ON schedules
+    BEGIN
+        DELETE FROM schedule_counts WHERE schedule_id = OLD.id;
+    END
+    ''',
+)
+
+# 카운터 테이블 -> (키 컬럼, 원본 테이블에서 다시 센 결과)
+# check_counters()가 둘을 비교하고, repair면 카운터 테이블을 다시 채웁니다.
+COUNTER_TABLES = {
+    'schedule_counts': ('schedule_id', SCHEDULE_COUNTS_QUERY),
+    'task_months': ('month', '''
+        SELECT substr(sort_date, 1, 7) AS month, COUNT(*) AS task_count FROM tasks
+        WHERE sort_date IS NOT NULL
+        GROUP BY substr(sort_date, 1, 7)
+    '''),
+}
+
+
+def check_counters(conn, repair=False):
+    """트리거로 유지하는 카운터가 원본과 맞는지 확인합니다.
+
+    반환: {카운터 테이블: 어긋난 키 목록}. repair면 어긋난 테이블을 원본 기준으로 다시 채웁니다.
+    (값이 0인 행과 행이 없는 것은 같은 것으로 봄)
+    """
+    mismatches = {}
+    for table, (key, query) in COUNTER_TABLES.items():
+        expected = {row[0]: tuple(row[1:]) for row in conn.execute(query) if any(row[1:])}
+        stored = {row[0]: tuple(row[1:]) for row in conn.execute(f'SELECT * FROM {table}') if any(row[1:])}
+        keys = sorted(k for k in expected.keys() | stored.keys() if expected.get(k) != stored.get(k))
+        if keys:
+            mismatches[table] = keys
+            if repair:
+                conn.execute(f'DELETE FROM {table}')
+                conn.execute(f'INSERT INTO {table} {query}')
+    if repair:
+        conn.commit()
+    return mismatches
+
+
+# 테이블 -> 변경 시 증가하는 cache_versions 카운터
+# activists/users는 프로세스 내 캐시용, data는 화면 ETag용
+VERSIONED_TABLES = {
+    'activists': 'activists',
+    'users': 'users',
+    'tasks': 'data',
+    'schedules': 'data',
+    'ideas': 'data',
+}
+
+
+# 변경 기록 (실시간 반영 /events, live.py)
+# 실무/일정이 바뀔 때마다 트리거로 한 줄씩 쌓고, 최근 CHANGE_LOG_KEEP개만 남깁니다.
+# action: insert / update / delete, 완료 여부만 바뀐 경우는 toggle (화면이 다시 그리지 않고 표시만 바꿈)
+CHANGE_LOG_KEEP = 1000
+
+CHANGE_LOG_TRIGGERS = (
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_change_insert AFTER INSERT ON tasks
+    BEGIN
+        INSERT INTO change_log (kind, ref, action, version, is_completed)
+        VALUES ('task', NEW.id, 'insert', NEW.version, NEW.is_completed);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_change_update AFTER UPDATE ON tasks
+    BEGIN
+        INSERT INTO change_log (kind, ref, action, version, is_completed)
+        VALUES ('task', NEW.id,
+                CASE WHEN OLD.is_completed IS NOT NEW.is_completed AND OLD.content IS NEW.content
+                          AND OLD.details IS NEW.details AND OLD.activist_id IS NEW.activist_id
+                          AND OLD.deadline IS NEW.deadline AND OLD.schedule_id IS NEW.schedule_id
+                          AND OLD.is_draft IS NEW.is_draft AND OLD.is_idea IS NEW.is_idea
+                     THEN 'toggle' ELSE 'update' END,
+                NEW.version, NEW.is_completed);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_change_delete AFTER DELETE ON tasks
+    BEGIN
+        INSERT INTO change_log (kind, ref, action) VALUES ('task', OLD.id, 'delete');
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_schedules_change_insert AFTER INSERT ON schedules
+    BEGIN
+        INSERT INTO change_log (kind, ref, action, version, is_completed)
+        VALUES ('schedule', NEW.id, 'insert', NEW.version, NEW.is_completed);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_schedules_change_update AFTER UPDATE ON schedules
+    BEGIN
+        INSERT INTO change_log (kind, ref, action, version, is_completed)
+        VALUES ('schedule', NEW.id, 'update', NEW.version, NEW.is_completed);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_schedules_change_delete AFTER DELETE ON schedules
+    BEGIN
+        INSERT INTO change_log (kind, ref, action) VALUES ('schedule', OLD.id, 'delete');
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_change_log_prune AFTER INSERT ON change_log
+    BEGIN
+        DELETE FROM change_log WHERE id <= NEW.id - {CHANGE_LOG_KEEP};
+    END
+    ''',
+)
+
+
+# 전체 텍스트 검색 (FTS5 trigram: 띄어쓰기와 무관하게 3글자 이상 부분 문자열 검색)
+# tasks/ideas는 정수 id를 rowid로 쓰는 외부 콘텐츠 테이블, schedules는 TEXT id라 별도 저장
+SEARCH_TABLES = {
+    'tasks_fts': (
+        "CREATE VIRTUAL TABLE tasks_fts USING fts5(content, details, content='tasks', content_rowid='id', "
+        "tokenize='trigram')",
+        "INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')",
+    ),
+    'ideas_fts': (
+        "CREATE VIRTUAL TABLE ideas_fts USING fts5(content, content='ideas', content_rowid='id', tokenize='trigram')",
+        "INSERT INTO ideas_fts(ideas_fts) VALUES ('rebuild')",
+    ),
+    'schedules_fts': (
+        "CREATE VIRTUAL TABLE schedules_fts USING fts5(schedule_id UNINDEXED, title, details, tokenize='trigram')",
+        'INSERT INTO schedules_fts (schedule_id, title, details) SELECT id, title, details FROM schedules',
+    ),
+}
+
+SEARCH_TRIGGERS = (
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_fts_insert AFTER INSERT ON tasks
+    BEGIN
+        INSERT INTO tasks_fts (rowid, content, details) VALUES (NEW.id, NEW.content, NEW.details);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_fts_delete AFTER DELETE ON tasks
+    BEGIN
+        INSERT INTO tasks_fts (tasks_fts, rowid, content, details) VALUES ('delete', OLD.id, OLD.content, OLD.details);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_fts_update AFTER UPDATE OF content, details ON tasks
+    BEGIN
+        INSERT INTO tasks_fts (tasks_fts, rowid, content, details) VALUES ('delete', OLD.id, OLD.content, OLD.details);
+        INSERT INTO tasks_fts (rowid, content, details) VALUES (NEW.id, NEW.content, NEW.details);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_ideas_fts_insert AFTER INSERT ON ideas
+    BEGIN
+        INSERT INTO ideas_fts (rowid, content) VALUES (NEW.id, NEW.content);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_ideas_fts_delete AFTER DELETE ON ideas
+    BEGIN
+        INSERT INTO ideas_fts (ideas_fts, rowid, content) VALUES ('delete', OLD.id, OLD.content);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_ideas_fts_update AFTER UPDATE OF content ON ideas
+    BEGIN
+        INSERT INTO ideas_fts (ideas_fts, rowid, content) VALUES ('delete', OLD.id, OLD.content);
+        INSERT INTO ideas_fts (rowid, content) VALUES (NEW.id, NEW.content);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_schedules_fts_insert AFTER INSERT ON schedules
+    BEGIN
+        INSERT INTO schedules_fts (schedule_id, title, details) VALUES (NEW.id, NEW.title, NEW.details);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_schedules_fts_delete AFTER DELETE ON schedules
+    BEGIN
+        DELETE FROM schedules_fts WHERE schedule_id = OLD.id;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_schedules_fts_update AFTER UPDATE OF id, title, details ON schedules
+    BEGIN
+        DELETE FROM schedules_fts WHERE schedule_id = OLD.id;
+        INSERT INTO schedules_fts (schedule_id, title, details) VALUES (NEW.id, NEW.title, NEW.details);
+    END
+    ''',
+)
+
+
 def init_db():
-    """데이터베이스 테이블을 생성합니다."""
-    conn = get_db()
-    cursor = conn.cursor()
+    """스키마를 최신 버전으로 맞춥니다 (migrations.py). 반환: 적용한 마이그레이션 단계 수"""
+    from migrations import migrate
+    return migrate()
 
-    # 활동가 테이블
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS activists (
-            id TEXT PRIMARY KEY,
-            name TEXT NOT NULL
-        )
-    ''')
-
-    # 주요 일정표 테이블
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS schedules (
-            id TEXT PRIMARY KEY,
-            date TEXT,
-            category TEXT NOT NULL,
-            title TEXT NOT NULL,
-            is_confirmed INTEGER DEFAULT 0,
-            is_completed INTEGER DEFAULT 0,
-            details TEXT
-        )
-    ''')
-
-    # 실무/TODO 테이블 (schedule_id는 NULL 가능 - TODO는 일정 없이도 존재 가능)
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS tasks (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            schedule_id TEXT,
-            priority INTEGER DEFAULT 1,
-            activist_id TEXT,
-            is_idea INTEGER DEFAULT 0,
-            is_draft INTEGER DEFAULT 0,
-            deadline TEXT,
-            content TEXT NOT NULL,
-            is_completed INTEGER DEFAULT 0,
-            FOREIGN KEY (schedule_id) REFERENCES schedules(id),
-            FOREIGN KEY (activist_id) REFERENCES activists(id)
-        )
-    ''')
-
-    # 기존 테이블에서 NOT NULL 제약 제거 (마이그레이션)
-    # SQLite는 ALTER COLUMN을 지원하지 않으므로 테이블 재생성
-    try:
-        cursor.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name='tasks'")
-        schema = cursor.fetchone()
-        if schema and 'schedule_id TEXT NOT NULL' in schema[0]:
-            # 기존 테이블 백업 및 재생성
-            cursor.execute('ALTER TABLE tasks RENAME TO tasks_old')
-            cursor.execute('''
-                CREATE TABLE tasks (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    schedule_id TEXT,
-                    priority INTEGER DEFAULT 1,
-                    activist_id TEXT,
-                    is_idea INTEGER DEFAULT 0,
-                    is_draft INTEGER DEFAULT 0,
-                    deadline TEXT,
-                    content TEXT NOT NULL,
-                    is_completed INTEGER DEFAULT 0,
-                    created_at TEXT,
-                    FOREIGN KEY (schedule_id) REFERENCES schedules(id),
-                    FOREIGN KEY (activist_id) REFERENCES activists(id)
-                )
-            ''')
-            cursor.execute('''
-                INSERT INTO tasks (id, schedule_id, priority, activist_id, is_idea, is_draft, deadline, content, is_completed, created_at)
-                SELECT id, schedule_id, priority, activist_id, is_idea, is_draft, deadline, content, is_completed, created_at
-                FROM tasks_old
-            ''')
-            cursor.execute('DROP TABLE tasks_old')
-            conn.commit()
-    except Exception:
-        pass  # 마이그레이션 실패 시 무시
-
-    # is_draft 컬럼이 없으면 추가 (기존 DB 호환)
-    try:
-        cursor.execute('ALTER TABLE tasks ADD COLUMN is_draft INTEGER DEFAULT 0')
-    except sqlite3.OperationalError:
-        pass  # 컬럼이 이미 존재함
-
-    # needs_advance_prep 컬럼 추가 (기존 DB 호환)
-    # 1이면 2개월 전부터, 0이면 1개월 전부터 사전준비 알림
-    try:
-        cursor.execute('ALTER TABLE schedules ADD COLUMN needs_advance_prep INTEGER DEFAULT 0')
-    except sqlite3.OperationalError:
-        pass  # 컬럼이 이미 존재함
-
-    # 시작/종료 시간 컬럼 추가 (기존 DB 호환)
-    try:
-        cursor.execute('ALTER TABLE schedules ADD COLUMN start_time TEXT')
-    except sqlite3.OperationalError:
-        pass
-    try:
-        cursor.execute('ALTER TABLE schedules ADD COLUMN end_time TEXT')
-    except sqlite3.OperationalError:
-        pass
-
-    # 장소 컬럼 추가 (기존 DB 호환)
-    try:
-        cursor.execute('ALTER TABLE schedules ADD COLUMN location TEXT')
-    except sqlite3.OperationalError:
-        pass
-
-    # created_at 컬럼 추가 (기존 DB 호환)
-    try:
-        cursor.execute('ALTER TABLE tasks ADD COLUMN created_at TEXT')
-    except sqlite3.OperationalError:
-        pass  # 컬럼이 이미 존재함
-
-    # tasks 테이블에 details 컬럼 추가 (아이디어 상세 내용용)
-    try:
-        cursor.execute('ALTER TABLE tasks ADD COLUMN details TEXT')
-    except sqlite3.OperationalError:
-        pass  # 컬럼이 이미 존재함
-
-    # 사업 아이디어 테이블 (일정과 무관한 아이디어)
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS ideas (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            content TEXT NOT NULL,
-            activist_id TEXT,
-            is_adopted INTEGER DEFAULT 0,
-            created_at TEXT,
-            FOREIGN KEY (activist_id) REFERENCES activists(id)
-        )
-    ''')
-
-    # 사용자 테이블 (Google OAuth)
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            google_id TEXT UNIQUE NOT NULL,
-            email TEXT UNIQUE NOT NULL,
-            name TEXT,
-            picture TEXT,
-            is_approved INTEGER DEFAULT 0,
-            created_at TEXT
-        )
-    ''')
-
-    # users 테이블에 activist_id 컬럼 추가 (연결된 활동가)
-    try:
-        cursor.execute('ALTER TABLE users ADD COLUMN activist_id TEXT')
-    except sqlite3.OperationalError:
-        pass  # 컬럼이 이미 존재함
 
-    conn.commit()
-    conn.close()
+def search_available(conn):
+    """전체 텍스트 검색 테이블이 있는지 (FTS5 trigram 지원 여부)"""
+    cursor = conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name IN (?, ?, ?)",
+                          tuple(SEARCH_TABLES))
+    return cursor.fetchone()[0] == len(SEARCH_TABLES)
+
+
+def get_cache_versions():
+    """변경 버전을 요청당 한 번만 읽습니다. 반환: {카운터 이름: 버전}"""
+    if 'cache_versions' not in g:
+        cursor = get_db().execute('SELECT name, version FROM cache_versions')
+        g.cache_versions = dict(cursor.fetchall())
+    return g.cache_versions
+
+
+class VersionedCache:
+    """cache_versions의 버전이 바뀔 때만 다시 읽는 프로세스 내 캐시"""
+
+    def __init__(self, name, loader):
+        self.name = name
+        self.loader = loader
+        self._entry = (None, None)  # (버전, 값)
+
+    def get(self):
+        version = get_cache_versions().get(self.name)
+        cached_version, value = self._entry
+        if version is None or version != cached_version:
+            value = self.loader(get_db())
+            self._entry = (version, value)
+        return value
+
+
+def _load_activists(conn):
+    return conn.execute('SELECT * FROM activists ORDER BY name').fetchall()
+
+
+def _load_users(conn):
+    return {row['id']: row for row in conn.execute('SELECT * FROM users')}
+
+
+activists_cache = VersionedCache('activists', _load_activists)
+users_cache = VersionedCache('users', _load_users)
+
+
+def get_activists():
+    """활동가 목록 (이름순, 캐시)"""
+    return activists_cache.get()
 
 
 class User:
@@ -193,11 +560,10 @@ class User:
 
     @staticmethod
     def get(user_id):
-        conn = get_db()
-        cursor = conn.cursor()
-        cursor.execute('SELECT * FROM users WHERE id = ?', (user_id,))
-        row = cursor.fetchone()
-        conn.close()
+        try:
+            row = users_cache.get().get(int(user_id))
+        except (TypeError, ValueError):
+            return None
         if row:
             activist_id = row['activist_id'] if 'activist_id' in row.keys() else None
             return User(row['id'], row['google_id'], row['email'],
@@ -251,9 +617,9 @@ def seed_initial_data():
          '민주노총 부산본부 시민강좌 1강 (2인 이상의 회원이 대화를 나누고, 후기 나누기 활동)'),
     ]
     cursor.executemany('''
-        INSERT INTO schedules (id, date, category, title, is_confirmed, is_completed, details)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    ''', schedules)
+        INSERT INTO schedules (id, date, category, title, is_confirmed, is_completed, details, sort_date, date_precision)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', [(*schedule, *sort_fields(schedule[1])) for schedule in schedules])
 
     # 실무 데이터 (일부)
     tasks = [
@@ -264,9 +630,9 @@ def seed_initial_data():
         ('DDDD', 1, 'B', 1, '2026-04', '원데이클래스 주제 선정 (아이디어)', 0),
     ]
     cursor.executemany('''
-        INSERT INTO tasks (schedule_id, priority, activist_id, is_idea, deadline, content, is_completed)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    ''', tasks)
+        INSERT INTO tasks (schedule_id, priority, activist_id, is_idea, deadline, content, is_completed, sort_date, date_precision)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', [(*task, *sort_fields(task[4])) for task in tasks])
 
     conn.commit()
     conn.close()
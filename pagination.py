@@ -0,0 +1,75 @@
+"""
+키셋(커서) 페이지네이션
+
+OFFSET 대신 마지막 행의 정렬 키를 커서로 넘겨 다음 페이지를 색인 범위 검색으로 가져옵니다.
+몇 번째 페이지든 앞 행들을 건너뛰며 읽지 않으므로 기록이 쌓여도 응답 시간이 같습니다.
+
+정렬 키에 NULL이 섞이면(마감일 미정, 가입일 미상) 행 값 비교 하나로는 색인을 탈 수 없어서
+정렬 순서를 NULL 여부 같은 구간(Segment)으로 나누고, 구간마다 따로 조회해 이어 붙입니다.
+커서는 [구간 번호, 마지막 행의 정렬 키...] 입니다.
+"""
+import base64
+import binascii
+import json
+from collections import namedtuple
+
+PAGE_SIZE = 50
+
+# condition: 이 구간의 행만 고르는 조건
+# seek: 커서 다음 행부터 고르는 조건 (? 자리에 커서의 정렬 키가 들어감)
+# order: 구간 안의 정렬 (ORDER BY 절)
+# keys: 커서에 담을 행의 컬럼 이름 (seek의 ? 순서)
+Segment = namedtuple('Segment', ['condition', 'seek', 'order', 'keys'])
+
+
+def encode_cursor(values):
+    text = json.dumps(values, ensure_ascii=False, separators=(',', ':'))
+    return base64.urlsafe_b64encode(text.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, segments):
+    """커서 -> (구간 번호, 정렬 키 목록). 형식이 틀리면 None (첫 페이지)"""
+    if not cursor:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+    if not isinstance(values, list) or not values or not isinstance(values[0], int):
+        return None
+    index, keys = values[0], values[1:]
+    if not 0 <= index < len(segments) or len(keys) != len(segments[index].keys):
+        return None
+    if not all(key is None or isinstance(key, (str, int, float)) for key in keys):
+        return None
+    return index, keys
+
+
+def fetch_page(conn, query, params, segments, cursor=None, limit=PAGE_SIZE):
+    """키셋으로 한 페이지를 가져옵니다.
+
+    query는 WHERE 절까지 쓴 SELECT 문이고 구간 조건은 AND로 덧붙입니다.
+    반환: (행 목록, 다음 페이지 커서 또는 None)
+    """
+    after = decode_cursor(cursor, segments)
+    start = after[0] if after else 0
+
+    rows = []
+    for index in range(start, len(segments)):
+        segment = segments[index]
+        sql = f'{query} AND {segment.condition}'
+        segment_params = list(params)
+        if after and index == start:
+            sql += f' AND {segment.seek}'
+            segment_params.extend(after[1])
+        sql += f' ORDER BY {segment.order} LIMIT ?'
+        segment_params.append(limit + 1 - len(rows))
+        rows.extend((index, row) for row in conn.execute(sql, segment_params))
+        if len(rows) > limit:
+            break
+
+    next_cursor = None
+    if len(rows) > limit:
+        index, last = rows[limit - 1]
+        next_cursor = encode_cursor([index, *(last[key] for key in segments[index].keys)])
+    return [row for _, row in rows[:limit]], next_cursor
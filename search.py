@@ -0,0 +1,244 @@
+"""
+실무/일정/아이디어 통합 검색
+
+FTS5 trigram 테이블(models.SEARCH_TABLES)에서 bm25 순으로 찾고,
+페이지는 (순위, 종류, id) 키셋으로 넘깁니다. 결과가 몇 건이든 스니펫은
+현재 페이지 행만 만듭니다.
+
+trigram은 3글자 미만 검색어를 색인으로 찾을 수 없으므로("회의", "굿즈")
+그런 검색어가 섞이면 원본 테이블을 LIKE로 찾고 최근 행부터 보여줍니다.
+"""
+import html
+import re
+from collections import namedtuple
+
+from markupsafe import Markup, escape
+
+from models import search_available
+
+SEARCH_PAGE_SIZE = 20
+
+# 종류 (정렬 순서 = 값)
+KIND_SCHEDULE = 0
+KIND_TASK = 1
+KIND_IDEA = 2
+
+# 스니펫 강조 구간 표시 (HTML로 바꾸기 전까지 쓰는 제어 문자)
+MARK_START = '\x02'
+MARK_END = '\x03'
+SNIPPET_TOKENS = 16
+SNIPPET_CHARS = 80
+
+RE_TAG = re.compile(r'<[^>]*>')
+RE_TAG_HEAD = re.compile(r'^[^<>\s]*>')   # 스니펫 앞에서 잘린 태그 꼬리
+RE_TAG_TAIL = re.compile(r'<[^>]*$')      # 스니펫 끝에서 잘린 태그 머리
+RE_ENTITY_TAIL = re.compile(r'&#?\w*(?=…?$)')  # 스니펫 끝에서 잘린 엔티티
+RE_SPACES = re.compile(r'\s+')
+
+SearchResult = namedtuple('SearchResult', ['kind', 'ref', 'title', 'snippet', 'date', 'schedule_id',
+                                           'is_completed', 'is_idea'])
+
+
+def parse_terms(query):
+    """검색어를 공백으로 나눕니다. (모든 단어를 포함하는 행을 찾음)"""
+    return [term for term in query.split() if term]
+
+
+def match_expression(terms):
+    """FTS5 MATCH 식. 각 단어를 큰따옴표로 감싸 연산자/특수문자를 글자 그대로 찾습니다."""
+    return ' '.join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def encode_cursor(rank, kind, ref):
+    return f'{rank!r}:{kind}:{ref}'
+
+
+def decode_cursor(cursor, int_ref=False):
+    """'순위:종류:id' -> (순위, 종류, id). 형식이 틀리면 None (첫 페이지)"""
+    try:
+        rank, kind, ref = cursor.split(':', 2)
+        return float(rank), int(kind), int(ref) if int_ref else ref
+    except (AttributeError, ValueError):
+        return None
+
+
+def mark_html(text):
+    """강조 표시가 든 평문 -> 이스케이프된 HTML (강조 구간만 <mark>)"""
+    escaped = str(escape(text or ''))
+    return Markup(escaped.replace(MARK_START, '<mark>').replace(MARK_END, '</mark>'))
+
+
+def render_snippet(text):
+    """FTS5 스니펫 -> 강조 표시된 안전한 HTML
+
+    details는 에디터 HTML이라 태그를 지우고(잘린 태그 조각 포함) 엔티티를 풀어 평문으로 만든 뒤
+    이스케이프합니다.
+    """
+    if not text:
+        return Markup('')
+    text = RE_TAG.sub(' ', text)
+    text = RE_TAG_HEAD.sub('', text)
+    text = RE_TAG_TAIL.sub('', text)
+    text = RE_ENTITY_TAIL.sub('', text)
+    return mark_html(RE_SPACES.sub(' ', html.unescape(text)).strip())
+
+
+def highlight(text, terms):
+    """LIKE 검색 결과용 스니펫: 첫 일치 주변만 잘라 검색어에 강조 표시를 붙입니다."""
+    if not text:
+        return ''
+    text = RE_SPACES.sub(' ', html.unescape(RE_TAG.sub(' ', text))).strip()
+    lowered = text.lower()
+    positions = [pos for pos in (lowered.find(term.lower()) for term in terms) if pos >= 0]
+    start = max(min(positions) - SNIPPET_CHARS // 4, 0) if positions else 0
+    snippet = text[start:start + SNIPPET_CHARS]
+    pattern = re.compile('|'.join(re.escape(term) for term in terms), re.IGNORECASE)
+    snippet = pattern.sub(lambda m: MARK_START + m.group(0) + MARK_END, snippet)
+    return ('…' if start > 0 else '') + snippet + ('…' if start + SNIPPET_CHARS < len(text) else '')
+
+
+# 1단계: 일치하는 모든 행의 (순위, 종류, id)만 계산해 한 페이지를 자름
+RANKED_QUERY = '''
+    SELECT rank, kind, ref FROM (
+        SELECT bm25(schedules_fts, 0.0, 2.0, 1.0) AS rank, 0 AS kind, schedule_id AS ref
+        FROM schedules_fts WHERE schedules_fts MATCH :match
+        UNION ALL
+        SELECT bm25(tasks_fts, 2.0, 1.0), 1, CAST(rowid AS TEXT)
+        FROM tasks_fts WHERE tasks_fts MATCH :match
+        UNION ALL
+        SELECT bm25(ideas_fts), 2, CAST(rowid AS TEXT)
+        FROM ideas_fts WHERE ideas_fts MATCH :match
+    )
+    WHERE :rank IS NULL OR (rank, kind, ref) > (:rank, :kind, :ref)
+    ORDER BY rank, kind, ref
+    LIMIT :limit
+'''
+
+# 2단계: 페이지 행의 스니펫과 표시용 컬럼 (인자: 강조 시작, 강조 끝, 토큰 수, MATCH 식, id 목록)
+SNIPPET_QUERIES = {
+    KIND_SCHEDULE: '''
+        SELECT s.id AS ref, s.title, s.date, NULL AS schedule_id, s.is_completed, 0 AS is_idea,
+               snippet(schedules_fts, -1, ?, ?, '…', ?) AS snippet
+        FROM schedules_fts JOIN schedules s ON s.id = schedules_fts.schedule_id
+        WHERE schedules_fts MATCH ? AND schedules_fts.schedule_id IN ({refs})
+    ''',
+    KIND_TASK: '''
+        SELECT CAST(t.id AS TEXT) AS ref, t.content AS title, t.deadline AS date, t.schedule_id, t.is_completed,
+               t.is_idea, snippet(tasks_fts, -1, ?, ?, '…', ?) AS snippet
+        FROM tasks_fts JOIN tasks t ON t.id = tasks_fts.rowid
+        WHERE tasks_fts MATCH ? AND tasks_fts.rowid IN ({refs})
+    ''',
+    KIND_IDEA: '''
+        SELECT CAST(i.id AS TEXT) AS ref, i.content AS title, i.created_at AS date, NULL AS schedule_id,
+               i.is_adopted AS is_completed, 0 AS is_idea,
+               snippet(ideas_fts, -1, ?, ?, '…', ?) AS snippet
+        FROM ideas_fts JOIN ideas i ON i.id = ideas_fts.rowid
+        WHERE ideas_fts MATCH ? AND ideas_fts.rowid IN ({refs})
+    ''',
+}
+
+# 짧은 검색어: 원본 테이블 LIKE (종류, 최근 행 순). {..._where}에는 검색어별 LIKE 조건이 들어감
+# 종류마다 rowid 역순으로 :limit 건에서 멈추게 하고 합친 뒤 다시 자름 (전체 일치 행을 정렬하지 않음)
+LIKE_QUERY = '''
+    SELECT * FROM (
+        SELECT * FROM (
+            SELECT 0 AS kind, s.id AS ref, s.title, s.details AS body, s.date, NULL AS schedule_id,
+                   s.is_completed, 0 AS is_idea, s.rowid AS seq
+            FROM schedules s
+            WHERE ({schedule_where}) AND (:kind IS NULL OR :kind < 0 OR (:kind = 0 AND s.rowid < :seq))
+            ORDER BY s.rowid DESC LIMIT :limit)
+        UNION ALL
+        SELECT * FROM (
+            SELECT 1, CAST(t.id AS TEXT), t.content, t.details, t.deadline, t.schedule_id, t.is_completed,
+                   t.is_idea, t.id
+            FROM tasks t
+            WHERE ({task_where}) AND (:kind IS NULL OR :kind < 1 OR (:kind = 1 AND t.id < :seq))
+            ORDER BY t.id DESC LIMIT :limit)
+        UNION ALL
+        SELECT * FROM (
+            SELECT 2, CAST(i.id AS TEXT), i.content, NULL, i.created_at, NULL, i.is_adopted, 0, i.id
+            FROM ideas i
+            WHERE ({idea_where}) AND (:kind IS NULL OR :kind < 2 OR (:kind = 2 AND i.id < :seq))
+            ORDER BY i.id DESC LIMIT :limit)
+    )
+    ORDER BY kind, seq DESC
+    LIMIT :limit
+'''
+
+
+def like_condition(columns, terms, params):
+    """모든 검색어가 columns 중 하나에 들어 있는 조건"""
+    conditions = []
+    for term in terms:
+        params.append('%' + term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%')
+        name = f':like{len(params) - 1}'
+        conditions.append('(' + ' OR '.join(f"{column} LIKE {name} ESCAPE '\\'" for column in columns) + ')')
+    return ' AND '.join(conditions)
+
+
+def search_fts(conn, terms, after, limit):
+    """FTS5 bm25 순 검색. 반환: (결과, 다음 커서)"""
+    match = match_expression(terms)
+    rank, kind, ref = after or (None, None, None)
+    rows = conn.execute(RANKED_QUERY, {'match': match, 'rank': rank, 'kind': kind, 'ref': ref,
+                                       'limit': limit + 1}).fetchall()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    # 종류별로 한 번씩만 스니펫 조회
+    details = {}
+    for page_kind in {row['kind'] for row in rows}:
+        refs = [row['ref'] for row in rows if row['kind'] == page_kind]
+        if page_kind != KIND_SCHEDULE:
+            refs = [int(ref) for ref in refs]  # rowid는 정수로 비교해야 색인을 탐
+        query = SNIPPET_QUERIES[page_kind].format(refs=', '.join('?' for _ in refs))
+        params = [MARK_START, MARK_END, SNIPPET_TOKENS, match, *refs]
+        for row in conn.execute(query, params):
+            details[(page_kind, row['ref'])] = row
+
+    results = []
+    for row in rows:
+        detail = details.get((row['kind'], row['ref']))
+        if detail is None:
+            continue  # 페이지 사이에 삭제된 행
+        results.append(SearchResult(row['kind'], row['ref'], detail['title'], render_snippet(detail['snippet']),
+                                    detail['date'], detail['schedule_id'], detail['is_completed'],
+                                    detail['is_idea']))
+
+    next_cursor = encode_cursor(rows[-1]['rank'], rows[-1]['kind'], rows[-1]['ref']) if has_more else None
+    return results, next_cursor
+
+
+def search_like(conn, terms, after, limit):
+    """LIKE 검색 (짧은 검색어 또는 FTS5가 없을 때). 반환: (결과, 다음 커서)"""
+    like_params = []
+    query = LIKE_QUERY.format(schedule_where=like_condition(('s.title', 's.details'), terms, like_params),
+                              task_where=like_condition(('t.content', 't.details'), terms, like_params),
+                              idea_where=like_condition(('i.content',), terms, like_params))
+    params = {f'like{i}': value for i, value in enumerate(like_params)}
+    kind, seq = after[1:] if after else (None, None)
+    params.update({'kind': kind, 'seq': seq, 'limit': limit + 1})
+    rows = conn.execute(query, params).fetchall()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    results = []
+    for row in rows:
+        # 본문에 검색어가 없으면(제목에서만 일치) 제목으로 스니펫을 만듦
+        body = row['body'] or ''
+        text = body if any(term.lower() in body.lower() for term in terms) else row['title']
+        results.append(SearchResult(row['kind'], row['ref'], row['title'], mark_html(highlight(text, terms)),
+                                    row['date'], row['schedule_id'], row['is_completed'], row['is_idea']))
+    next_cursor = encode_cursor(0.0, rows[-1]['kind'], rows[-1]['seq']) if has_more else None
+    return results, next_cursor
+
+
+def search(conn, query, cursor=None, limit=SEARCH_PAGE_SIZE):
+    """검색합니다. 반환: (결과 목록, 다음 페이지 커서 또는 None)"""
+    terms = parse_terms(query)
+    if not terms:
+        return [], None
+    if all(len(term) >= 3 for term in terms) and search_available(conn):
+        return search_fts(conn, terms, decode_cursor(cursor), limit)
+    # LIKE 검색의 커서 id는 행 순서(seq)
+    return search_like(conn, terms, decode_cursor(cursor, int_ref=True), limit)
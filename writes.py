@@ -0,0 +1,243 @@
+"""
+쓰기 조정 (여러 gunicorn 워커가 같은 SQLite 파일에 쓸 때)
+
+- begin_immediate(conn): 쓰기 트랜잭션을 BEGIN IMMEDIATE로 시작해 쓰기 잠금을 처음에 잡습니다.
+  DEFERRED로 시작해 읽다가 쓰기로 올리면 WAL에서는 busy_timeout을 기다리지 않고 바로
+  "database is locked"가 날 수 있어서(SQLITE_BUSY_SNAPSHOT) 잠금은 항상 처음에 잡습니다.
+  busy_timeout 안에 못 잡으면 지터를 둔 지수 백오프로 WRITE_RETRIES번까지 다시 시도하고,
+  그래도 안 되면 WriteBusy를 냅니다.
+- 잠금 대기 시간은 요청별(g.lock_wait_ms, 테스트/디버그에서는 X-Lock-Wait-Ms 헤더)과
+  워커별 통계(stats(), /admin/db-stats)로 남깁니다.
+- 쓰기 스레드 (DB_WRITER_THREAD=1일 때): run_write()로 보낸 짧은 쓰기(토글, 수정)를
+  워커 안의 전용 스레드가 모아 한 트랜잭션으로 커밋합니다(group commit).
+  동시에 들어온 쓰기가 잠금을 한 번만 잡고, 실패한 쓰기는 SAVEPOINT로 그 쓰기만 되돌립니다.
+  SQLite가 트랜잭션 전체를 되돌린 오류(디스크 가득 참, I/O 오류 등)면 배치 전체를 실패시키고,
+  요청 쪽은 WRITER_TIMEOUT_SECONDS까지만 기다린 뒤 WriteBusy를 냅니다.
+"""
+import os
+import queue
+import random
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+from flask import g, has_app_context
+
+import models
+
+WRITE_RETRIES = 4           # busy_timeout을 넘긴 뒤 다시 시도할 횟수
+RETRY_BASE_SECONDS = 0.05   # 다시 시도 전 대기: 0 ~ RETRY_BASE_SECONDS * 2^n 사이 무작위
+WRITER_THREAD = os.environ.get('DB_WRITER_THREAD', '0') == '1'
+WRITER_MAX_BATCH = 32       # 한 번에 커밋할 최대 쓰기 수
+WRITER_TIMEOUT_SECONDS = 10  # 요청이 쓰기 스레드의 커밋을 기다리는 최대 시간
+
+
+class WriteBusy(sqlite3.OperationalError):
+    """다시 시도해도 쓰기 잠금을 얻지 못함"""
+
+
+class WriteStats:
+    """워커별 쓰기 잠금 통계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.transactions = 0
+            self.retries = 0
+            self.failures = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+            self.batches = 0
+            self.batched_writes = 0
+
+    def record(self, waited, retries, failed=False):
+        with self._lock:
+            self.transactions += 1
+            self.retries += retries
+            self.failures += failed
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+    def record_batch(self, size):
+        with self._lock:
+            self.batches += 1
+            self.batched_writes += size
+
+    def stats(self):
+        with self._lock:
+            return {
+                'transactions': self.transactions,
+                'retries': self.retries,
+                'failures': self.failures,
+                'lock_wait_ms_total': round(self.wait_total * 1000, 1),
+                'lock_wait_ms_avg': round(self.wait_total * 1000 / self.transactions, 3) if self.transactions else 0,
+                'lock_wait_ms_max': round(self.wait_max * 1000, 1),
+                'writer_thread': WRITER_THREAD,
+                'batches': self.batches,
+                'batched_writes': self.batched_writes,
+            }
+
+
+write_stats = WriteStats()
+
+
+def _add_request_wait(seconds):
+    if has_app_context():
+        g.lock_wait_ms = g.get('lock_wait_ms', 0.0) + seconds * 1000
+
+
+def lock_wait_ms():
+    """현재 요청이 쓰기 잠금을 기다린 시간 (ms)"""
+    return g.get('lock_wait_ms', 0.0)
+
+
+def _is_busy(error):
+    message = str(error)
+    return 'locked' in message or 'busy' in message
+
+
+def begin_immediate(conn):
+    """conn에서 BEGIN IMMEDIATE (이미 트랜잭션 중이면 그대로). 반환: 잠금을 기다린 초"""
+    if conn.in_transaction:
+        return 0.0
+    started = time.perf_counter()
+    for attempt in range(WRITE_RETRIES + 1):
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            break
+        except sqlite3.OperationalError as e:
+            if not _is_busy(e):
+                raise
+            if attempt == WRITE_RETRIES:
+                waited = time.perf_counter() - started
+                write_stats.record(waited, attempt, failed=True)
+                _add_request_wait(waited)
+                raise WriteBusy(str(e)) from e
+            time.sleep(random.uniform(0, RETRY_BASE_SECONDS * 2 ** attempt))
+    waited = time.perf_counter() - started
+    write_stats.record(waited, attempt)
+    _add_request_wait(waited)
+    return waited
+
+
+class WriteQueue:
+    """쓰기 스레드 하나가 쓰기를 모아 커밋 (워커마다 fork 뒤 처음 쓸 때 시작)"""
+
+    def __init__(self, max_batch=WRITER_MAX_BATCH):
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def submit(self, job):
+        """job(conn)을 쓰기 스레드에서 실행하고 커밋될 때까지 기다려 결과를 돌려줌
+
+        WRITER_TIMEOUT_SECONDS 안에 끝나지 않으면 WriteBusy. 아직 시작하지 않은 쓰기는 취소되어
+        반영되지 않지만, 이미 배치에 들어간 쓰기는 뒤늦게 커밋될 수도 있습니다.
+        """
+        self._ensure_thread()
+        future = Future()
+        started = time.perf_counter()
+        self._queue.put((job, future))
+        try:
+            return future.result(timeout=WRITER_TIMEOUT_SECONDS)
+        except FutureTimeout:
+            future.cancel()
+            raise WriteBusy(f'쓰기 스레드가 {WRITER_TIMEOUT_SECONDS}초 안에 커밋하지 못함') from None
+        finally:
+            _add_request_wait(time.perf_counter() - started)
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                self._queue = queue.Queue()
+                self._pid = os.getpid()
+                threading.Thread(target=self._run, name='db-writer', daemon=True).start()
+
+    def _run(self):
+        conn = None
+        jobs = self._queue
+        while True:
+            batch = [jobs.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(jobs.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                if conn is None:
+                    conn = models._connect()
+                self._commit(conn, batch)
+            except Exception as e:  # 예상 못 한 오류에도 스레드는 살려 두고 연결만 새로 엶
+                _fail_batch(batch, e)
+                if conn is not None:
+                    conn.close()
+                    conn = None
+
+    def _commit(self, conn, batch):
+        # 기다리다 포기한(취소된) 쓰기는 빼고 나머지는 이제 취소할 수 없음
+        batch = [(job, future) for job, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        try:
+            begin_immediate(conn)
+        except sqlite3.Error as e:
+            _fail_batch(batch, e)
+            return
+
+        results = []
+        try:
+            for job, future in batch:
+                conn.execute('SAVEPOINT write_job')
+                try:
+                    result, error = job(conn), None
+                except Exception as e:  # 이 쓰기만 되돌리고 나머지는 커밋
+                    if not conn.in_transaction:
+                        raise  # SQLite가 트랜잭션 전체를 되돌림 (SQLITE_FULL, IOERR, interrupt 등)
+                    conn.execute('ROLLBACK TO write_job')
+                    result, error = None, e
+                conn.execute('RELEASE write_job')
+                results.append((future, result, error))
+            conn.commit()
+        except Exception as e:  # 배치 전체를 되돌리고 모두 실패
+            if conn.in_transaction:
+                conn.rollback()
+            _fail_batch(batch, e)
+            return
+        write_stats.record_batch(len(batch))
+        for future, result, error in results:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+
+def _fail_batch(batch, error):
+    for _, future in batch:
+        if not future.done():
+            future.set_exception(error)
+
+
+write_queue = WriteQueue()
+
+
+def run_write(job):
+    """job(conn)을 한 쓰기 트랜잭션에서 실행하고 결과를 돌려줌 (job 안에서 fetchall까지 끝낼 것)
+
+    쓰기 스레드가 켜져 있으면 다른 쓰기와 모아 커밋하고, 아니면 요청 연결에서 바로 커밋합니다.
+    """
+    if WRITER_THREAD:
+        return write_queue.submit(job)
+    conn = models.get_db(write=True)
+    begin_immediate(conn)
+    try:
+        result = job(conn)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return result